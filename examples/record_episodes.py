@@ -0,0 +1,16 @@
+import gym
+
+import panda_gym
+from panda_gym.recording import RecordEpisodes
+
+env = gym.make("PandaPush-v3", render_mode="rgb_array")
+# record one episode out of 10, as mp4 if ffmpeg is installed, as npz chunks otherwise
+env = RecordEpisodes(env, "recordings", episode_trigger=lambda i: i % 10 == 0, video_format="auto")
+
+for _ in range(100):
+    observation, done = env.reset(), False
+    while not done:
+        action = env.action_space.sample()
+        observation, reward, done, info = env.step(action)
+
+env.close()
@@ -9,10 +9,12 @@ with open(os.path.join(os.path.dirname(__file__), "version.txt"), "r") as file_h
     __version__ = file_handler.read().strip()
 
 for reward_type in ["sparse", "dense"]:
-    for control_type in ["ee", "joints"]:
+    for control_type in ["ee", "joints", "ee_velocity"]:
         for action_type in ["continuous", "discrete"]:
             reward_suffix = "Dense" if reward_type == "dense" else ""
-            control_suffix = "Joints" if control_type == "joints" else ""
+            control_suffix = {"joints": "Joints", "ee_velocity": "EEVelocity"}.get(
+                control_type, ""
+            )
             action_suffix = "Discrete" if action_type == "discrete" else ""
             kwargs = {
                 "reward_type": reward_type,
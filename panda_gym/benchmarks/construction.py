@@ -0,0 +1,76 @@
+"""Benchmark of the construction time of vector environments, with and without scene template.
+
+Usage: python -m panda_gym.benchmarks.construction --num-envs 16
+"""
+
+import argparse
+import time
+from typing import Dict, List
+
+import panda_gym  # noqa: F401, registers the environments
+from panda_gym.vector import make_vector_env
+
+TASKS = ["Reach", "Push", "Slide", "PickAndPlace", "Stack", "Flip", "Grasp"]
+
+
+def time_construction(env_id: str, num_envs: int, from_template: bool) -> float:
+    """Time the construction and first reset of a vector environment.
+
+    Args:
+        env_id (str): The environment id.
+        num_envs (int): The number of environments.
+        from_template (bool): Whether to fork the workers from a template environment.
+
+    Returns:
+        float: The construction time, in seconds.
+    """
+    start = time.perf_counter()
+    envs = make_vector_env(env_id, num_envs, from_template=from_template)
+    envs.reset(seed=0)
+    duration = time.perf_counter() - start
+    envs.close()
+    return duration
+
+
+def run(tasks: List[str], num_envs: int, repeats: int) -> Dict[str, Dict[str, float]]:
+    """Run the benchmark.
+
+    Args:
+        tasks (list of str): The task names, e.g. "Reach".
+        num_envs (int): The number of environments in each vector environment.
+        repeats (int): Number of measures, the best one is kept.
+
+    Returns:
+        dict: For each environment id, the cold (one build per worker) and warm (forked from the template)
+            construction times, in seconds.
+    """
+    results = {}
+    for task in tasks:
+        env_id = "Panda{}-v3".format(task)
+        cold = min(time_construction(env_id, num_envs, False) for _ in range(repeats))
+        warm = min(time_construction(env_id, num_envs, True) for _ in range(repeats))
+        results[env_id] = {"cold": cold, "warm": warm}
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--num-envs", type=int, default=16)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--tasks", nargs="+", default=TASKS, choices=TASKS)
+    args = parser.parse_args()
+    results = run(args.tasks, args.num_envs, args.repeats)
+    print(
+        "{:<22} {:>10} {:>10} {:>8}".format("env_id", "cold (s)", "warm (s)", "speedup")
+    )
+    for env_id, result in results.items():
+        speedup = result["cold"] / result["warm"]
+        print(
+            "{:<22} {:>10.3f} {:>10.3f} {:>7.1f}x".format(
+                env_id, result["cold"], result["warm"], speedup
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""Accuracy versus speed of the physics profiles, for each task.
+
+Each profile plays the same episodes as the "accurate" reference profile, in a new environment, with the same
+goals and the same actions: the end-effector is driven towards the object, if any, or towards the goal, with noise, so that the
+episodes include contacts. The accuracy is the deviation of the trajectories from the reference.
+
+Usage: python -m panda_gym.benchmarks.physics --tasks Reach Push --output physics.json
+"""
+
+import argparse
+import json
+import time
+from typing import Dict, List, Optional, Sequence
+
+import gym
+import numpy as np
+
+import panda_gym  # noqa: F401, registers the environments
+from panda_gym.envs.core import RobotTaskEnv
+from panda_gym.physics import available_profiles
+
+TASKS = ["Reach", "Push", "Slide", "PickAndPlace", "Stack", "Flip", "Grasp"]
+REFERENCE = "accurate"
+
+
+def _make_actions(
+    env: RobotTaskEnv, num_episodes: int, num_steps: int, seed: int
+) -> List[np.ndarray]:
+    """Play the episodes with the reference profile and record the actions of the scripted policy."""
+    sim = env.sim
+    target_body = next(
+        (body for body in ["object", "object1"] if body in sim._bodies_idx), None
+    )
+    rng = np.random.default_rng(seed)
+    episodes = []
+    for episode in range(num_episodes):
+        observation = env.reset(seed=seed + episode)
+        actions = np.zeros((num_steps,) + env.action_space.shape, dtype=np.float32)
+        for step in range(num_steps):
+            ee_position = env.robot.get_ee_position()
+            if target_body is None:
+                target = observation["desired_goal"][:3]
+            else:
+                target = sim.get_base_position(target_body)
+            action = rng.uniform(-1.0, 1.0, env.action_space.shape)
+            action[:3] = 10.0 * (target - ee_position) + 0.3 * action[:3]
+            actions[step] = np.clip(action, -1.0, 1.0)
+            observation, _, _, _ = env.step(actions[step])
+        episodes.append(actions)
+    return episodes
+
+
+def _play(
+    env: RobotTaskEnv, episodes: List[np.ndarray], seed: int
+) -> Dict[str, np.ndarray]:
+    """Play the recorded actions, and return the trajectories and the time spent stepping."""
+    ee_positions, achieved_goals, successes = [], [], []
+    duration = 0.0
+    for episode, actions in enumerate(episodes):
+        env.reset(seed=seed + episode)
+        start = time.perf_counter()
+        for action in actions:
+            observation, _, _, info = env.step(action)
+            ee_positions.append(env.robot.get_ee_position())
+            achieved_goals.append(observation["achieved_goal"])
+            successes.append(info["is_success"])
+        duration += time.perf_counter() - start
+    return {
+        "ee_position": np.array(ee_positions),
+        "achieved_goal": np.array(achieved_goals),
+        "is_success": np.array(successes),
+        "duration": duration,
+    }
+
+
+def bench_task(
+    task: str,
+    profiles: Sequence[str],
+    num_episodes: int = 5,
+    num_steps: int = 50,
+    seed: int = 0,
+) -> Dict[str, Dict[str, float]]:
+    """Benchmark the physics profiles on a task.
+
+    Args:
+        task (str): The task name, e.g. "Push".
+        profiles (list of str): The profile names.
+        num_episodes (int, optional): Number of episodes. Defaults to 5.
+        num_steps (int, optional): Number of steps per episode. Defaults to 50.
+        seed (int, optional): Seed of the first episode. Defaults to 0.
+
+    Returns:
+        dict: By profile, the steps per second ("steps_per_sec"), the mean distance to the reference trajectory
+            of the end-effector ("ee_error") and of the achieved goal ("goal_error"), and the fraction of the steps
+            with the same success as the reference ("success_agreement").
+    """
+    # unwrapped, without time limit: the episodes last num_steps
+    env_id = "Panda{}-v3".format(task)
+    env = gym.make(env_id, physics_profile=REFERENCE).unwrapped
+    episodes = _make_actions(env, num_episodes, num_steps, seed)
+    env.close()
+    # in a new env, since the solver is warm-started from the previous episodes
+    env = gym.make(env_id, physics_profile=REFERENCE).unwrapped
+    reference = _play(env, episodes, seed)
+    env.close()
+    results = {}
+    for profile in profiles:
+        env = gym.make(env_id, physics_profile=profile).unwrapped
+        trajectory = _play(env, episodes, seed)
+        env.close()
+        ee_error = np.linalg.norm(
+            trajectory["ee_position"] - reference["ee_position"], axis=-1
+        )
+        goal_error = np.abs(trajectory["achieved_goal"] - reference["achieved_goal"])
+        results[profile] = {
+            "steps_per_sec": num_episodes * num_steps / trajectory["duration"],
+            "ee_error": float(ee_error.mean()),
+            "goal_error": float(goal_error.max(axis=-1).mean()),
+            "success_agreement": float(
+                np.mean(trajectory["is_success"] == reference["is_success"])
+            ),
+        }
+    return results
+
+
+def run(
+    tasks: Sequence[str] = TASKS,
+    profiles: Optional[Sequence[str]] = None,
+    num_episodes: int = 5,
+    num_steps: int = 50,
+) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """Run the benchmark.
+
+    Args:
+        tasks (list of str, optional): The task names. Defaults to all the tasks.
+        profiles (list of str, optional): The profile names. Defaults to all the registered profiles.
+        num_episodes (int, optional): Number of episodes per task. Defaults to 5.
+        num_steps (int, optional): Number of steps per episode. Defaults to 50.
+
+    Returns:
+        dict: The results of `bench_task`, by task.
+    """
+    profiles = available_profiles() if profiles is None else profiles
+    return {
+        task: bench_task(task, profiles, num_episodes, num_steps) for task in tasks
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", nargs="+", default=TASKS, choices=TASKS)
+    parser.add_argument("--profiles", nargs="+", default=None)
+    parser.add_argument("--episodes", type=int, default=5)
+    parser.add_argument("--steps", type=int, default=50)
+    parser.add_argument("--output", default=None, help="JSON file")
+    args = parser.parse_args(argv)
+    results = run(args.tasks, args.profiles, args.episodes, args.steps)
+    print(
+        "{:<14}{:<10}{:>12}{:>12}{:>12}{:>10}".format(
+            "task", "profile", "steps/s", "ee error", "goal error", "success"
+        )
+    )
+    for task, task_results in results.items():
+        for profile, result in task_results.items():
+            print(
+                "{:<14}{:<10}{:>12.0f}{:>12.4f}{:>12.4f}{:>10.2f}".format(
+                    task,
+                    profile,
+                    result["steps_per_sec"],
+                    result["ee_error"],
+                    result["goal_error"],
+                    result["success_agreement"],
+                )
+            )
+    if args.output is not None:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+"""Benchmark suite of the registered environments: step, reset, render, reward and construction throughput.
+
+Usage: panda-gym-benchmark --env-ids "PandaReach*" --output results.json
+"""
+
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import sys
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import gym
+import numpy as np
+import pybullet
+
+import panda_gym
+from panda_gym.pybullet import Camera
+from panda_gym.vector import make_batched_env, make_vector_env
+
+RESOLUTIONS = [(84, 84), (240, 320), (480, 720)]  # (height, width)
+WORKERS = [1, 2, 4, 8]
+
+
+def registered_env_ids() -> List[str]:
+    """Returns the ids of the environments registered by panda-gym, sorted."""
+    return sorted(
+        env_id
+        for env_id, spec in gym.envs.registry.items()
+        if str(spec.entry_point).startswith("panda_gym.")
+    )
+
+
+def _rate(count: int, duration: float) -> float:
+    return count / duration if duration > 0 else float("inf")
+
+
+def bench_env(
+    env_id: str,
+    num_steps: int,
+    num_resets: int,
+    resolutions: Sequence[Tuple[int, int]],
+    num_frames: int,
+    reward_batch_size: int,
+) -> Dict[str, Any]:
+    """Benchmark an environment.
+
+    Args:
+        env_id (str): The environment id.
+        num_steps (int): Number of timed steps. The episodes that end are reset, the resets are included.
+        num_resets (int): Number of timed resets.
+        resolutions (list of tuple): Render resolutions, as (height, width).
+        num_frames (int): Number of timed frames per resolution.
+        reward_batch_size (int): Number of goals in the batch given to `compute_reward`.
+
+    Returns:
+        dict: The construction time, in seconds ("construction_time"), the steps and resets per second
+            ("steps_per_sec" and "resets_per_sec"), the frames per second by resolution ("render_fps", with
+            "{height}x{width}" keys) and the rewards computed per second in batch ("reward_per_sec").
+    """
+    start = time.perf_counter()
+    env = gym.make(env_id)
+    env.reset(seed=0)
+    construction_time = time.perf_counter() - start
+    env.action_space.seed(0)
+    actions = [env.action_space.sample() for _ in range(num_steps)]
+
+    start = time.perf_counter()
+    for action in actions:
+        _, _, done, _ = env.step(action)
+        if done:
+            env.reset()
+    steps_per_sec = _rate(num_steps, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for _ in range(num_resets):
+        env.reset()
+    resets_per_sec = _rate(num_resets, time.perf_counter() - start)
+
+    sim = env.unwrapped.sim
+    render_fps = {}
+    for height, width in resolutions:
+        camera = Camera(width=width, height=height)
+        sim.render_camera(camera)  # warm up, allocate the buffers
+        start = time.perf_counter()
+        for _ in range(num_frames):
+            sim.render_camera(camera)
+        key = "{}x{}".format(height, width)
+        render_fps[key] = _rate(num_frames, time.perf_counter() - start)
+
+    task = env.unwrapped.task
+    rng = np.random.default_rng(0)
+    goal_shape = (reward_batch_size,) + task.get_goal().shape
+    achieved_goal = rng.uniform(-0.5, 0.5, goal_shape).astype(np.float32)
+    desired_goal = rng.uniform(-0.5, 0.5, goal_shape).astype(np.float32)
+    task.compute_reward(achieved_goal, desired_goal, {})  # warm up, compile the kernels
+    num_calls = 10
+    start = time.perf_counter()
+    for _ in range(num_calls):
+        task.compute_reward(achieved_goal, desired_goal, {})
+    reward_per_sec = _rate(num_calls * reward_batch_size, time.perf_counter() - start)
+    env.close()
+    return {
+        "construction_time": construction_time,
+        "steps_per_sec": steps_per_sec,
+        "resets_per_sec": resets_per_sec,
+        "render_fps": render_fps,
+        "reward_per_sec": reward_per_sec,
+    }
+
+
+def bench_vector_scaling(
+    env_id: str, workers: Sequence[int], num_steps: int
+) -> List[Dict[str, Any]]:
+    """Benchmark the throughput of the vector environments, by number of environments.
+
+    Args:
+        env_id (str): The environment id.
+        workers (list of int): The numbers of environments.
+        num_steps (int): Number of timed batch steps.
+
+    Returns:
+        list: For each number of environments ("num_envs"), the environment steps per second of
+            `make_vector_env` (one worker process per environment, "shared_memory") and of `make_batched_env`
+            (in the current process, "batched").
+    """
+    results = []
+    for num_envs in workers:
+        result = {"num_envs": num_envs}
+        for name, make in [
+            ("shared_memory", make_vector_env),
+            ("batched", make_batched_env),
+        ]:
+            envs = make(env_id, num_envs)
+            envs.reset(seed=0)
+            envs.action_space.seed(0)
+            actions = [envs.action_space.sample() for _ in range(num_steps)]
+            start = time.perf_counter()
+            for action in actions:
+                envs.step(action)
+            result[name] = _rate(num_steps * num_envs, time.perf_counter() - start)
+            envs.close()
+        results.append(result)
+    return results
+
+
+def _metadata(args: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "panda_gym": panda_gym.__version__,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pybullet": pybullet.getAPIVersion(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "arguments": args,
+    }
+
+
+def run(
+    env_ids: Optional[Sequence[str]] = None,
+    num_steps: int = 1000,
+    num_resets: int = 100,
+    resolutions: Sequence[Tuple[int, int]] = RESOLUTIONS,
+    num_frames: int = 20,
+    reward_batch_size: int = 10000,
+    vector_env_id: Optional[str] = "PandaReach-v3",
+    workers: Sequence[int] = WORKERS,
+    num_vector_steps: int = 200,
+) -> Dict[str, Any]:
+    """Run the benchmark suite.
+
+    Args:
+        env_ids (list of str, optional): Environment ids, or patterns such as "PandaReach*". Defaults to None (all
+            the registered environments).
+        num_steps (int, optional): Number of timed steps per environment. Defaults to 1000.
+        num_resets (int, optional): Number of timed resets per environment. Defaults to 100.
+        resolutions (list of tuple, optional): Render resolutions, as (height, width). Defaults to 84x84, 240x320
+            and 480x720.
+        num_frames (int, optional): Number of timed frames per resolution. Defaults to 20.
+        reward_batch_size (int, optional): Batch size of `compute_reward`. Defaults to 10000.
+        vector_env_id (str, optional): Environment of the vector scaling sweep. Defaults to "PandaReach-v3", None
+            to skip the sweep.
+        workers (list of int, optional): Numbers of environments of the sweep. Defaults to 1, 2, 4 and 8.
+        num_vector_steps (int, optional): Number of timed batch steps of the sweep. Defaults to 200.
+
+    Returns:
+        dict: The results, as a JSON-serializable dict, with the "metadata" of the run, the results by
+            environment id ("envs", see `bench_env`) and the "vector_scaling" sweep (see `bench_vector_scaling`).
+    """
+    arguments = dict(locals())
+    all_env_ids = registered_env_ids()
+    if env_ids is None:
+        selected = all_env_ids
+    else:
+        selected = [
+            env_id
+            for env_id in all_env_ids
+            if any(fnmatch.fnmatchcase(env_id, pattern) for pattern in env_ids)
+        ]
+    results = {"metadata": _metadata(arguments), "envs": {}, "vector_scaling": []}
+    for env_id in selected:
+        results["envs"][env_id] = bench_env(
+            env_id, num_steps, num_resets, resolutions, num_frames, reward_batch_size
+        )
+    if vector_env_id is not None:
+        results["vector_scaling"] = bench_vector_scaling(
+            vector_env_id, workers, num_vector_steps
+        )
+    return results
+
+
+def _parse_resolution(value: str) -> Tuple[int, int]:
+    height, width = value.lower().split("x")
+    return int(height), int(width)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--env-ids", nargs="+", default=None, help="ids or patterns, default all"
+    )
+    parser.add_argument("--steps", type=int, default=1000)
+    parser.add_argument("--resets", type=int, default=100)
+    parser.add_argument(
+        "--resolutions",
+        nargs="+",
+        type=_parse_resolution,
+        default=RESOLUTIONS,
+        help="as HEIGHTxWIDTH",
+    )
+    parser.add_argument("--frames", type=int, default=20)
+    parser.add_argument("--reward-batch-size", type=int, default=10000)
+    parser.add_argument("--vector-env-id", default="PandaReach-v3")
+    parser.add_argument("--no-vector", action="store_true", help="skip the sweep")
+    parser.add_argument("--workers", nargs="+", type=int, default=WORKERS)
+    parser.add_argument("--vector-steps", type=int, default=200)
+    parser.add_argument("--output", default=None, help="JSON file, default stdout")
+    args = parser.parse_args(argv)
+    results = run(
+        env_ids=args.env_ids,
+        num_steps=args.steps,
+        num_resets=args.resets,
+        resolutions=args.resolutions,
+        num_frames=args.frames,
+        reward_batch_size=args.reward_batch_size,
+        vector_env_id=None if args.no_vector else args.vector_env_id,
+        workers=args.workers,
+        num_vector_steps=args.vector_steps,
+    )
+    if args.output is None:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    else:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
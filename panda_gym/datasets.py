@@ -0,0 +1,392 @@
+"""Trajectory datasets stored as memory-mapped column files.
+
+A dataset is a directory of shards. Each shard holds `shard_size` consecutive steps, as one preallocated ``.npy``
+file per column, memory-mapped when writing and when reading, so that neither the writer nor the reader loads the
+dataset in memory. The steps follow the RLDS layout: each step holds an observation, the action taken from this
+observation, and the reward and success obtained by this action. The last step of an episode only holds the final
+observation (its action is zero). The location of a step is computed from its index, and the episodes are listed
+in an index, so that any step or episode is accessed in constant time.
+
+    directory/
+        index.json                     # shard size, number of steps, columns
+        episodes.npy                   # (num_episodes, 2) array of (first step, number of steps)
+        shard_00000/observation.npy    # (shard_size, 19) float32
+        shard_00000/action.npy         # (shard_size, 4) float32
+        ...
+        shard_00000/states.bin         # optional serialized simulation states, see `RobotTaskEnv.to_bytes`
+"""
+
+import json
+import os
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import gym
+import numpy as np
+from gym import spaces
+
+# Columns added to the observation keys, as {name: (shape, dtype)}
+STEP_COLUMNS = {
+    "reward": ((), np.float32),
+    "is_success": ((), np.bool_),
+    "is_first": ((), np.bool_),
+    "is_last": ((), np.bool_),
+}
+# Columns locating the serialized states in the `states.bin` file of the shard
+STATE_COLUMNS = {"state_offset": ((), np.int64), "state_size": ((), np.int64)}
+
+
+class DatasetWriter:
+    """Write a trajectory dataset.
+
+    Call `reset` with the first observation of each episode, and `step` after each step. Call `close` at the end,
+    to write the index.
+
+    Args:
+        directory (str): Directory of the dataset. Must not contain a dataset already.
+        observation_space (spaces.Dict): The observation space of the environment. Each key is a column.
+        action_space (spaces.Space): The action space of the environment.
+        shard_size (int, optional): Number of steps per shard. Defaults to 1_000_000.
+        save_states (bool, optional): Whether to store a serialized state of the simulation at each step.
+            Defaults to False.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        observation_space: spaces.Dict,
+        action_space: spaces.Space,
+        shard_size: int = 1_000_000,
+        save_states: bool = False,
+    ) -> None:
+        assert shard_size > 0, "The shard size must be positive."
+        if os.path.exists(os.path.join(directory, "index.json")):
+            raise FileExistsError("A dataset already exists in {}".format(directory))
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.shard_size = shard_size
+        self.save_states = save_states
+        self.columns = {
+            key: (space.shape, np.dtype(space.dtype))
+            for key, space in observation_space.spaces.items()
+        }
+        if isinstance(action_space, spaces.Discrete):
+            self.columns["action"] = ((), np.dtype(np.int64))
+        else:
+            self.columns["action"] = (action_space.shape, np.dtype(action_space.dtype))
+        columns = dict(STEP_COLUMNS, **(STATE_COLUMNS if save_states else {}))
+        for key, (shape, dtype) in columns.items():
+            self.columns[key] = (shape, np.dtype(dtype))
+        self.num_steps = 0
+        self.episodes: List[Tuple[int, int]] = []
+        self._shard = None
+        self._shard_index = -1
+        self._states_file = None
+        self.closed = False
+
+    def _open_shard(self, shard_index: int) -> None:
+        """Preallocate the column files of a shard and map them in memory."""
+        self._close_shard()
+        path = os.path.join(self.directory, "shard_{:05d}".format(shard_index))
+        os.makedirs(path)
+        self._shard = {
+            key: np.lib.format.open_memmap(
+                os.path.join(path, key + ".npy"),
+                mode="w+",
+                dtype=dtype,
+                shape=(self.shard_size,) + shape,
+            )
+            for key, (shape, dtype) in self.columns.items()
+        }
+        if self.save_states:
+            self._states_file = open(os.path.join(path, "states.bin"), "wb")
+        self._shard_index = shard_index
+
+    def _close_shard(self) -> None:
+        if self._shard is not None:
+            for column in self._shard.values():
+                column.flush()
+            self._shard = None
+        if self._states_file is not None:
+            self._states_file.close()
+            self._states_file = None
+
+    def _row(self, step: int) -> Tuple[Dict[str, np.ndarray], int]:
+        """The columns of the shard holding a step, and the row of the step in the shard."""
+        shard_index, row = divmod(step, self.shard_size)
+        if shard_index != self._shard_index:
+            self._open_shard(shard_index)
+        return self._shard, row
+
+    def _append(
+        self, observation: Dict[str, np.ndarray], state: Optional[bytes]
+    ) -> None:
+        shard, row = self._row(self.num_steps)
+        for key, value in observation.items():
+            shard[key][row] = value
+        shard["action"][row] = 0
+        shard["reward"][row] = 0.0
+        shard["is_success"][row] = False
+        shard["is_first"][row] = False
+        shard["is_last"][row] = True
+        if self.save_states:
+            if state is None:
+                raise ValueError("The dataset stores the states, a state is required.")
+            shard["state_offset"][row] = self._states_file.tell()
+            shard["state_size"][row] = len(state)
+            self._states_file.write(state)
+        self.num_steps += 1
+
+    def reset(
+        self, observation: Dict[str, np.ndarray], state: Optional[bytes] = None
+    ) -> None:
+        """Start an episode.
+
+        Args:
+            observation (dict): The first observation.
+            state (bytes, optional): The serialized state of the simulation, required if `save_states`.
+                Defaults to None.
+        """
+        self.episodes.append((self.num_steps, 1))
+        self._append(observation, state)
+        shard, row = self._row(self.num_steps - 1)
+        shard["is_first"][row] = True
+
+    def step(
+        self,
+        action: Union[np.ndarray, int],
+        reward: float,
+        observation: Dict[str, np.ndarray],
+        is_success: bool,
+        state: Optional[bytes] = None,
+    ) -> None:
+        """Add a step to the current episode.
+
+        Args:
+            action (np.ndarray or int): The action taken from the previous observation.
+            reward (float): The reward obtained by the action.
+            observation (dict): The observation after the action.
+            is_success (bool): Whether the task is successful after the action.
+            state (bytes, optional): The serialized state of the simulation after the action, required if
+                `save_states`. Defaults to None.
+        """
+        assert self.episodes, "Call `reset` before `step`."
+        shard, row = self._row(self.num_steps - 1)
+        shard["action"][row] = action
+        shard["reward"][row] = reward
+        shard["is_success"][row] = is_success
+        shard["is_last"][row] = False
+        start, length = self.episodes[-1]
+        self.episodes[-1] = (start, length + 1)
+        self._append(observation, state)
+
+    def flush(self) -> None:
+        """Write the index and the data written so far to disk."""
+        if self._shard is not None:
+            for column in self._shard.values():
+                column.flush()
+        if self._states_file is not None:
+            self._states_file.flush()
+        np.save(
+            os.path.join(self.directory, "episodes.npy"),
+            np.array(self.episodes, dtype=np.int64).reshape(-1, 2),
+        )
+        index = {
+            "shard_size": self.shard_size,
+            "num_steps": self.num_steps,
+            "columns": {
+                key: {"shape": list(shape), "dtype": dtype.str}
+                for key, (shape, dtype) in self.columns.items()
+            },
+        }
+        with open(os.path.join(self.directory, "index.json"), "w") as file:
+            json.dump(index, file, indent=2)
+
+    def close(self) -> None:
+        """Write the index and close the files."""
+        if self.closed:
+            return
+        self.flush()
+        self._close_shard()
+        self.closed = True
+
+
+class Dataset:
+    """Read a trajectory dataset written by `DatasetWriter`.
+
+    The column files are memory-mapped, so only the steps that are accessed are read from disk.
+
+    Args:
+        directory (str): Directory of the dataset.
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        with open(os.path.join(directory, "index.json")) as file:
+            index = json.load(file)
+        self.shard_size = index["shard_size"]
+        self.num_steps = index["num_steps"]
+        self.columns = {
+            key: (tuple(column["shape"]), np.dtype(column["dtype"]))
+            for key, column in index["columns"].items()
+        }
+        self.episodes = np.load(os.path.join(directory, "episodes.npy"))
+        self._shards: Dict[int, Dict[str, np.ndarray]] = {}
+        self._states_files: Dict[int, Any] = {}
+
+    def __len__(self) -> int:
+        return self.num_steps
+
+    @property
+    def num_episodes(self) -> int:
+        """Number of episodes."""
+        return len(self.episodes)
+
+    def _shard_path(self, shard_index: int) -> str:
+        return os.path.join(self.directory, "shard_{:05d}".format(shard_index))
+
+    def _get_shard(self, shard_index: int) -> Dict[str, np.ndarray]:
+        shard = self._shards.get(shard_index)
+        if shard is None:
+            path = self._shard_path(shard_index)
+            shard = self._shards[shard_index] = {
+                key: np.load(os.path.join(path, key + ".npy"), mmap_mode="r")
+                for key in self.columns
+            }
+        return shard
+
+    def __getitem__(self, index: int) -> Dict[str, np.ndarray]:
+        """Get a step.
+
+        Args:
+            index (int): Index of the step.
+
+        Returns:
+            dict: The values of the step, by column, as read-only views of the column files.
+        """
+        if not -self.num_steps <= index < self.num_steps:
+            raise IndexError("Step {} out of range".format(index))
+        shard_index, row = divmod(index % self.num_steps, self.shard_size)
+        shard = self._get_shard(shard_index)
+        return {key: column[row] for key, column in shard.items()}
+
+    def get_batch(
+        self, indices: np.ndarray, columns: Optional[Sequence[str]] = None
+    ) -> Dict[str, np.ndarray]:
+        """Gather steps, e.g. a minibatch sampled uniformly from the dataset.
+
+        Args:
+            indices (np.ndarray): Indices of the steps.
+            columns (list of str, optional): Columns to gather. Defaults to all the columns.
+
+        Returns:
+            dict: The values of the steps, by column, of shape (len(indices), ...).
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        if np.any((indices < 0) | (indices >= self.num_steps)):
+            raise IndexError("Step indices out of range")
+        columns = list(self.columns) if columns is None else columns
+        batch = {
+            key: np.empty((len(indices),) + self.columns[key][0], self.columns[key][1])
+            for key in columns
+        }
+        shard_indices, rows = np.divmod(indices, self.shard_size)
+        for shard_index in np.unique(shard_indices):
+            mask = shard_indices == shard_index
+            shard = self._get_shard(int(shard_index))
+            for key in columns:
+                batch[key][mask] = shard[key][rows[mask]]
+        return batch
+
+    def get_episode(self, episode: int) -> Dict[str, np.ndarray]:
+        """Get all the steps of an episode.
+
+        Args:
+            episode (int): Index of the episode.
+
+        Returns:
+            dict: The values of the steps, by column, of shape (num_steps, ...). If the episode is within a single
+                shard, they are read-only views of the column files.
+        """
+        start, length = (int(value) for value in self.episodes[episode])
+        first_shard, first_row = divmod(start, self.shard_size)
+        if first_row + length <= self.shard_size:
+            shard = self._get_shard(first_shard)
+            return {
+                key: column[first_row : first_row + length]
+                for key, column in shard.items()
+            }
+        return self.get_batch(np.arange(start, start + length))
+
+    def get_state(self, index: int) -> bytes:
+        """Get the serialized state of the simulation at a step, to restore with `RobotTaskEnv.from_bytes`.
+
+        Args:
+            index (int): Index of the step.
+
+        Returns:
+            bytes: The serialized state.
+        """
+        if "state_offset" not in self.columns:
+            raise ValueError("The dataset was written without the states.")
+        step = self[index]
+        shard_index = (index % self.num_steps) // self.shard_size
+        file = self._states_files.get(shard_index)
+        if file is None:
+            path = os.path.join(self._shard_path(shard_index), "states.bin")
+            file = self._states_files[shard_index] = open(path, "rb")
+        file.seek(int(step["state_offset"]))
+        return file.read(int(step["state_size"]))
+
+    def close(self) -> None:
+        """Close the files."""
+        for file in self._states_files.values():
+            file.close()
+        self._states_files.clear()
+        self._shards.clear()
+
+
+class RecordDataset(gym.Wrapper):
+    """Wrapper writing the steps of a panda-gym environment in a dataset.
+
+    Args:
+        env (gym.Env): The environment.
+        directory (str): Directory of the dataset.
+        shard_size (int, optional): Number of steps per shard. Defaults to 1_000_000.
+        save_states (bool, optional): Whether to store the state of the simulation at each step (see
+            `RobotTaskEnv.to_bytes`), e.g. to render the steps later. Defaults to False.
+    """
+
+    def __init__(
+        self,
+        env: gym.Env,
+        directory: str,
+        shard_size: int = 1_000_000,
+        save_states: bool = False,
+    ) -> None:
+        super().__init__(env)
+        self.save_states = save_states
+        self.writer = DatasetWriter(
+            directory,
+            env.observation_space,
+            env.action_space,
+            shard_size=shard_size,
+            save_states=save_states,
+        )
+
+    def _get_state(self) -> Optional[bytes]:
+        return self.env.unwrapped.to_bytes() if self.save_states else None
+
+    def reset(self, **kwargs: Any) -> Any:
+        observation = self.env.reset(**kwargs)
+        self.writer.reset(observation, self._get_state())
+        return observation
+
+    def step(self, action: Any) -> Any:
+        observation, reward, done, info = self.env.step(action)
+        is_success = info.get("is_success", False)
+        self.writer.step(action, reward, observation, is_success, self._get_state())
+        return observation, reward, done, info
+
+    def close(self) -> None:
+        self.writer.close()
+        super().close()
@@ -1,12 +1,17 @@
+import io
+import json
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
 
 import gym
 import numpy as np
 from gym import spaces
 from gym.utils import seeding
 
-from panda_gym.pybullet import PyBullet
+from panda_gym.kinematics import IKSolver
+from panda_gym.pybullet import BatchedPyBullet, Camera, PyBullet
+from panda_gym.snapshots import SnapshotPool
+from panda_gym.utils import FrameStack, ObservationLayout, batch_space
 
 
 class PyBulletRobot(ABC):
@@ -19,6 +24,9 @@ class PyBulletRobot(ABC):
         base_position (np.ndarray): Position of the base of the robot as (x, y, z).
     """
 
+    # Solver of `inverse_kinematics`, None to use the solver of the simulation
+    ik_solver: Optional[IKSolver] = None
+
     def __init__(
         self,
         sim: PyBullet,
@@ -64,6 +72,23 @@ class PyBulletRobot(ABC):
             action (np.ndarray): The action.
         """
 
+    @classmethod
+    def set_batch_action(
+        cls, robots: Sequence["PyBulletRobot"], actions: np.ndarray
+    ) -> None:
+        """Set the actions of robots of the same kind, each in its own simulation. Must be called just before
+        the simulations are stepped.
+
+        The actions are set one by one. Robots can override it to share the work across the batch, such as the
+        inverse kinematics.
+
+        Args:
+            robots (list of PyBulletRobot): The robots, with the same arguments.
+            actions (np.ndarray): The actions, with a leading axis of size `len(robots)`.
+        """
+        for robot, action in zip(robots, actions):
+            robot.set_action(action)
+
     @abstractmethod
     def get_obs(self) -> np.ndarray:
         """Return the observation associated to the robot.
@@ -72,6 +97,16 @@ class PyBulletRobot(ABC):
             np.ndarray: The observation.
         """
 
+    def write_obs(self, out: np.ndarray) -> None:
+        """Write the observation associated to the robot in a preallocated array.
+
+        Override to avoid the allocation of `get_obs`.
+
+        Args:
+            out (np.ndarray): Float32 array of the size of the observation.
+        """
+        out[:] = self.get_obs()
+
     @abstractmethod
     def reset(self) -> None:
         """Reset the robot and return the observation."""
@@ -120,6 +155,48 @@ class PyBulletRobot(ABC):
         """
         return self.sim.get_joint_velocity(self.body_name, joint)
 
+    def get_joint_angles(self, joints: np.ndarray) -> np.ndarray:
+        """Returns the angles of several joints, in a single simulator call.
+
+        Args:
+            joints (np.ndarray): The joint indices.
+
+        Returns:
+            np.ndarray: Joint angles
+        """
+        return self.sim.get_joint_angles(self.body_name, joints)
+
+    def get_link_states(
+        self, links: np.ndarray, compute_velocity: bool = True
+    ) -> np.ndarray:
+        """Returns the states of several links, in a single simulator call.
+
+        Args:
+            links (np.ndarray): The link indices.
+            compute_velocity (bool, optional): Whether to compute the link velocities. Defaults to True.
+
+        Returns:
+            np.ndarray: Array of shape (n_links, 13). See `PyBullet.get_link_states`.
+        """
+        return self.sim.get_link_states(
+            self.body_name, links, compute_velocity=compute_velocity
+        )
+
+    def get_jacobian(
+        self, link: int, joint_angles: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """Returns the Jacobian of a link.
+
+        Args:
+            link (int): The link index.
+            joint_angles (np.ndarray, optional): Angles of the non-fixed joints. Defaults to None (the current
+                angles).
+
+        Returns:
+            np.ndarray: Array of shape (6, n_movable_joints). See `PyBullet.get_jacobian`.
+        """
+        return self.sim.get_jacobian(self.body_name, link, joint_angles)
+
     def control_joints(self, target_angles: np.ndarray) -> None:
         """Control the joints of the robot.
 
@@ -148,6 +225,8 @@ class PyBulletRobot(ABC):
     ) -> np.ndarray:
         """Compute the inverse kinematics and return the new joint values.
 
+        The inverse kinematics is solved by `ik_solver` if any, else by the simulation.
+
         Args:
             link (int): The link.
             position (x, y, z): Desired position of the link.
@@ -156,10 +235,24 @@ class PyBulletRobot(ABC):
         Returns:
             List of joint values.
         """
-        inverse_kinematics = self.sim.inverse_kinematics(
-            self.body_name, link=link, position=position, orientation=orientation
-        )
-        return inverse_kinematics
+        if self.ik_solver is None:
+            inverse_kinematics = self.sim.inverse_kinematics(
+                self.body_name, link=link, position=position, orientation=orientation
+            )
+            return inverse_kinematics
+        if link != self.ik_solver.link:
+            raise ValueError(
+                "The IK solver is for link {}, not {}".format(self.ik_solver.link, link)
+            )
+        # the solver gives the first joints, the others are unchanged
+        joint_angles = self.get_joint_angles(self.joint_indices)
+        num_joints = self.ik_solver.num_joints
+        joint_angles[:num_joints] = self.ik_solver.solve(
+            np.asarray(position)[None],
+            np.asarray(orientation)[None],
+            joint_angles[None, :num_joints],
+        )[0]
+        return joint_angles
 
 
 class Task(ABC):
@@ -171,6 +264,7 @@ class Task(ABC):
     def __init__(self, sim: PyBullet) -> None:
         self.sim = sim
         self.goal = None
+        self.np_random = None  # set by the env at the first reset
 
     @abstractmethod
     def reset(self) -> None:
@@ -191,14 +285,51 @@ class Task(ABC):
         else:
             return self.goal.copy()
 
+    def write_obs(self, out: np.ndarray) -> None:
+        """Write the observation associated to the task in a preallocated array.
+
+        Args:
+            out (np.ndarray): Float32 array of the size of the observation.
+        """
+        out[:] = self.get_obs()
+
+    def write_achieved_goal(self, out: np.ndarray) -> None:
+        """Write the achieved goal in a preallocated array.
+
+        Args:
+            out (np.ndarray): Float32 array of the size of the goal.
+        """
+        out[:] = self.get_achieved_goal()
+
+    def write_goal(self, out: np.ndarray) -> None:
+        """Write the current goal in a preallocated array, without copying it first.
+
+        Args:
+            out (np.ndarray): Float32 array of the size of the goal.
+        """
+        if self.goal is None:
+            raise RuntimeError("No goal yet, call reset() first")
+        out[:] = self.goal
+
     @abstractmethod
     def is_success(
         self,
         achieved_goal: np.ndarray,
         desired_goal: np.ndarray,
         info: Dict[str, Any] = {},
+        out: Optional[np.ndarray] = None,
     ) -> np.ndarray:
-        """Returns whether the achieved goal match the desired goal."""
+        """Returns whether the achieved goal match the desired goal. This function is vectorized.
+
+        Args:
+            achieved_goal (np.ndarray): Achieved goal(s), of shape (..., goal_dim).
+            desired_goal (np.ndarray): Desired goal(s), of shape (..., goal_dim).
+            info (dict, optional): Unused, kept for compatibility with the goal env API.
+            out (np.ndarray, optional): Boolean array of shape (...) to write the result in. Defaults to None.
+
+        Returns:
+            np.ndarray: Boolean success flag(s), of shape (...).
+        """
 
     @abstractmethod
     def compute_reward(
@@ -206,8 +337,19 @@ class Task(ABC):
         achieved_goal: np.ndarray,
         desired_goal: np.ndarray,
         info: Dict[str, Any] = {},
+        out: Optional[np.ndarray] = None,
     ) -> np.ndarray:
-        """Compute reward associated to the achieved and the desired goal."""
+        """Compute reward associated to the achieved and the desired goal. This function is vectorized.
+
+        Args:
+            achieved_goal (np.ndarray): Achieved goal(s), of shape (..., goal_dim).
+            desired_goal (np.ndarray): Desired goal(s), of shape (..., goal_dim).
+            info (dict, optional): Unused, kept for compatibility with the goal env API.
+            out (np.ndarray, optional): Float32 array of shape (...) to write the result in. Defaults to None.
+
+        Returns:
+            np.ndarray: The float32 reward(s), of shape (...).
+        """
 
 
 class RobotTaskEnv(gym.Env):
@@ -224,6 +366,18 @@ class RobotTaskEnv(gym.Env):
         render_yaw (float, optional): Yaw of the camera. Defaults to 45.
         render_pitch (float, optional): Pitch of the camera. Defaults to -30.
         render_roll (int, optional): Rool of the camera. Defaults to 0.
+        snapshot_capacity (int, optional): Maximum number of states kept by `save_state`, the least recently
+            used ones are removed beyond. Defaults to None (no limit).
+        pixel_observations (list of str, optional): Images added to the observation dict, among "rgb", "depth"
+            and "segmentation" (see `PyBullet.render_camera_images`). They are seen from the render camera, rendered
+            with the CPU renderer and without shadows. Defaults to () (no image).
+        pixel_width (int, optional): Width of the pixel observations. Defaults to 84.
+        pixel_height (int, optional): Height of the pixel observations. Defaults to 84.
+        frame_stack (int, optional): Number of stacked frames in the pixel observations. If greater than 1, each
+            image gets a leading axis of size `frame_stack`, from the oldest to the newest frame. Defaults to 1.
+        observation_mode (str, optional): "copy" to return observations that the caller owns, or "view" to return
+            views of the buffer the observations are assembled in, which are overwritten by the next `step` or
+            `reset`. The pixel observations are views of the frame stacks in both modes. Defaults to "copy".
     """
 
     metadata = {"render_modes": ["human", "rgb_array"]}
@@ -239,6 +393,12 @@ class RobotTaskEnv(gym.Env):
         render_yaw: float = 45,
         render_pitch: float = -30,
         render_roll: float = 0,
+        snapshot_capacity: Optional[int] = None,
+        pixel_observations: Sequence[str] = (),
+        pixel_width: int = 84,
+        pixel_height: int = 84,
+        frame_stack: int = 1,
+        observation_mode: str = "copy",
     ) -> None:
         assert (
             robot.sim == task.sim
@@ -248,6 +408,40 @@ class RobotTaskEnv(gym.Env):
         self.metadata["render_fps"] = 1 / self.sim.dt
         self.robot = robot
         self.task = task
+        for modality in pixel_observations:
+            if modality not in Camera.MODALITIES:
+                raise ValueError(
+                    "Unknown pixel observation {}, must be in {}".format(
+                        modality, list(Camera.MODALITIES)
+                    )
+                )
+        self.pixel_observations = tuple(pixel_observations)
+        if observation_mode not in ("copy", "view"):
+            raise ValueError("The observation mode must be in {'copy', 'view'}")
+        self.observation_mode = observation_mode
+        # Built at the first observation, when the sizes are known
+        self.observation_layout = None
+        self.frame_stack = frame_stack
+        self.pixel_camera = Camera(
+            width=pixel_width,
+            height=pixel_height,
+            target_position=render_target_position,
+            distance=render_distance,
+            yaw=render_yaw,
+            pitch=render_pitch,
+            roll=render_roll,
+            shadow=False,
+            renderer="Tiny",
+        )
+        # The images are rendered directly in the ring buffers of the stacks
+        self._frame_stacks = {
+            modality: FrameStack(
+                frame_stack,
+                self.pixel_camera.get_buffer(modality).shape,
+                Camera.MODALITIES[modality][1],
+            )
+            for modality in self.pixel_observations
+        }
         observation = self.reset()  # required for init; seed can be changed later
         observation_shape = observation["observation"].shape
         achieved_goal_shape = observation["achieved_goal"].shape
@@ -265,9 +459,22 @@ class RobotTaskEnv(gym.Env):
                 ),
             )
         )
+        pixel_bounds = {
+            "rgb": (0, 255),
+            "depth": (0.0, self.pixel_camera.far_val),
+            "segmentation": (-1, np.iinfo(np.int32).max),
+        }
+        for modality in self.pixel_observations:
+            low, high = pixel_bounds[modality]
+            self.observation_space[modality] = spaces.Box(
+                low,
+                high,
+                shape=observation[modality].shape,
+                dtype=Camera.MODALITIES[modality][1],
+            )
         self.action_space = self.robot.action_space
         self.compute_reward = self.task.compute_reward
-        self._saved_goal = dict()  # For state saving and restoring
+        self.snapshots = SnapshotPool(self.sim, capacity=snapshot_capacity)
 
         self.render_width = render_width
         self.render_height = render_height
@@ -277,27 +484,90 @@ class RobotTaskEnv(gym.Env):
         self.render_pitch = render_pitch
         self.render_roll = render_roll
 
-    def _get_obs(self) -> Dict[str, np.ndarray]:
-        robot_obs = self.robot.get_obs().astype(np.float32)  # robot state
-        task_obs = self.task.get_obs().astype(
-            np.float32
-        )  # object position, velococity, etc...
-        observation = np.concatenate([robot_obs, task_obs])
-        achieved_goal = self.task.get_achieved_goal().astype(np.float32)
-        return {
-            "observation": observation,
-            "achieved_goal": achieved_goal,
-            "desired_goal": self.task.get_goal().astype(np.float32),
+    def _build_observation_layout(self) -> None:
+        """Lay the robot observation, the task observation and the goals out in a single float32 buffer."""
+        sizes = {
+            "robot": len(self.robot.get_obs()),
+            "task": len(self.task.get_obs()),
+            "achieved_goal": len(self.task.get_achieved_goal()),
+            "desired_goal": len(self.task.get_goal()),
         }
+        self.observation_layout = ObservationLayout(sizes)
+        self.bind_observation_buffer(self.observation_layout.buffer)
+
+    def bind_observation_buffer(self, buffer: np.ndarray) -> None:
+        """Assemble the observations in another buffer, for instance a row of a batch buffer.
+
+        Args:
+            buffer (np.ndarray): Float32 buffer of shape (observation_layout.size,). The observation, the achieved
+                goal and the desired goal are laid out contiguously in this order.
+        """
+        layout = self.observation_layout
+        layout.bind(buffer)
+        self._observation_slices = {
+            "observation": layout.span("robot", "task"),
+            "achieved_goal": layout.slices["achieved_goal"],
+            "desired_goal": layout.slices["desired_goal"],
+        }
+        self._observation_views = {
+            key: buffer[s] for key, s in self._observation_slices.items()
+        }
+
+    def _write_state_obs(self) -> None:
+        """Write the observation and the goals in the observation buffer."""
+        if self.observation_layout is None:
+            self._build_observation_layout()
+        views = self.observation_layout.views
+        self.robot.write_obs(views["robot"])  # robot state
+        self.task.write_obs(views["task"])  # object position, velococity, etc...
+        self.task.write_achieved_goal(views["achieved_goal"])
+        self.task.write_goal(views["desired_goal"])
+
+    def _get_obs(self, reset: bool = False) -> Dict[str, np.ndarray]:
+        self._write_state_obs()
+        if self.observation_mode == "view":
+            observation = dict(self._observation_views)
+        else:
+            # a single copy of the buffer, the entries are views of it
+            buffer = self.observation_layout.buffer.copy()
+            observation = {
+                key: buffer[s] for key, s in self._observation_slices.items()
+            }
+        if self.pixel_observations:
+            observation.update(self._get_pixel_obs(reset))
+        return observation
+
+    def _get_pixel_obs(self, reset: bool = False) -> Dict[str, np.ndarray]:
+        """Render the pixel observations and push them in the frame stacks.
+
+        Args:
+            reset (bool, optional): Whether the episode starts, to fill the stacks with the first frame.
+                Defaults to False.
+
+        Returns:
+            dict: The images, or the stacks of images, by modality. They are views of the ring buffers, that are
+                overwritten by the next `step` or `reset`.
+        """
+        out = {
+            modality: frame_stack.next_frame
+            for modality, frame_stack in self._frame_stacks.items()
+        }
+        self.sim.render_camera_images(self.pixel_camera, self.pixel_observations, out)
+        pixel_obs = {}
+        for modality, frame_stack in self._frame_stacks.items():
+            stack = frame_stack.push(reset)
+            pixel_obs[modality] = stack if self.frame_stack > 1 else stack[0]
+        return pixel_obs
 
     def reset(
         self, seed: Optional[int] = None, options: Optional[dict] = None
     ) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
-        self.task.np_random, seed = seeding.np_random(seed)
+        if seed is not None or self.task.np_random is None:
+            self.task.np_random, seed = seeding.np_random(seed)
         with self.sim.no_rendering():
             self.robot.reset()
             self.task.reset()
-        observation = self._get_obs()
+        observation = self._get_obs(reset=True)
         info = {
             "is_success": self.task.is_success(
                 observation["achieved_goal"], self.task.get_goal()
@@ -306,14 +576,16 @@ class RobotTaskEnv(gym.Env):
         return observation
 
     def save_state(self) -> int:
-        """Save the current state of the envrionment. Restore with `restore_state`.
+        """Save the current state of the envrionment, including the task goal and random number generator.
+        Restore with `restore_state`.
+
+        The states are kept in `self.snapshots`. If a capacity was given, saving a state may remove the least
+        recently used ones; use `self.snapshots.acquire` to protect a state from removal.
 
         Returns:
             int: State unique identifier.
         """
-        state_id = self.sim.save_state()
-        self._saved_goal[state_id] = self.task.goal
-        return state_id
+        return self.snapshots.save(self.task.goal, self.task.np_random)
 
     def restore_state(self, state_id: int) -> None:
         """Resotre the state associated with the unique identifier.
@@ -321,8 +593,8 @@ class RobotTaskEnv(gym.Env):
         Args:
             state_id (int): State unique identifier.
         """
-        self.sim.restore_state(state_id)
-        self.task.goal = self._saved_goal[state_id]
+        snapshot = self.snapshots.restore(state_id, self.task.np_random)
+        self.task.goal = snapshot.goal.copy()
 
     def remove_state(self, state_id: int) -> None:
         """Remove a saved state.
@@ -330,8 +602,38 @@ class RobotTaskEnv(gym.Env):
         Args:
             state_id (int): State unique identifier.
         """
-        self._saved_goal.pop(state_id)
-        self.sim.remove_state(state_id)
+        self.snapshots.remove(state_id)
+
+    def to_bytes(self) -> bytes:
+        """Serialize the current state of the environment.
+
+        Unlike the ids returned by `save_state`, which are only valid in the current physics client, the buffer can
+        be restored in another process with `from_bytes`, by an environment of the same id. It contains the state
+        of the simulation (see `PyBullet.get_state`), the task goal and the state of the task random number generator.
+
+        Returns:
+            bytes: The serialized state, in the NumPy ``.npz`` format.
+        """
+        state = self.sim.get_state()
+        state["goal"] = np.asarray(self.task.goal)
+        # The state of the bit generator holds integers that do not fit in an array, store it as JSON
+        rng_state = self.task.np_random.bit_generator.state
+        state["rng_state"] = np.array(json.dumps(rng_state))
+        buffer = io.BytesIO()
+        np.savez(buffer, **state)
+        return buffer.getvalue()
+
+    def from_bytes(self, data: bytes) -> None:
+        """Restore a state serialized with `to_bytes`, possibly by another process.
+
+        Args:
+            data (bytes): The serialized state.
+        """
+        with np.load(io.BytesIO(data), allow_pickle=False) as state:
+            self.sim.set_state(state)
+            self.task.goal = state["goal"]
+            rng_state = json.loads(str(state["rng_state"]))
+            self.task.np_random.bit_generator.state = rng_state
 
     def step(
         self, action: np.ndarray
@@ -354,6 +656,18 @@ class RobotTaskEnv(gym.Env):
     def close(self) -> None:
         self.sim.close()
 
+    def get_render_camera(self) -> Camera:
+        """Returns a new camera with the viewpoint and the image size of `render`."""
+        return Camera(
+            width=self.render_width,
+            height=self.render_height,
+            target_position=self.render_target_position,
+            distance=self.render_distance,
+            yaw=self.render_yaw,
+            pitch=self.render_pitch,
+            roll=self.render_roll,
+        )
+
     def render(self, mode=None, **kwargs) -> Optional[np.ndarray]:
         """Render.
 
@@ -371,3 +685,130 @@ class RobotTaskEnv(gym.Env):
             pitch=self.render_pitch,
             roll=self.render_roll,
         )
+
+
+class BatchedRobotTaskEnv:
+    """Several robotic task envs stepped in lockstep in the current process.
+
+    The simulations of the envs are gathered in a `BatchedPyBullet`, and the results are written in
+    preallocated batch buffers. The rewards are computed in a single vectorized call. The batch API is the
+    same as `panda_gym.vector.SharedMemoryVectorEnv`: `reset` returns the batched observation dict and `step`
+    returns `(observation, reward, done, info)`. Envs that are done are automatically reset, and the last
+    observation of the finished episode is stored in `info["final_observation"]`, whose valid rows are given by the
+    boolean mask `info["_final_observation"]`.
+
+    Args:
+        env_fns (list of callable): Functions creating the envs. They must return unwrapped `RobotTaskEnv`
+            with the same robot and task.
+        max_episode_steps (int, optional): Maximum number of steps per episode. Defaults to None (no limit).
+    """
+
+    def __init__(
+        self,
+        env_fns: Sequence[Callable[[], RobotTaskEnv]],
+        max_episode_steps: Optional[int] = None,
+    ) -> None:
+        self.envs = [env_fn() for env_fn in env_fns]
+        self.num_envs = len(self.envs)
+        self.max_episode_steps = max_episode_steps
+        self.sim = BatchedPyBullet([env.sim for env in self.envs])
+        self.single_observation_space = self.envs[0].observation_space
+        self.single_action_space = self.envs[0].action_space
+        self.observation_space = batch_space(
+            self.single_observation_space, self.num_envs
+        )
+        self.action_space = batch_space(self.single_action_space, self.num_envs)
+        self.compute_reward = self.envs[0].task.compute_reward
+        self._robots = [env.robot for env in self.envs]
+        # The state observations are assembled by the envs directly in the rows of a single batch buffer
+        layout_size = self.envs[0].observation_layout.size
+        self._state_observation = np.zeros(
+            (self.num_envs, layout_size), dtype=np.float32
+        )
+        for env, buffer in zip(self.envs, self._state_observation):
+            env.bind_observation_buffer(buffer)
+        self._observation = {
+            key: self._state_observation[:, s]
+            for key, s in self.envs[0]._observation_slices.items()
+        }
+        for key, space in self.single_observation_space.spaces.items():
+            if key not in self._observation:
+                shape = (self.num_envs,) + space.shape
+                self._observation[key] = np.zeros(shape, dtype=space.dtype)
+        self._final_observation = {
+            key: np.zeros_like(value) for key, value in self._observation.items()
+        }
+        self._elapsed_steps = np.zeros(self.num_envs, dtype=np.int64)
+
+    def _write_obs(self, index: int, observation: Dict[str, np.ndarray]) -> None:
+        for key, value in observation.items():
+            self._observation[key][index] = value
+
+    def reset(
+        self, seed: Optional[Union[int, List[int]]] = None
+    ) -> Dict[str, np.ndarray]:
+        """Reset all the envs.
+
+        Args:
+            seed (int or list of int, optional): Seed(s). If an int is given, the env `i` is seeded with
+                `seed + i`. Defaults to None.
+
+        Returns:
+            dict: The batched observation.
+        """
+        if seed is None or isinstance(seed, int):
+            seeds = [None if seed is None else seed + i for i in range(self.num_envs)]
+        else:
+            seeds = list(seed)
+            assert len(seeds) == self.num_envs, "Expected one seed per env."
+        for i, (env, env_seed) in enumerate(zip(self.envs, seeds)):
+            self._write_obs(i, env.reset(seed=env_seed))
+        self._elapsed_steps[:] = 0
+        return {key: value.copy() for key, value in self._observation.items()}
+
+    def step(
+        self, actions: np.ndarray
+    ) -> Tuple[Dict[str, np.ndarray], np.ndarray, np.ndarray, Dict[str, Any]]:
+        """Step all the envs.
+
+        Args:
+            actions (np.ndarray): The actions, with a leading axis of size `num_envs`.
+
+        Returns:
+            tuple: The batched observation, rewards, dones and info.
+        """
+        self._robots[0].set_batch_action(self._robots, actions)
+        self.sim.step()
+        for i, env in enumerate(self.envs):
+            env._write_state_obs()
+            if env.pixel_observations:
+                self._write_obs(i, env._get_pixel_obs())
+        achieved_goal = self._observation["achieved_goal"]
+        desired_goal = self._observation["desired_goal"]
+        is_success = self.envs[0].task.is_success(achieved_goal, desired_goal)
+        rewards = self.compute_reward(achieved_goal, desired_goal, {})
+        self._elapsed_steps += 1
+        truncated = np.zeros(self.num_envs, dtype=bool)
+        if self.max_episode_steps is not None:
+            truncated = ~is_success & (self._elapsed_steps >= self.max_episode_steps)
+        dones = is_success | truncated
+        for i in np.flatnonzero(dones):
+            for key, value in self._observation.items():
+                self._final_observation[key][i] = value[i]
+            self._write_obs(i, self.envs[i].reset())
+            self._elapsed_steps[i] = 0
+        info = {
+            "is_success": is_success,
+            "TimeLimit.truncated": truncated,
+            "final_observation": {
+                key: value.copy() for key, value in self._final_observation.items()
+            },
+            "_final_observation": dones.copy(),
+        }
+        observation = {key: value.copy() for key, value in self._observation.items()}
+        return observation, rewards, dones, info
+
+    def close(self) -> None:
+        """Close all the envs."""
+        for env in self.envs:
+            env.close()
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Optional, Sequence, Union
 
 import numpy as np
 
@@ -12,6 +12,8 @@ from panda_gym.envs.tasks.reach_curriculum import ReachCurriculum
 from panda_gym.envs.tasks.slide import Slide
 from panda_gym.envs.tasks.stack import Stack
 from panda_gym.envs.tasks.grasp import Grasp
+from panda_gym.kinematics import IKSolver
+from panda_gym.physics import PhysicsProfile
 from panda_gym.pybullet import PyBullet
 
 
@@ -21,7 +23,8 @@ class PandaFlipEnv(RobotTaskEnv):
     Args:
         render_mode (str, optional): Render mode. Defaults to "rgb_array".
         reward_type (str, optional): "sparse" or "dense". Defaults to "sparse".
-        control_type (str, optional): "ee" to control end-effector position or "joints" to control joint values.
+        control_type (str, optional): "ee" to control end-effector position, "joints" to control joint values,
+            or "ee_velocity" (or "ee_velocity_6d") to control end-effector velocity through the Jacobian.
             Defaults to "ee".
         action_type (str, optional): "continuous" or "discrete". Defaults to "continuous".
         renderer (str, optional): Renderer, either "Tiny" or OpenGL". Defaults to "Tiny" if render mode is "human"
@@ -34,6 +37,19 @@ class PandaFlipEnv(RobotTaskEnv):
         render_yaw (float, optional): Yaw of the camera. Defaults to 45.
         render_pitch (float, optional): Pitch of the camera. Defaults to -30.
         render_roll (int, optional): Rool of the camera. Defaults to 0.
+        snapshot_capacity (int, optional): Maximum number of states kept by `save_state`, the least recently
+            used ones are removed beyond. Defaults to None (no limit).
+        pixel_observations (list of str, optional): Images added to the observation dict, among "rgb", "depth"
+            and "segmentation". Defaults to () (no image).
+        pixel_width (int, optional): Width of the pixel observations. Defaults to 84.
+        pixel_height (int, optional): Height of the pixel observations. Defaults to 84.
+        frame_stack (int, optional): Number of stacked frames in the pixel observations. Defaults to 1.
+        observation_mode (str, optional): "copy" to return observations owned by the caller, or "view" to return
+            views of a buffer overwritten by the next `step` or `reset`. Defaults to "copy".
+        physics_profile (str or PhysicsProfile, optional): Timestep, number of substeps and solver parameters, e.g.
+            "fast". See `panda_gym.physics`. Defaults to "default".
+        ik_backend (str or IKSolver, optional): Inverse kinematics of the "ee" control: "pybullet", "analytic" or
+            "dls", see `panda_gym.kinematics`. Defaults to "pybullet".
 
     """
 
@@ -51,14 +67,27 @@ class PandaFlipEnv(RobotTaskEnv):
         render_yaw: float = 45,
         render_pitch: float = -30,
         render_roll: float = 0,
+        snapshot_capacity: Optional[int] = None,
+        pixel_observations: Sequence[str] = (),
+        pixel_width: int = 84,
+        pixel_height: int = 84,
+        frame_stack: int = 1,
+        observation_mode: str = "copy",
+        physics_profile: Union[str, PhysicsProfile] = "default",
+        ik_backend: Union[str, IKSolver] = "pybullet",
     ) -> None:
-        sim = PyBullet(render_mode=render_mode, renderer=renderer)
+        sim = PyBullet(
+            render_mode=render_mode,
+            renderer=renderer,
+            physics_profile=physics_profile,
+        )
         robot = Panda(
             sim,
             block_gripper=False,
             base_position=np.array([-0.6, 0.0, 0.0]),
             control_type=control_type,
             action_type=action_type,
+            ik_backend=ik_backend,
         )
         task = Flip(sim, reward_type=reward_type)
         super().__init__(
@@ -71,6 +100,12 @@ class PandaFlipEnv(RobotTaskEnv):
             render_yaw=render_yaw,
             render_pitch=render_pitch,
             render_roll=render_roll,
+            snapshot_capacity=snapshot_capacity,
+            pixel_observations=pixel_observations,
+            pixel_width=pixel_width,
+            pixel_height=pixel_height,
+            frame_stack=frame_stack,
+            observation_mode=observation_mode,
         )
 
 
@@ -80,7 +115,8 @@ class PandaPickAndPlaceEnv(RobotTaskEnv):
     Args:
         render_mode (str, optional): Render mode. Defaults to "rgb_array".
         reward_type (str, optional): "sparse" or "dense". Defaults to "sparse".
-        control_type (str, optional): "ee" to control end-effector position or "joints" to control joint values.
+        control_type (str, optional): "ee" to control end-effector position, "joints" to control joint values,
+            or "ee_velocity" (or "ee_velocity_6d") to control end-effector velocity through the Jacobian.
             Defaults to "ee".
         action_type (str, optional): "continuous" or "discrete". Defaults to "continuous".
         renderer (str, optional): Renderer, either "Tiny" or OpenGL". Defaults to "Tiny" if render mode is "human"
@@ -93,6 +129,19 @@ class PandaPickAndPlaceEnv(RobotTaskEnv):
         render_yaw (float, optional): Yaw of the camera. Defaults to 45.
         render_pitch (float, optional): Pitch of the camera. Defaults to -30.
         render_roll (int, optional): Rool of the camera. Defaults to 0.
+        snapshot_capacity (int, optional): Maximum number of states kept by `save_state`, the least recently
+            used ones are removed beyond. Defaults to None (no limit).
+        pixel_observations (list of str, optional): Images added to the observation dict, among "rgb", "depth"
+            and "segmentation". Defaults to () (no image).
+        pixel_width (int, optional): Width of the pixel observations. Defaults to 84.
+        pixel_height (int, optional): Height of the pixel observations. Defaults to 84.
+        frame_stack (int, optional): Number of stacked frames in the pixel observations. Defaults to 1.
+        observation_mode (str, optional): "copy" to return observations owned by the caller, or "view" to return
+            views of a buffer overwritten by the next `step` or `reset`. Defaults to "copy".
+        physics_profile (str or PhysicsProfile, optional): Timestep, number of substeps and solver parameters, e.g.
+            "fast". See `panda_gym.physics`. Defaults to "default".
+        ik_backend (str or IKSolver, optional): Inverse kinematics of the "ee" control: "pybullet", "analytic" or
+            "dls", see `panda_gym.kinematics`. Defaults to "pybullet".
     """
 
     def __init__(
@@ -109,14 +158,27 @@ class PandaPickAndPlaceEnv(RobotTaskEnv):
         render_yaw: float = 45,
         render_pitch: float = -30,
         render_roll: float = 0,
+        snapshot_capacity: Optional[int] = None,
+        pixel_observations: Sequence[str] = (),
+        pixel_width: int = 84,
+        pixel_height: int = 84,
+        frame_stack: int = 1,
+        observation_mode: str = "copy",
+        physics_profile: Union[str, PhysicsProfile] = "default",
+        ik_backend: Union[str, IKSolver] = "pybullet",
     ) -> None:
-        sim = PyBullet(render_mode=render_mode, renderer=renderer)
+        sim = PyBullet(
+            render_mode=render_mode,
+            renderer=renderer,
+            physics_profile=physics_profile,
+        )
         robot = Panda(
             sim,
             block_gripper=False,
             base_position=np.array([-0.6, 0.0, 0.0]),
             control_type=control_type,
             action_type=action_type,
+            ik_backend=ik_backend,
         )
         task = PickAndPlace(sim, get_ee_position=robot.get_ee_position, reward_type=reward_type)
         super().__init__(
@@ -129,6 +191,12 @@ class PandaPickAndPlaceEnv(RobotTaskEnv):
             render_yaw=render_yaw,
             render_pitch=render_pitch,
             render_roll=render_roll,
+            snapshot_capacity=snapshot_capacity,
+            pixel_observations=pixel_observations,
+            pixel_width=pixel_width,
+            pixel_height=pixel_height,
+            frame_stack=frame_stack,
+            observation_mode=observation_mode,
         )
 
 
@@ -138,7 +206,8 @@ class PandaPushEnv(RobotTaskEnv):
     Args:
         render_mode (str, optional): Render mode. Defaults to "rgb_array".
         reward_type (str, optional): "sparse" or "dense". Defaults to "sparse".
-        control_type (str, optional): "ee" to control end-effector position or "joints" to control joint values.
+        control_type (str, optional): "ee" to control end-effector position, "joints" to control joint values,
+            or "ee_velocity" (or "ee_velocity_6d") to control end-effector velocity through the Jacobian.
             Defaults to "ee".
         action_type (str, optional): "continuous" or "discrete". Defaults to "continuous".
         renderer (str, optional): Renderer, either "Tiny" or OpenGL". Defaults to "Tiny" if render mode is "human"
@@ -151,6 +220,19 @@ class PandaPushEnv(RobotTaskEnv):
         render_yaw (float, optional): Yaw of the camera. Defaults to 45.
         render_pitch (float, optional): Pitch of the camera. Defaults to -30.
         render_roll (int, optional): Rool of the camera. Defaults to 0.
+        snapshot_capacity (int, optional): Maximum number of states kept by `save_state`, the least recently
+            used ones are removed beyond. Defaults to None (no limit).
+        pixel_observations (list of str, optional): Images added to the observation dict, among "rgb", "depth"
+            and "segmentation". Defaults to () (no image).
+        pixel_width (int, optional): Width of the pixel observations. Defaults to 84.
+        pixel_height (int, optional): Height of the pixel observations. Defaults to 84.
+        frame_stack (int, optional): Number of stacked frames in the pixel observations. Defaults to 1.
+        observation_mode (str, optional): "copy" to return observations owned by the caller, or "view" to return
+            views of a buffer overwritten by the next `step` or `reset`. Defaults to "copy".
+        physics_profile (str or PhysicsProfile, optional): Timestep, number of substeps and solver parameters, e.g.
+            "fast". See `panda_gym.physics`. Defaults to "default".
+        ik_backend (str or IKSolver, optional): Inverse kinematics of the "ee" control: "pybullet", "analytic" or
+            "dls", see `panda_gym.kinematics`. Defaults to "pybullet".
     """
 
     def __init__(
@@ -167,14 +249,27 @@ class PandaPushEnv(RobotTaskEnv):
         render_yaw: float = 45,
         render_pitch: float = -30,
         render_roll: float = 0,
+        snapshot_capacity: Optional[int] = None,
+        pixel_observations: Sequence[str] = (),
+        pixel_width: int = 84,
+        pixel_height: int = 84,
+        frame_stack: int = 1,
+        observation_mode: str = "copy",
+        physics_profile: Union[str, PhysicsProfile] = "default",
+        ik_backend: Union[str, IKSolver] = "pybullet",
     ) -> None:
-        sim = PyBullet(render_mode=render_mode, renderer=renderer)
+        sim = PyBullet(
+            render_mode=render_mode,
+            renderer=renderer,
+            physics_profile=physics_profile,
+        )
         robot = Panda(
             sim,
             block_gripper=True,
             base_position=np.array([-0.6, 0.0, 0.0]),
             control_type=control_type,
             action_type=action_type,
+            ik_backend=ik_backend,
         )
         task = Push(sim, reward_type=reward_type)
         super().__init__(
@@ -187,6 +282,12 @@ class PandaPushEnv(RobotTaskEnv):
             render_yaw=render_yaw,
             render_pitch=render_pitch,
             render_roll=render_roll,
+            snapshot_capacity=snapshot_capacity,
+            pixel_observations=pixel_observations,
+            pixel_width=pixel_width,
+            pixel_height=pixel_height,
+            frame_stack=frame_stack,
+            observation_mode=observation_mode,
         )
 
 
@@ -196,7 +297,8 @@ class PandaReachEnv(RobotTaskEnv):
     Args:
         render_mode (str, optional): Render mode. Defaults to "rgb_array".
         reward_type (str, optional): "sparse" or "dense". Defaults to "sparse".
-        control_type (str, optional): "ee" to control end-effector position or "joints" to control joint values.
+        control_type (str, optional): "ee" to control end-effector position, "joints" to control joint values,
+            or "ee_velocity" (or "ee_velocity_6d") to control end-effector velocity through the Jacobian.
             Defaults to "ee".
         action_type (str, optional): "continuous" or "discrete". Defaults to "continuous".
         renderer (str, optional): Renderer, either "Tiny" or OpenGL". Defaults to "Tiny" if render mode is "human"
@@ -209,6 +311,22 @@ class PandaReachEnv(RobotTaskEnv):
         render_yaw (float, optional): Yaw of the camera. Defaults to 45.
         render_pitch (float, optional): Pitch of the camera. Defaults to -30.
         render_roll (int, optional): Rool of the camera. Defaults to 0.
+        snapshot_capacity (int, optional): Maximum number of states kept by `save_state`, the least recently
+            used ones are removed beyond. Defaults to None (no limit).
+        pixel_observations (list of str, optional): Images added to the observation dict, among "rgb", "depth"
+            and "segmentation". Defaults to () (no image).
+        pixel_width (int, optional): Width of the pixel observations. Defaults to 84.
+        pixel_height (int, optional): Height of the pixel observations. Defaults to 84.
+        frame_stack (int, optional): Number of stacked frames in the pixel observations. Defaults to 1.
+        observation_mode (str, optional): "copy" to return observations owned by the caller, or "view" to return
+            views of a buffer overwritten by the next `step` or `reset`. Defaults to "copy".
+        physics_profile (str or PhysicsProfile, optional): Timestep, number of substeps and solver parameters, e.g.
+            "fast". See `panda_gym.physics`. Defaults to "default".
+        kinematic (bool, optional): Whether to move the arm kinematically, without simulating the dynamics. The
+            joints cover in each step the distance the motors would cover without load. Much faster, and close
+            to the dynamic mode, see the documentation for the tolerance. Defaults to False.
+        ik_backend (str or IKSolver, optional): Inverse kinematics of the "ee" control: "pybullet", "analytic" or
+            "dls", see `panda_gym.kinematics`. Defaults to "pybullet".
     """
 
     def __init__(
@@ -225,14 +343,29 @@ class PandaReachEnv(RobotTaskEnv):
         render_yaw: float = 45,
         render_pitch: float = -30,
         render_roll: float = 0,
+        snapshot_capacity: Optional[int] = None,
+        pixel_observations: Sequence[str] = (),
+        pixel_width: int = 84,
+        pixel_height: int = 84,
+        frame_stack: int = 1,
+        observation_mode: str = "copy",
+        physics_profile: Union[str, PhysicsProfile] = "default",
+        kinematic: bool = False,
+        ik_backend: Union[str, IKSolver] = "pybullet",
     ) -> None:
-        sim = PyBullet(render_mode=render_mode, renderer=renderer)
+        sim = PyBullet(
+            render_mode=render_mode,
+            renderer=renderer,
+            physics_profile=physics_profile,
+            kinematic=kinematic,
+        )
         robot = Panda(
             sim,
             block_gripper=True,
             base_position=np.array([-0.6, 0.0, 0.0]),
             control_type=control_type,
             action_type=action_type,
+            ik_backend=ik_backend,
         )
         task = Reach(
             sim, reward_type=reward_type, get_ee_position=robot.get_ee_position
@@ -247,6 +380,12 @@ class PandaReachEnv(RobotTaskEnv):
             render_yaw=render_yaw,
             render_pitch=render_pitch,
             render_roll=render_roll,
+            snapshot_capacity=snapshot_capacity,
+            pixel_observations=pixel_observations,
+            pixel_width=pixel_width,
+            pixel_height=pixel_height,
+            frame_stack=frame_stack,
+            observation_mode=observation_mode,
         )
 
 class PandaReachCurriculumEnv(RobotTaskEnv):
@@ -255,7 +394,8 @@ class PandaReachCurriculumEnv(RobotTaskEnv):
     Args:
         render_mode (str, optional): Render mode. Defaults to "rgb_array".
         reward_type (str, optional): "sparse" or "dense". Defaults to "sparse".
-        control_type (str, optional): "ee" to control end-effector position or "joints" to control joint values.
+        control_type (str, optional): "ee" to control end-effector position, "joints" to control joint values,
+            or "ee_velocity" (or "ee_velocity_6d") to control end-effector velocity through the Jacobian.
             Defaults to "ee".
         action_type (str, optional): "continuous" or "discrete". Defaults to "continuous".
         renderer (str, optional): Renderer, either "Tiny" or OpenGL". Defaults to "Tiny" if render mode is "human"
@@ -268,6 +408,22 @@ class PandaReachCurriculumEnv(RobotTaskEnv):
         render_yaw (float, optional): Yaw of the camera. Defaults to 45.
         render_pitch (float, optional): Pitch of the camera. Defaults to -30.
         render_roll (int, optional): Rool of the camera. Defaults to 0.
+        snapshot_capacity (int, optional): Maximum number of states kept by `save_state`, the least recently
+            used ones are removed beyond. Defaults to None (no limit).
+        pixel_observations (list of str, optional): Images added to the observation dict, among "rgb", "depth"
+            and "segmentation". Defaults to () (no image).
+        pixel_width (int, optional): Width of the pixel observations. Defaults to 84.
+        pixel_height (int, optional): Height of the pixel observations. Defaults to 84.
+        frame_stack (int, optional): Number of stacked frames in the pixel observations. Defaults to 1.
+        observation_mode (str, optional): "copy" to return observations owned by the caller, or "view" to return
+            views of a buffer overwritten by the next `step` or `reset`. Defaults to "copy".
+        physics_profile (str or PhysicsProfile, optional): Timestep, number of substeps and solver parameters, e.g.
+            "fast". See `panda_gym.physics`. Defaults to "default".
+        kinematic (bool, optional): Whether to move the arm kinematically, without simulating the dynamics. The
+            joints cover in each step the distance the motors would cover without load. Much faster, and close
+            to the dynamic mode, see the documentation for the tolerance. Defaults to False.
+        ik_backend (str or IKSolver, optional): Inverse kinematics of the "ee" control: "pybullet", "analytic" or
+            "dls", see `panda_gym.kinematics`. Defaults to "pybullet".
     """
 
     def __init__(
@@ -284,14 +440,29 @@ class PandaReachCurriculumEnv(RobotTaskEnv):
         render_yaw: float = 45,
         render_pitch: float = -30,
         render_roll: float = 0,
+        snapshot_capacity: Optional[int] = None,
+        pixel_observations: Sequence[str] = (),
+        pixel_width: int = 84,
+        pixel_height: int = 84,
+        frame_stack: int = 1,
+        observation_mode: str = "copy",
+        physics_profile: Union[str, PhysicsProfile] = "default",
+        kinematic: bool = False,
+        ik_backend: Union[str, IKSolver] = "pybullet",
     ) -> None:
-        sim = PyBullet(render_mode=render_mode, renderer=renderer)
+        sim = PyBullet(
+            render_mode=render_mode,
+            renderer=renderer,
+            physics_profile=physics_profile,
+            kinematic=kinematic,
+        )
         robot = Panda(
             sim,
             block_gripper=True,
             base_position=np.array([-0.6, 0.0, 0.0]),
             control_type=control_type,
             action_type=action_type,
+            ik_backend=ik_backend,
         )
         task = ReachCurriculum(
             sim, reward_type=reward_type, get_ee_position=robot.get_ee_position
@@ -306,6 +477,12 @@ class PandaReachCurriculumEnv(RobotTaskEnv):
             render_yaw=render_yaw,
             render_pitch=render_pitch,
             render_roll=render_roll,
+            snapshot_capacity=snapshot_capacity,
+            pixel_observations=pixel_observations,
+            pixel_width=pixel_width,
+            pixel_height=pixel_height,
+            frame_stack=frame_stack,
+            observation_mode=observation_mode,
         )
 
 
@@ -315,7 +492,8 @@ class PandaGraspEnv(RobotTaskEnv):
     Args:
         render_mode (str, optional): Render mode. Defaults to "rgb_array".
         reward_type (str, optional): "sparse" or "dense". Defaults to "sparse".
-        control_type (str, optional): "ee" to control end-effector position or "joints" to control joint values.
+        control_type (str, optional): "ee" to control end-effector position, "joints" to control joint values,
+            or "ee_velocity" (or "ee_velocity_6d") to control end-effector velocity through the Jacobian.
             Defaults to "ee".
         action_type (str, optional): "continuous" or "discrete". Defaults to "continuous".
         renderer (str, optional): Renderer, either "Tiny" or OpenGL". Defaults to "Tiny" if render mode is "human"
@@ -328,6 +506,19 @@ class PandaGraspEnv(RobotTaskEnv):
         render_yaw (float, optional): Yaw of the camera. Defaults to 45.
         render_pitch (float, optional): Pitch of the camera. Defaults to -30.
         render_roll (int, optional): Rool of the camera. Defaults to 0.
+        snapshot_capacity (int, optional): Maximum number of states kept by `save_state`, the least recently
+            used ones are removed beyond. Defaults to None (no limit).
+        pixel_observations (list of str, optional): Images added to the observation dict, among "rgb", "depth"
+            and "segmentation". Defaults to () (no image).
+        pixel_width (int, optional): Width of the pixel observations. Defaults to 84.
+        pixel_height (int, optional): Height of the pixel observations. Defaults to 84.
+        frame_stack (int, optional): Number of stacked frames in the pixel observations. Defaults to 1.
+        observation_mode (str, optional): "copy" to return observations owned by the caller, or "view" to return
+            views of a buffer overwritten by the next `step` or `reset`. Defaults to "copy".
+        physics_profile (str or PhysicsProfile, optional): Timestep, number of substeps and solver parameters, e.g.
+            "fast". See `panda_gym.physics`. Defaults to "default".
+        ik_backend (str or IKSolver, optional): Inverse kinematics of the "ee" control: "pybullet", "analytic" or
+            "dls", see `panda_gym.kinematics`. Defaults to "pybullet".
     """
 
     def __init__(
@@ -344,14 +535,27 @@ class PandaGraspEnv(RobotTaskEnv):
         render_yaw: float = 45,
         render_pitch: float = -30,
         render_roll: float = 0,
+        snapshot_capacity: Optional[int] = None,
+        pixel_observations: Sequence[str] = (),
+        pixel_width: int = 84,
+        pixel_height: int = 84,
+        frame_stack: int = 1,
+        observation_mode: str = "copy",
+        physics_profile: Union[str, PhysicsProfile] = "default",
+        ik_backend: Union[str, IKSolver] = "pybullet",
     ) -> None:
-        sim = PyBullet(render_mode=render_mode, renderer=renderer)
+        sim = PyBullet(
+            render_mode=render_mode,
+            renderer=renderer,
+            physics_profile=physics_profile,
+        )
         robot = Panda(
             sim,
             block_gripper=False,
             base_position=np.array([-0.6, 0.0, 0.0]),
             control_type=control_type,
             action_type=action_type,
+            ik_backend=ik_backend,
         )
         task = Grasp(
             sim, reward_type=reward_type, get_ee_position=robot.get_ee_position
@@ -366,6 +570,12 @@ class PandaGraspEnv(RobotTaskEnv):
             render_yaw=render_yaw,
             render_pitch=render_pitch,
             render_roll=render_roll,
+            snapshot_capacity=snapshot_capacity,
+            pixel_observations=pixel_observations,
+            pixel_width=pixel_width,
+            pixel_height=pixel_height,
+            frame_stack=frame_stack,
+            observation_mode=observation_mode,
         )
 
 
@@ -375,7 +585,8 @@ class PandaSlideEnv(RobotTaskEnv):
     Args:
         render_mode (str, optional): Render mode. Defaults to "rgb_array".
         reward_type (str, optional): "sparse" or "dense". Defaults to "sparse".
-        control_type (str, optional): "ee" to control end-effector position or "joints" to control joint values.
+        control_type (str, optional): "ee" to control end-effector position, "joints" to control joint values,
+            or "ee_velocity" (or "ee_velocity_6d") to control end-effector velocity through the Jacobian.
             Defaults to "ee".
         action_type (str, optional): "continuous" or "discrete". Defaults to "continuous".
         renderer (str, optional): Renderer, either "Tiny" or OpenGL". Defaults to "Tiny" if render mode is "human"
@@ -388,6 +599,19 @@ class PandaSlideEnv(RobotTaskEnv):
         render_yaw (float, optional): Yaw of the camera. Defaults to 45.
         render_pitch (float, optional): Pitch of the camera. Defaults to -30.
         render_roll (int, optional): Rool of the camera. Defaults to 0.
+        snapshot_capacity (int, optional): Maximum number of states kept by `save_state`, the least recently
+            used ones are removed beyond. Defaults to None (no limit).
+        pixel_observations (list of str, optional): Images added to the observation dict, among "rgb", "depth"
+            and "segmentation". Defaults to () (no image).
+        pixel_width (int, optional): Width of the pixel observations. Defaults to 84.
+        pixel_height (int, optional): Height of the pixel observations. Defaults to 84.
+        frame_stack (int, optional): Number of stacked frames in the pixel observations. Defaults to 1.
+        observation_mode (str, optional): "copy" to return observations owned by the caller, or "view" to return
+            views of a buffer overwritten by the next `step` or `reset`. Defaults to "copy".
+        physics_profile (str or PhysicsProfile, optional): Timestep, number of substeps and solver parameters, e.g.
+            "fast". See `panda_gym.physics`. Defaults to "default".
+        ik_backend (str or IKSolver, optional): Inverse kinematics of the "ee" control: "pybullet", "analytic" or
+            "dls", see `panda_gym.kinematics`. Defaults to "pybullet".
     """
 
     def __init__(
@@ -404,14 +628,27 @@ class PandaSlideEnv(RobotTaskEnv):
         render_yaw: float = 45,
         render_pitch: float = -30,
         render_roll: float = 0,
+        snapshot_capacity: Optional[int] = None,
+        pixel_observations: Sequence[str] = (),
+        pixel_width: int = 84,
+        pixel_height: int = 84,
+        frame_stack: int = 1,
+        observation_mode: str = "copy",
+        physics_profile: Union[str, PhysicsProfile] = "default",
+        ik_backend: Union[str, IKSolver] = "pybullet",
     ) -> None:
-        sim = PyBullet(render_mode=render_mode, renderer=renderer)
+        sim = PyBullet(
+            render_mode=render_mode,
+            renderer=renderer,
+            physics_profile=physics_profile,
+        )
         robot = Panda(
             sim,
             block_gripper=True,
             base_position=np.array([-0.6, 0.0, 0.0]),
             control_type=control_type,
             action_type=action_type,
+            ik_backend=ik_backend,
         )
         task = Slide(sim, reward_type=reward_type)
         super().__init__(
@@ -424,6 +661,12 @@ class PandaSlideEnv(RobotTaskEnv):
             render_yaw=render_yaw,
             render_pitch=render_pitch,
             render_roll=render_roll,
+            snapshot_capacity=snapshot_capacity,
+            pixel_observations=pixel_observations,
+            pixel_width=pixel_width,
+            pixel_height=pixel_height,
+            frame_stack=frame_stack,
+            observation_mode=observation_mode,
         )
 
 
@@ -433,7 +676,8 @@ class PandaStackEnv(RobotTaskEnv):
     Args:
         render_mode (str, optional): Render mode. Defaults to "rgb_array".
         reward_type (str, optional): "sparse" or "dense". Defaults to "sparse".
-        control_type (str, optional): "ee" to control end-effector position or "joints" to control joint values.
+        control_type (str, optional): "ee" to control end-effector position, "joints" to control joint values,
+            or "ee_velocity" (or "ee_velocity_6d") to control end-effector velocity through the Jacobian.
             Defaults to "ee".
         action_type (str, optional): "continuous" or "discrete". Defaults to "continuous".
         renderer (str, optional): Renderer, either "Tiny" or OpenGL". Defaults to "Tiny" if render mode is "human"
@@ -446,6 +690,19 @@ class PandaStackEnv(RobotTaskEnv):
         render_yaw (float, optional): Yaw of the camera. Defaults to 45.
         render_pitch (float, optional): Pitch of the camera. Defaults to -30.
         render_roll (int, optional): Rool of the camera. Defaults to 0.
+        snapshot_capacity (int, optional): Maximum number of states kept by `save_state`, the least recently
+            used ones are removed beyond. Defaults to None (no limit).
+        pixel_observations (list of str, optional): Images added to the observation dict, among "rgb", "depth"
+            and "segmentation". Defaults to () (no image).
+        pixel_width (int, optional): Width of the pixel observations. Defaults to 84.
+        pixel_height (int, optional): Height of the pixel observations. Defaults to 84.
+        frame_stack (int, optional): Number of stacked frames in the pixel observations. Defaults to 1.
+        observation_mode (str, optional): "copy" to return observations owned by the caller, or "view" to return
+            views of a buffer overwritten by the next `step` or `reset`. Defaults to "copy".
+        physics_profile (str or PhysicsProfile, optional): Timestep, number of substeps and solver parameters, e.g.
+            "fast". See `panda_gym.physics`. Defaults to "default".
+        ik_backend (str or IKSolver, optional): Inverse kinematics of the "ee" control: "pybullet", "analytic" or
+            "dls", see `panda_gym.kinematics`. Defaults to "pybullet".
     """
 
     def __init__(
@@ -462,14 +719,27 @@ class PandaStackEnv(RobotTaskEnv):
         render_yaw: float = 45,
         render_pitch: float = -30,
         render_roll: float = 0,
+        snapshot_capacity: Optional[int] = None,
+        pixel_observations: Sequence[str] = (),
+        pixel_width: int = 84,
+        pixel_height: int = 84,
+        frame_stack: int = 1,
+        observation_mode: str = "copy",
+        physics_profile: Union[str, PhysicsProfile] = "default",
+        ik_backend: Union[str, IKSolver] = "pybullet",
     ) -> None:
-        sim = PyBullet(render_mode=render_mode, renderer=renderer)
+        sim = PyBullet(
+            render_mode=render_mode,
+            renderer=renderer,
+            physics_profile=physics_profile,
+        )
         robot = Panda(
             sim,
             block_gripper=False,
             base_position=np.array([-0.6, 0.0, 0.0]),
             control_type=control_type,
             action_type=action_type,
+            ik_backend=ik_backend,
         )
         task = Stack(sim, reward_type=reward_type)
         super().__init__(
@@ -482,4 +752,10 @@ class PandaStackEnv(RobotTaskEnv):
             render_yaw=render_yaw,
             render_pitch=render_pitch,
             render_roll=render_roll,
+            snapshot_capacity=snapshot_capacity,
+            pixel_observations=pixel_observations,
+            pixel_width=pixel_width,
+            pixel_height=pixel_height,
+            frame_stack=frame_stack,
+            observation_mode=observation_mode,
         )
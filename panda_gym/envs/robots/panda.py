@@ -1,10 +1,18 @@
-from typing import Optional, Union
+from typing import Any, Optional, Sequence, Union
 
 import numpy as np
 from gym import spaces
 
 from panda_gym.envs.core import PyBulletRobot
-from panda_gym.pybullet import PyBullet
+from panda_gym.kinematics import (
+    PANDA_LOWER_LIMITS,
+    PANDA_UPPER_LIMITS,
+    IKSolver,
+    damped_least_squares,
+    make_ik_solver,
+    quaternion_error,
+)
+from panda_gym.pybullet import Camera, PyBullet
 import itertools
 
 
@@ -15,8 +23,12 @@ class Panda(PyBulletRobot):
         sim (PyBullet): Simulation instance.
         block_gripper (bool, optional): Whether the gripper is blocked. Defaults to False.
         base_position (np.ndarray, optionnal): Position of the base base of the robot, as (x, y, z). Defaults to (0, 0, 0).
-        control_type (str, optional): "ee" to control end-effector displacement or "joints" to control joint angles.
+        control_type (str, optional): "ee" to control end-effector displacement, "joints" to control joint angles,
+            "ee_velocity" to control end-effector displacement through the Jacobian, without inverse kinematics, or
+            "ee_velocity_6d" to control end-effector displacement and rotation through the Jacobian.
             Defaults to "ee".
+        ik_backend (str or IKSolver, optional): Inverse kinematics of the "ee" control: "pybullet", "analytic" or
+            "dls", see `panda_gym.kinematics`. Defaults to "pybullet".
     """
 
     def __init__(
@@ -26,15 +38,18 @@ class Panda(PyBulletRobot):
         base_position: Optional[np.ndarray] = None,
         control_type: str = "ee",
         action_type: str = "continuous",
+        ik_backend: Union[str, IKSolver] = "pybullet",
     ) -> None:
         base_position = base_position if base_position is not None else np.zeros(3)
+        self.ik_solver = make_ik_solver(ik_backend, base_position)
         self.action_type = action_type
         self.block_gripper = block_gripper
         self.control_type = control_type
         self.discrete_action_space = None
-        n_action = (
-            3 if self.control_type == "ee" else 7
-        )  # control (x, y z) if "ee", else, control the 7 joints
+        # control (x, y, z) if "ee" or "ee_velocity", also the rotation if "ee_velocity_6d", else, the 7 joints
+        n_action = {"ee": 3, "ee_velocity": 3, "ee_velocity_6d": 6}.get(
+            self.control_type, 7
+        )
         n_action += 0 if self.block_gripper else 1
         if self.action_type == "continuous":
             action_space = spaces.Box(-1.0, 1.0, shape=(n_action,), dtype=np.float32)
@@ -53,11 +68,14 @@ class Panda(PyBulletRobot):
             ),
         )
 
+        self.arm_joint_indices = np.arange(7)
         self.fingers_indices = np.array([9, 10])
         self.neutral_joint_values = np.array(
             [0.00, 0.41, 0.00, -1.85, 0.00, 2.26, 0.79, 0.00, 0.00]
         )
         self.ee_link = 11
+        self.ee_orientation = np.array([1.0, 0.0, 0.0, 0.0])  # pointing down
+        self.jacobian_damping = 0.1
         self.sim.set_lateral_friction(
             self.body_name, self.fingers_indices[0], lateral_friction=1.0
         )
@@ -72,25 +90,65 @@ class Panda(PyBulletRobot):
         )
 
     def set_action(self, action: Union[np.ndarray, int]) -> None:
-        if self.action_type == "continuous":
-            action = action.copy()  # ensure action don't change
-            action = np.clip(action, self.action_space.low, self.action_space.high)
-        else:
-            action = 0.5 * self.discrete_action_space[action].copy()
-        target_arm_angles = None
-        target_fingers_width = None
-
+        action = self._preprocess_action(action)
         if self.control_type == "ee":
             ee_displacement = action[:3]
             target_arm_angles = self.ee_displacement_to_target_arm_angles(
                 ee_displacement
             )
+        elif self.control_type in ["ee_velocity", "ee_velocity_6d"]:
+            ee_velocity = (
+                action[:6] if self.control_type == "ee_velocity_6d" else action[:3]
+            )
+            target_arm_angles = self.ee_velocity_to_target_arm_angles(ee_velocity)
         else:
             arm_joint_ctrl = action[:7]
             target_arm_angles = self.arm_joint_ctrl_to_target_arm_angles(
                 arm_joint_ctrl
             )
+        self._control(target_arm_angles, action)
+
+    @classmethod
+    def set_batch_action(cls, robots: Sequence["Panda"], actions: np.ndarray) -> None:
+        """Set the actions of several Panda robots. With the "ee" control and an IK backend other than
+        "pybullet", the inverse kinematics of all the robots is solved in a single call.
+
+        Args:
+            robots (list of Panda): The robots, with the same arguments.
+            actions (np.ndarray): The actions, with a leading axis of size `len(robots)`.
+        """
+        ik_solver = robots[0].ik_solver
+        if robots[0].control_type != "ee" or ik_solver is None:
+            super().set_batch_action(robots, actions)
+            return
+        actions = [
+            robot._preprocess_action(action) for robot, action in zip(robots, actions)
+        ]
+        target_ee_positions = np.stack(
+            [
+                robot.ee_displacement_to_target_ee_position(action[:3])
+                for robot, action in zip(robots, actions)
+            ]
+        )
+        arm_joint_angles = np.stack(
+            [robot.get_joint_angles(robot.arm_joint_indices) for robot in robots]
+        )
+        orientations = np.broadcast_to(robots[0].ee_orientation, (len(robots), 4))
+        target_arm_angles = ik_solver.solve(
+            target_ee_positions, orientations, arm_joint_angles
+        )
+        for robot, action, angles in zip(robots, actions, target_arm_angles):
+            robot._control(angles, action)
 
+    def _preprocess_action(self, action: Union[np.ndarray, int]) -> np.ndarray:
+        """Returns the clipped action, or the continuous action of a discrete action."""
+        if self.action_type == "continuous":
+            action = action.copy()  # ensure action don't change
+            return np.clip(action, self.action_space.low, self.action_space.high)
+        return 0.5 * self.discrete_action_space[action].copy()
+
+    def _control(self, target_arm_angles: np.ndarray, action: np.ndarray) -> None:
+        """Control the arm towards target angles, and the fingers according to the action."""
         if self.block_gripper:
             target_fingers_width = 0
         else:
@@ -98,22 +156,21 @@ class Panda(PyBulletRobot):
             fingers_width = self.get_fingers_width()
             target_fingers_width = fingers_width + fingers_ctrl
 
-
         target_angles = np.concatenate(
             (target_arm_angles, [target_fingers_width / 2, target_fingers_width / 2])
         )
         self.control_joints(target_angles=target_angles)
 
-    def ee_displacement_to_target_arm_angles(
+    def ee_displacement_to_target_ee_position(
         self, ee_displacement: np.ndarray
     ) -> np.ndarray:
-        """Compute the target arm angles from the end-effector displacement.
+        """Compute the target end-effector position from the end-effector displacement.
 
         Args:
             ee_displacement (np.ndarray): End-effector displacement, as (dx, dy, dy).
 
         Returns:
-            np.ndarray: Target arm angles, as the angles of the 7 arm joints.
+            np.ndarray: Target end-effector position, as (x, y, z).
         """
         ee_displacement = ee_displacement[:3] * 0.05  # limit maximum change in position
         # get the current position and the target position
@@ -121,15 +178,57 @@ class Panda(PyBulletRobot):
         target_ee_position = ee_position + ee_displacement
         # Clip the height target. For some reason, it has a great impact on learning
         target_ee_position[2] = np.max((0, target_ee_position[2]))
+        return target_ee_position
+
+    def ee_displacement_to_target_arm_angles(
+        self, ee_displacement: np.ndarray
+    ) -> np.ndarray:
+        """Compute the target arm angles from the end-effector displacement.
+
+        Args:
+            ee_displacement (np.ndarray): End-effector displacement, as (dx, dy, dy).
+
+        Returns:
+            np.ndarray: Target arm angles, as the angles of the 7 arm joints.
+        """
+        target_ee_position = self.ee_displacement_to_target_ee_position(ee_displacement)
         # compute the new joint angles
         target_arm_angles = self.inverse_kinematics(
             link=self.ee_link,
             position=target_ee_position,
-            orientation=np.array([1.0, 0.0, 0.0, 0.0]),
+            orientation=self.ee_orientation,
         )
         target_arm_angles = target_arm_angles[:7]  # remove fingers angles
         return target_arm_angles
 
+    def ee_velocity_to_target_arm_angles(self, ee_velocity: np.ndarray) -> np.ndarray:
+        """Compute the target arm angles from the end-effector velocity, with the damped pseudo-inverse of the
+        Jacobian: a single linear solve instead of an iterative inverse kinematics, exact for small displacements.
+
+        Args:
+            ee_velocity (np.ndarray): End-effector displacement, as (dx, dy, dz), and rotation vector, as
+                (rx, ry, rz), if any. Without rotation, the end-effector is kept pointing down.
+
+        Returns:
+            np.ndarray: Target arm angles, as the angles of the 7 arm joints.
+        """
+        ee_state = self.get_link_states([self.ee_link], compute_velocity=False)[0]
+        twist = np.empty(6)
+        twist[:3] = ee_velocity[:3] * 0.05  # limit maximum change in position
+        # Clip the height target, as the "ee" control
+        twist[2] = max(twist[2], -ee_state[2])
+        if len(ee_velocity) == 6:
+            twist[3:] = ee_velocity[3:6] * 0.2  # limit maximum rotation
+        else:
+            twist[3:] = quaternion_error(ee_state[3:7], self.ee_orientation)
+        # the joints of the robot are the non-fixed joints of the body
+        joint_angles = self.get_joint_angles(self.joint_indices)
+        jacobian = self.get_jacobian(self.ee_link, joint_angles)[:, :7]
+        target_arm_angles = joint_angles[:7] + damped_least_squares(
+            jacobian, twist, self.jacobian_damping
+        )
+        return np.clip(target_arm_angles, PANDA_LOWER_LIMITS, PANDA_UPPER_LIMITS)
+
     def arm_joint_ctrl_to_target_arm_angles(
         self, arm_joint_ctrl: np.ndarray
     ) -> np.ndarray:
@@ -143,16 +242,15 @@ class Panda(PyBulletRobot):
         """
         arm_joint_ctrl = arm_joint_ctrl * 0.05  # limit maximum change in position
         # get the current position and the target position
-        current_arm_joint_angles = np.array(
-            [self.get_joint_angle(joint=i) for i in range(7)]
-        )
+        current_arm_joint_angles = self.get_joint_angles(self.arm_joint_indices)
         target_arm_angles = current_arm_joint_angles + arm_joint_ctrl
         return target_arm_angles
 
     def get_obs(self) -> np.ndarray:
-        # end-effector position and velocity
-        ee_position = np.array(self.get_ee_position())
-        ee_velocity = np.array(self.get_ee_velocity())
+        # end-effector position and velocity, from a single link state query
+        ee_state = self.get_link_states([self.ee_link])[0]
+        ee_position = ee_state[0:3]
+        ee_velocity = ee_state[7:10]
         # fingers opening
         if not self.block_gripper:
             fingers_width = self.get_fingers_width()
@@ -161,6 +259,13 @@ class Panda(PyBulletRobot):
             observation = np.concatenate((ee_position, ee_velocity))
         return observation
 
+    def write_obs(self, out: np.ndarray) -> None:
+        ee_state = self.get_link_states([self.ee_link])[0]
+        out[0:3] = ee_state[0:3]  # position
+        out[3:6] = ee_state[7:10]  # velocity
+        if not self.block_gripper:
+            out[6] = self.get_fingers_width()
+
     def reset(self) -> None:
         self.set_joint_neutral()
 
@@ -170,9 +275,8 @@ class Panda(PyBulletRobot):
 
     def get_fingers_width(self) -> float:
         """Get the distance between the fingers."""
-        finger1 = self.sim.get_joint_angle(self.body_name, self.fingers_indices[0])
-        finger2 = self.sim.get_joint_angle(self.body_name, self.fingers_indices[1])
-        return finger1 + finger2
+        fingers_angles = self.get_joint_angles(self.fingers_indices)
+        return fingers_angles[0] + fingers_angles[1]
 
     def get_ee_position(self) -> np.ndarray:
         """Returns the position of the ned-effector as (x, y, z)"""
@@ -181,3 +285,17 @@ class Panda(PyBulletRobot):
     def get_ee_velocity(self) -> np.ndarray:
         """Returns the velocity of the end-effector as (vx, vy, vz)"""
         return self.get_link_velocity(self.ee_link)
+
+    def wrist_camera(self, **kwargs: Any) -> Camera:
+        """Returns a camera attached to the hand, looking along the fingers.
+
+        Args:
+            **kwargs: Passed to `Camera`, e.g. `width` and `height`, or `eye_offset` to move the camera in the frame
+                of the end-effector link. Defaults to a camera 10 cm behind the fingertips and 5 cm aside.
+
+        Returns:
+            Camera: The camera, to add to the simulation with `sim.add_camera`.
+        """
+        defaults = {"eye_offset": [0.05, 0.0, -0.1], "near_val": 0.01, "fov": 70}
+        kwargs = {**defaults, **kwargs}
+        return Camera(body_name=self.body_name, link=self.ee_link, **kwargs)
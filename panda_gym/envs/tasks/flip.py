@@ -1,10 +1,11 @@
-from typing import Any, Dict, Tuple
+from typing import Any, Dict, Optional, Tuple
 
 import numpy as np
 from scipy.spatial.transform import Rotation as R
 
 from panda_gym.envs.core import Task
 from panda_gym.pybullet import PyBullet
+from panda_gym.rewards import get_kernel
 from panda_gym.utils import angle_distance
 
 
@@ -18,6 +19,7 @@ class Flip(Task):
     ) -> None:
         super().__init__(sim)
         self.reward_type = reward_type
+        self.reward_kernel = get_kernel(reward_type + "_angle")
         self.distance_threshold = distance_threshold
         self.object_size = 0.04
         self.obj_range_low = np.array([-obj_xy_range / 2, -obj_xy_range / 2, 0])
@@ -74,7 +76,7 @@ class Flip(Task):
 
     def _sample_goal(self) -> np.ndarray:
         """Randomize goal."""
-        goal = R.random().as_quat()
+        goal = R.random(random_state=self.np_random).as_quat()
         return goal
 
     def _sample_object(self) -> Tuple[np.ndarray, np.ndarray]:
@@ -86,16 +88,22 @@ class Flip(Task):
         return object_position, object_rotation
 
     def is_success(
-        self, achieved_goal: np.ndarray, desired_goal: np.ndarray
+        self,
+        achieved_goal: np.ndarray,
+        desired_goal: np.ndarray,
+        info: Dict[str, Any] = {},
+        out: Optional[np.ndarray] = None,
     ) -> np.ndarray:
         d = angle_distance(achieved_goal, desired_goal)
-        return np.array(d < self.distance_threshold, dtype=bool)
+        return np.less(d, self.distance_threshold, out=out)
 
     def compute_reward(
-        self, achieved_goal, desired_goal, info: Dict[str, Any]
+        self,
+        achieved_goal: np.ndarray,
+        desired_goal: np.ndarray,
+        info: Dict[str, Any] = {},
+        out: Optional[np.ndarray] = None,
     ) -> np.ndarray:
-        d = angle_distance(achieved_goal, desired_goal)
-        if self.reward_type == "sparse":
-            return -np.array(d > self.distance_threshold, dtype=np.float32)
-        else:
-            return -d.astype(np.float32)
+        return self.reward_kernel(
+            achieved_goal, desired_goal, self.distance_threshold, out=out
+        )
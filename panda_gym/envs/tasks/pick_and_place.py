@@ -1,10 +1,11 @@
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 import numpy as np
 
 from panda_gym.envs.core import Task
 from panda_gym.pybullet import PyBullet
-from panda_gym.utils import distance
+from panda_gym.rewards import get_kernel
+from panda_gym.utils import goal_distance
 
 
 class PickAndPlace(Task):
@@ -20,6 +21,7 @@ class PickAndPlace(Task):
     ) -> None:
         super().__init__(sim)
         self.reward_type = reward_type
+        self.reward_kernel = get_kernel(reward_type + "_pick_and_place")
         self.distance_threshold = distance_threshold
         self.get_ee_position = get_ee_position
         self.object_size = 0.04
@@ -104,72 +106,30 @@ class PickAndPlace(Task):
         return object_position
 
     def is_success(
-        self, achieved_goal: np.ndarray, desired_goal: np.ndarray
+        self,
+        achieved_goal: np.ndarray,
+        desired_goal: np.ndarray,
+        info: Dict[str, Any] = {},
+        out: Optional[np.ndarray] = None,
     ) -> np.ndarray:
-        if achieved_goal.ndim == 1:
-            d = distance(achieved_goal[5:8], desired_goal[5:8])
-        else:
-            d = distance(achieved_goal[:, 5:8], desired_goal[:, 5:8])
-        return np.array(d < self.distance_threshold, dtype=bool)
+        d = goal_distance(achieved_goal[..., 5:8], desired_goal[..., 5:8])
+        return np.less(d, self.distance_threshold, out=out)
 
     def compute_reward(
-        self, achieved_goal, desired_goal, info: Dict[str, Any]
+        self,
+        achieved_goal: np.ndarray,
+        desired_goal: np.ndarray,
+        info: Dict[str, Any] = {},
+        out: Optional[np.ndarray] = None,
     ) -> np.ndarray:
-        if self.reward_type == "sparse":
-            if achieved_goal.ndim == 1:
-                d = distance(achieved_goal, desired_goal)
-            else:
-                d = distance(achieved_goal[:, 5:8], desired_goal[:, 5:8])
-
-            reward = -np.array(d > self.distance_threshold, dtype=np.float32)
-            return reward
-
-        else:
-            if achieved_goal.ndim == 1:
-                obj_d = distance(achieved_goal[2:5], desired_goal[2:5])
-                target_d = distance(achieved_goal[5:8], desired_goal[5:8])
-                distance_reward = self.distance_threshold - obj_d
-                target_reward = self.distance_threshold - target_d
-                distance_reward[distance_reward > 0] = 0
-                target_reward[target_reward > 0] = 0
-
-                contact_reward = achieved_goal[1] - desired_goal[1]
-                grasp_reward = achieved_goal[0] - desired_goal[0]
-
-                if grasp_reward == 0:
-                    distance_reward = 0
-
-            else:
-                obj_d = distance(achieved_goal[:, 2:5], desired_goal[:, 2:5])
-                target_d = distance(achieved_goal[:, 5:8], desired_goal[:, 5:8])
-                distance_reward = self.distance_threshold - obj_d
-                target_reward = self.distance_threshold - target_d
-                distance_reward[distance_reward > 0] = 0
-                target_reward[target_reward > 0] = 0
-
-                contact_reward = achieved_goal[:, 1] - desired_goal[:, 1]
-                grasp_reward = achieved_goal[:, 0] - desired_goal[:, 0]
-
-                distance_reward[grasp_reward == 0] = 0
-
-            return (
-                1 / 6 * distance_reward
-                + 2 / 6 * contact_reward
-                + 2 / 6 * grasp_reward
-                + 1 / 6 * target_reward
-            )
+        return self.reward_kernel(
+            achieved_goal, desired_goal, self.distance_threshold, out=out
+        )
 
     def grasped(self) -> bool:
-        left_contact = False
-        right_contact = False
-
-        normals = self.sim.get_contact_normals("panda", "object")
-        if np.any(normals):
-            left_contact = np.any(normals[:, 1] > 0.99)
-            right_contact = np.any(normals[:, 1] < -0.99)
-
-        return left_contact and right_contact
+        # grasped if the object is squeezed from both sides along y
+        normals_y = self.sim.get_contacts("panda", "object")[:, 2]
+        return bool(np.any(normals_y > 0.99) and np.any(normals_y < -0.99))
 
     def touching_object(self) -> bool:
-        normals = self.sim.get_contact_normals("panda", "object")
-        return np.any(normals)
+        return self.sim.get_contacts("panda", "object").shape[0] > 0
@@ -1,9 +1,10 @@
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 import numpy as np
 
 from panda_gym.envs.core import Task
-from panda_gym.utils import distance
+from panda_gym.rewards import get_kernel
+from panda_gym.utils import goal_distance
 
 
 class Push(Task):
@@ -17,6 +18,7 @@ class Push(Task):
     ) -> None:
         super().__init__(sim)
         self.reward_type = reward_type
+        self.reward_kernel = get_kernel(reward_type + "_distance")
         self.distance_threshold = distance_threshold
         self.object_size = 0.04
         self.goal_range_low = np.array([-goal_xy_range / 2, -goal_xy_range / 2, 0])
@@ -93,16 +95,22 @@ class Push(Task):
         return object_position
 
     def is_success(
-        self, achieved_goal: np.ndarray, desired_goal: np.ndarray
+        self,
+        achieved_goal: np.ndarray,
+        desired_goal: np.ndarray,
+        info: Dict[str, Any] = {},
+        out: Optional[np.ndarray] = None,
     ) -> np.ndarray:
-        d = distance(achieved_goal, desired_goal)
-        return np.array(d < self.distance_threshold, dtype=bool)
+        d = goal_distance(achieved_goal, desired_goal)
+        return np.less(d, self.distance_threshold, out=out)
 
     def compute_reward(
-        self, achieved_goal, desired_goal, info: Dict[str, Any]
+        self,
+        achieved_goal: np.ndarray,
+        desired_goal: np.ndarray,
+        info: Dict[str, Any] = {},
+        out: Optional[np.ndarray] = None,
     ) -> np.ndarray:
-        d = distance(achieved_goal, desired_goal)
-        if self.reward_type == "sparse":
-            return -np.array(d > self.distance_threshold, dtype=np.float32)
-        else:
-            return -d.astype(np.float32)
+        return self.reward_kernel(
+            achieved_goal, desired_goal, self.distance_threshold, out=out
+        )
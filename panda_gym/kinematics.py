@@ -0,0 +1,595 @@
+"""Kinematics of the Panda arm in NumPy, and inverse kinematics (IK) backends.
+
+The backends solve the IK of the end-effector link of the Panda (the grasp target, link 11) for a batch of targets
+at once:
+
+    - "pybullet": the iterative solver of PyBullet, `calculateInverseKinematics`, one target at a time. The default.
+    - "analytic": the closed-form solution of the arm, with the angle of the last joint as redundancy parameter.
+      The angle is either fixed, or chosen so that the solution is the nearest to the current joint angles.
+    - "dls": damped least squares, iterated from the current joint angles, vectorized over the batch.
+
+Other backends can be registered with `register_ik_backend`.
+"""
+
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Optional, Union
+
+import numpy as np
+
+PANDA_EE_LINK = 11
+# Joint limits of the arm, from the URDF
+PANDA_LOWER_LIMITS = np.array(
+    [-2.9671, -1.8326, -2.9671, -3.1416, -2.9671, -0.0873, -2.9671]
+)
+PANDA_UPPER_LIMITS = np.array([2.9671, 1.8326, 2.9671, 0.0, 2.9671, 3.8223, 2.9671])
+
+# Origins of the joints in the frame of their parent link, from the URDF: every joint is a rotation about the z
+# axis of its frame, which is the frame of the parent link translated, then rotated by +-pi/2 about x.
+_JOINT_OFFSETS = np.array(
+    [
+        [0.0, 0.0, 0.333],
+        [0.0, 0.0, 0.0],
+        [0.0, -0.316, 0.0],
+        [0.0825, 0.0, 0.0],
+        [-0.0825, 0.384, 0.0],
+        [0.0, 0.0, 0.0],
+        [0.088, 0.0, 0.0],
+    ]
+)
+_HAS_OFFSET = _JOINT_OFFSETS.any(axis=-1).tolist()
+_JOINT_ROLLS = np.array([0.0, -0.5, 0.5, 0.5, -0.5, 0.5, 0.5]) * np.pi
+# From the frame of the last joint to the grasp target: flange, hand rotated by -pi/4, then grasp target
+_FLANGE_TO_EE = 0.107 + 0.105
+_HAND_YAW = -np.pi / 4
+
+
+def _rot_x(angle: float) -> np.ndarray:
+    c, s = np.cos(angle), np.sin(angle)
+    return np.array([[1.0, 0.0, 0.0], [0.0, c, -s], [0.0, s, c]])
+
+
+def _rot_z(angles: np.ndarray) -> np.ndarray:
+    """Rotation matrices about z, of shape angles.shape + (3, 3)."""
+    c, s = np.cos(angles), np.sin(angles)
+    matrices = np.zeros(np.shape(angles) + (3, 3))
+    matrices[..., 0, 0] = c
+    matrices[..., 0, 1] = -s
+    matrices[..., 1, 0] = s
+    matrices[..., 1, 1] = c
+    matrices[..., 2, 2] = 1.0
+    return matrices
+
+
+_JOINT_ROTATIONS = np.stack([_rot_x(roll) for roll in _JOINT_ROLLS])
+_HAND_ROTATION = _rot_z(np.array(_HAND_YAW))
+# The two branches of the solutions of the analytic IK
+_BRANCH_SIGNS = np.array([1.0, -1.0])
+_BRANCH_SHIFTS = np.array([0.0, np.pi])
+
+
+def quaternion_to_matrix(quaternions: np.ndarray) -> np.ndarray:
+    """Rotation matrices of quaternions.
+
+    Args:
+        quaternions (np.ndarray): Quaternions as (x, y, z, w), of shape (..., 4).
+
+    Returns:
+        np.ndarray: Rotation matrices, of shape (..., 3, 3).
+    """
+    quaternions = np.asarray(quaternions, dtype=np.float64)
+    x, y, z, w = np.moveaxis(quaternions, -1, 0)
+    scale = 2.0 / np.sum(quaternions**2, axis=-1)  # normalizes the quaternions
+    matrices = np.empty(quaternions.shape[:-1] + (3, 3))
+    matrices[..., 0, 0] = 1.0 - scale * (y * y + z * z)
+    matrices[..., 0, 1] = scale * (x * y - z * w)
+    matrices[..., 0, 2] = scale * (x * z + y * w)
+    matrices[..., 1, 0] = scale * (x * y + z * w)
+    matrices[..., 1, 1] = 1.0 - scale * (x * x + z * z)
+    matrices[..., 1, 2] = scale * (y * z - x * w)
+    matrices[..., 2, 0] = scale * (x * z - y * w)
+    matrices[..., 2, 1] = scale * (y * z + x * w)
+    matrices[..., 2, 2] = 1.0 - scale * (x * x + y * y)
+    return matrices
+
+
+class PandaKinematics:
+    """Forward kinematics and Jacobian of the Panda arm, vectorized over a batch of joint angles.
+
+    Args:
+        base_position (np.ndarray, optional): Position of the base of the robot, as (x, y, z). The base is not
+            rotated. Defaults to (0, 0, 0).
+    """
+
+    num_joints = 7
+    lower_limits = PANDA_LOWER_LIMITS
+    upper_limits = PANDA_UPPER_LIMITS
+
+    def __init__(self, base_position: Optional[np.ndarray] = None) -> None:
+        self.base_position = (
+            np.zeros(3)
+            if base_position is None
+            else np.array(base_position, dtype=np.float64)
+        )
+
+    def joint_frames(self, joint_angles: np.ndarray) -> tuple:
+        """Frames of the links of the arm, and of the end-effector.
+
+        Args:
+            joint_angles (np.ndarray): Angles of the 7 arm joints, of shape (..., 7).
+
+        Returns:
+            tuple: The positions of the joints and of the end-effector, of shape (..., 8, 3), and the orientations
+                of the links and of the end-effector as rotation matrices, of shape (..., 8, 3, 3). The z axis of
+                the frame of a link is the axis of its joint.
+        """
+        joint_angles = np.asarray(joint_angles, dtype=np.float64)
+        batch_shape = joint_angles.shape[:-1]
+        # the rotation of each link relative to its parent
+        link_rotations = _JOINT_ROTATIONS @ _rot_z(joint_angles)
+        positions = np.empty(batch_shape + (self.num_joints + 1, 3))
+        rotations = np.empty(batch_shape + (self.num_joints + 1, 3, 3))
+        position = self.base_position + _JOINT_OFFSETS[0]
+        rotation = link_rotations[..., 0, :, :]
+        positions[..., 0, :] = position
+        rotations[..., 0, :, :] = rotation
+        for joint in range(1, self.num_joints):
+            if _HAS_OFFSET[joint]:
+                position = position + rotation @ _JOINT_OFFSETS[joint]
+            rotation = rotation @ link_rotations[..., joint, :, :]
+            positions[..., joint, :] = position
+            rotations[..., joint, :, :] = rotation
+        positions[..., -1, :] = position + _FLANGE_TO_EE * rotation[..., 2]
+        rotations[..., -1, :, :] = rotation @ _HAND_ROTATION
+        return positions, rotations
+
+    def forward(self, joint_angles: np.ndarray) -> tuple:
+        """Pose of the end-effector.
+
+        Args:
+            joint_angles (np.ndarray): Angles of the 7 arm joints, of shape (..., 7).
+
+        Returns:
+            tuple: The position of the end-effector, of shape (..., 3), and its orientation as a rotation matrix,
+                of shape (..., 3, 3).
+        """
+        positions, rotations = self.joint_frames(joint_angles)
+        return positions[..., -1, :], rotations[..., -1, :, :]
+
+    def jacobian(self, joint_angles: np.ndarray) -> np.ndarray:
+        """Geometric Jacobian of the end-effector, in the world frame.
+
+        Args:
+            joint_angles (np.ndarray): Angles of the 7 arm joints, of shape (..., 7).
+
+        Returns:
+            np.ndarray: The Jacobian, of shape (..., 6, 7): the linear velocity, then the angular velocity.
+        """
+        positions, rotations = self.joint_frames(joint_angles)
+        return self._jacobian(positions, rotations)
+
+    @staticmethod
+    def _jacobian(positions: np.ndarray, rotations: np.ndarray) -> np.ndarray:
+        # the linear velocity is the cross product of the axis and the vector from the joint to the end-effector
+        ax, ay, az = np.moveaxis(rotations[..., :-1, :, 2], -1, 0)  # (..., 7) each
+        dx, dy, dz = np.moveaxis(positions[..., -1:, :] - positions[..., :-1, :], -1, 0)
+        jacobian = np.empty(ax.shape[:-1] + (6, ax.shape[-1]))
+        jacobian[..., 0, :] = ay * dz - az * dy
+        jacobian[..., 1, :] = az * dx - ax * dz
+        jacobian[..., 2, :] = ax * dy - ay * dx
+        jacobian[..., 3, :] = ax
+        jacobian[..., 4, :] = ay
+        jacobian[..., 5, :] = az
+        return jacobian
+
+
+def orientation_error(rotation: np.ndarray, target_rotation: np.ndarray) -> np.ndarray:
+    """Rotation vector from rotations to target rotations, exact for small errors.
+
+    Args:
+        rotation (np.ndarray): Rotation matrices, of shape (..., 3, 3).
+        target_rotation (np.ndarray): Target rotation matrices, of shape (..., 3, 3).
+
+    Returns:
+        np.ndarray: The rotation vectors, in the world frame, of shape (..., 3).
+    """
+    difference = target_rotation @ np.swapaxes(rotation, -1, -2)
+    difference = difference - np.swapaxes(difference, -1, -2)
+    return 0.5 * difference[..., [2, 0, 1], [1, 2, 0]]
+
+
+def quaternion_error(
+    orientation: np.ndarray, target_orientation: np.ndarray
+) -> np.ndarray:
+    """Same as `orientation_error`, from unit quaternions, without computing the rotation matrices.
+
+    Args:
+        orientation (np.ndarray): Unit quaternions as (x, y, z, w), of shape (..., 4).
+        target_orientation (np.ndarray): Target unit quaternions as (x, y, z, w), of shape (..., 4).
+
+    Returns:
+        np.ndarray: The rotation vectors, in the world frame, of shape (..., 3).
+    """
+    x, y, z, w = np.moveaxis(np.asarray(orientation, dtype=np.float64), -1, 0)
+    tx, ty, tz, tw = np.moveaxis(np.asarray(target_orientation), -1, 0)
+    # the error quaternion is target * conjugate(orientation), its rotation vector is 2 * w * (x, y, z)
+    error_w = tw * w + tx * x + ty * y + tz * z
+    errors = np.empty(np.broadcast(x, tx).shape + (3,))
+    errors[..., 0] = 2.0 * error_w * (w * tx - tw * x - ty * z + tz * y)
+    errors[..., 1] = 2.0 * error_w * (w * ty - tw * y - tz * x + tx * z)
+    errors[..., 2] = 2.0 * error_w * (w * tz - tw * z - tx * y + ty * x)
+    return errors
+
+
+def damped_least_squares(
+    jacobian: np.ndarray, error: np.ndarray, damping: float
+) -> np.ndarray:
+    """Joint displacement reducing a task-space error: ``J^T (J J^T + damping^2 I)^-1 e``.
+
+    The damping keeps the displacement bounded near the singularities, where the pseudo-inverse diverges.
+
+    Args:
+        jacobian (np.ndarray): Jacobians, of shape (..., m, n).
+        error (np.ndarray): Errors, of shape (..., m).
+        damping (float): Damping factor.
+
+    Returns:
+        np.ndarray: The joint displacements, of shape (..., n).
+    """
+    jacobian_t = np.swapaxes(jacobian, -1, -2)
+    regularization = damping**2 * np.eye(jacobian.shape[-2])
+    step = np.linalg.solve(jacobian @ jacobian_t + regularization, error[..., None])
+    return (jacobian_t @ step)[..., 0]
+
+
+class IKSolver(ABC):
+    """Inverse kinematics of a link of a robot, for a batch of targets.
+
+    The solver gives the angles of the first `num_joints` joints of the robot; the other joints, such as the
+    fingers, are left unchanged.
+    """
+
+    link: int
+    num_joints: int
+
+    @abstractmethod
+    def solve(
+        self,
+        positions: np.ndarray,
+        orientations: Optional[np.ndarray],
+        joint_angles: np.ndarray,
+    ) -> np.ndarray:
+        """Solve the inverse kinematics.
+
+        Args:
+            positions (np.ndarray): Target positions of the link, of shape (batch_size, 3).
+            orientations (np.ndarray, optional): Target orientations of the link as quaternions (x, y, z, w), of
+                shape (batch_size, 4). None to reach the positions with any orientation.
+            joint_angles (np.ndarray): Current joint angles, of shape (batch_size, num_joints).
+
+        Returns:
+            np.ndarray: The joint angles, of shape (batch_size, num_joints).
+        """
+
+
+class DampedLeastSquaresIK(IKSolver):
+    """Damped least squares IK of the Panda end-effector, iterated from the current joint angles.
+
+    Each iteration moves the joints by ``J^T (J J^T + damping^2 I)^-1 e``, where ``e`` is the pose error and ``J``
+    the Jacobian, for all the targets of the batch at once. The damping keeps the steps bounded near the
+    singularities, at the cost of a slower convergence.
+
+    Args:
+        base_position (np.ndarray, optional): Position of the base of the robot. Defaults to (0, 0, 0).
+        damping (float, optional): Damping factor. Defaults to 0.05.
+        max_iterations (int, optional): Maximum number of iterations. Defaults to 20.
+        tolerance (float, optional): The iterations stop when the position error, in meters, and the orientation
+            error, in radians, are below this tolerance for every target. Defaults to 1e-4.
+    """
+
+    link = PANDA_EE_LINK
+    num_joints = 7
+
+    def __init__(
+        self,
+        base_position: Optional[np.ndarray] = None,
+        damping: float = 0.05,
+        max_iterations: int = 20,
+        tolerance: float = 1e-4,
+    ) -> None:
+        self.kinematics = PandaKinematics(base_position)
+        self.damping = damping
+        self.max_iterations = max_iterations
+        self.tolerance = tolerance
+
+    def solve(
+        self,
+        positions: np.ndarray,
+        orientations: Optional[np.ndarray],
+        joint_angles: np.ndarray,
+    ) -> np.ndarray:
+        kinematics = self.kinematics
+        joint_angles = np.array(joint_angles, dtype=np.float64)
+        target_rotations = (
+            None if orientations is None else quaternion_to_matrix(orientations)
+        )
+        num_rows = 3 if orientations is None else 6
+        for _ in range(self.max_iterations):
+            frame_positions, frame_rotations = kinematics.joint_frames(joint_angles)
+            error = positions - frame_positions[:, -1]
+            if target_rotations is not None:
+                rotation_error = orientation_error(
+                    frame_rotations[:, -1], target_rotations
+                )
+                error = np.concatenate([error, rotation_error], axis=-1)
+            if np.all(np.abs(error) < self.tolerance):
+                break
+            jacobian = kinematics._jacobian(frame_positions, frame_rotations)[
+                :, :num_rows
+            ]
+            joint_angles += damped_least_squares(jacobian, error, self.damping)
+            np.clip(
+                joint_angles,
+                kinematics.lower_limits,
+                kinematics.upper_limits,
+                out=joint_angles,
+            )
+        return joint_angles
+
+
+class AnalyticPandaIK(IKSolver):
+    """Closed-form IK of the Panda end-effector.
+
+    Once the angle of the last joint is chosen, the pose of the wrist is known, and the other angles follow from
+    the geometry of the arm: the elbow angle from the distance between the shoulder and the wrist, then the two
+    wrist angles, then the three shoulder angles. This gives up to 8 solutions, among which the one within the
+    joint limits and nearest to the current joint angles is kept.
+
+    With `last_joint_angle` None, the angle of the last joint is chosen among `num_candidates` values around its
+    current angle, then refined, so that the solution is the nearest to the current joint angles. The targets
+    without solution near the current joint angles are solved by damped least squares: out of reach, with an
+    orientation not reachable within the joint limits, or only reachable by a jump to another branch of the
+    solutions, as happens at the limits of the workspace.
+
+    Args:
+        base_position (np.ndarray, optional): Position of the base of the robot. Defaults to (0, 0, 0).
+        last_joint_angle (float, optional): Fixed angle of the last joint. Defaults to None (nearest to current).
+        search_range (float, optional): Half-width of the range of the candidate angles of the last joint, around
+            the current angle, in radians. Defaults to 0.2.
+        num_candidates (int, optional): Number of candidate angles of the last joint. Defaults to 5.
+        max_joint_step (float, optional): Maximum change of a joint angle, in radians. The solutions beyond are
+            discarded. Defaults to 0.5.
+    """
+
+    link = PANDA_EE_LINK
+    num_joints = 7
+
+    # Geometry of the arm, see `_solve`
+    _SHOULDER_HEIGHT = 0.333
+    _UPPER_ARM = 0.316
+    _ELBOW_OFFSET = 0.0825
+    _FOREARM = 0.384
+    _WRIST_OFFSET = 0.088
+
+    def __init__(
+        self,
+        base_position: Optional[np.ndarray] = None,
+        last_joint_angle: Optional[float] = None,
+        search_range: float = 0.2,
+        num_candidates: int = 5,
+        max_joint_step: float = 0.5,
+    ) -> None:
+        self.kinematics = PandaKinematics(base_position)
+        self.last_joint_angle = last_joint_angle
+        self.max_joint_step = max_joint_step
+        self.offsets = np.linspace(-search_range, search_range, num_candidates)
+        self.fallback = DampedLeastSquaresIK(base_position)
+        lower, upper = PANDA_LOWER_LIMITS, PANDA_UPPER_LIMITS
+        self._center = (lower + upper) / 2
+
+    def _solve(
+        self,
+        positions: np.ndarray,
+        rotations: np.ndarray,
+        last_joint_angles: np.ndarray,
+    ) -> tuple:
+        """All the solutions for given angles of the last joint.
+
+        Args:
+            positions (np.ndarray): Target positions, relative to the base, of shape (batch_size, 3).
+            rotations (np.ndarray): Target rotation matrices, of shape (batch_size, 3, 3).
+            last_joint_angles (np.ndarray): Angles of the last joint, of shape (batch_size, K).
+
+        Returns:
+            tuple: The solutions, of shape (batch_size, K, 8, 7), and whether they are valid, of shape
+                (batch_size, K, 8).
+        """
+        batch_size, num_angles = last_joint_angles.shape
+        q7 = last_joint_angles
+        # Frame of the last joint, then of the wrist (joints 6 and 5 share their origin)
+        rotation_7 = rotations @ _HAND_ROTATION.T
+        position_7 = positions - _FLANGE_TO_EE * rotations[:, :, 2]
+        rotation_6 = (
+            rotation_7[:, None] @ _rot_z(-q7) @ _JOINT_ROTATIONS[6].T
+        )  # (B, K, 3, 3)
+        wrist = position_7[:, None] - self._WRIST_OFFSET * rotation_6[..., 0]
+        shoulder = np.array([0.0, 0.0, self._SHOULDER_HEIGHT])
+        to_shoulder = shoulder - wrist  # (B, K, 3)
+
+        # Elbow: the squared distance shoulder-wrist is A + 2 (B cos q4 + C sin q4)
+        a4, d3, d5 = self._ELBOW_OFFSET, self._UPPER_ARM, self._FOREARM
+        coef_a = a4**2 + d3**2 + a4**2 + d5**2
+        coef_b, coef_c = -(a4**2) + d3 * d5, -a4 * d5 - d3 * a4
+        cos_elbow = (np.sum(to_shoulder**2, axis=-1) - coef_a) / (
+            2 * np.hypot(coef_b, coef_c)
+        )
+        valid = np.abs(cos_elbow) <= 1.0
+        elbow = np.arccos(np.clip(cos_elbow, -1.0, 1.0))
+        phase = np.arctan2(coef_c, coef_b)
+        q4 = phase + elbow[..., None] * _BRANCH_SIGNS  # (B, K, 2)
+        c4, s4 = np.cos(q4), np.sin(q4)
+
+        # Wrist, joint 6: the shoulder is at a fixed height along the axis of joint 5, (sin q6, cos q6, 0) in
+        # the frame of joint 6
+        local = np.einsum("bkji,bkj->bki", rotation_6, to_shoulder)
+        height_5 = a4 * s4 - d3 * c4 - d5  # (B, K, 2)
+        radius = np.hypot(local[..., 0], local[..., 1])[..., None]
+        sin_ratio = height_5 / np.maximum(radius, 1e-12)
+        valid = valid[..., None] & (np.abs(sin_ratio) <= 1.0)
+        theta = np.arcsin(np.clip(sin_ratio, -1.0, 1.0))
+        phi = np.arctan2(local[..., 1], local[..., 0])[..., None]
+        q6 = (
+            theta[..., None] * _BRANCH_SIGNS + _BRANCH_SHIFTS - phi[..., None]
+        )  # (B, K, 2 (q4), 2 (q6))
+
+        # Wrist, joint 5: the shoulder is at (X cos q5, -X sin q5, height) in the frame of joint 5
+        rotation_5 = rotation_6[:, :, None, None] @ _rot_z(-q6) @ _JOINT_ROTATIONS[5].T
+        shoulder_5 = np.einsum("bkmnji,bkj->bkmni", rotation_5, to_shoulder)
+        offset_x = (a4 - a4 * c4 - d3 * s4)[..., None]
+        sign = np.where(offset_x < 0, -1.0, 1.0)
+        q5 = np.arctan2(-sign * shoulder_5[..., 1], sign * shoulder_5[..., 0])
+
+        # Shoulder: the rotation of the frame of joint 3 is Rz(q1) Ry(q2) Rz(q3)
+        rotation_4 = rotation_5 @ _rot_z(-q5) @ _JOINT_ROTATIONS[4].T
+        rotation_3 = rotation_4 @ _rot_z(-q4[..., None]) @ _JOINT_ROTATIONS[3].T
+        r02, r12, r22 = (
+            rotation_3[..., 0, 2],
+            rotation_3[..., 1, 2],
+            rotation_3[..., 2, 2],
+        )
+        r20, r21 = rotation_3[..., 2, 0], rotation_3[..., 2, 1]
+        q2 = np.arccos(np.clip(r22, -1.0, 1.0))
+        q1 = np.arctan2(r12, r02)
+        q3 = np.arctan2(r21, -r20)
+        # the two branches of the shoulder: (q1, q2, q3) and (q1 + pi, -q2, q3 + pi)
+        solutions = np.empty((batch_size, num_angles, 2, 2, 2, 7))
+        solutions[..., 0] = q1[..., None] + _BRANCH_SHIFTS
+        solutions[..., 1] = q2[..., None] * _BRANCH_SIGNS
+        solutions[..., 2] = q3[..., None] + _BRANCH_SHIFTS
+        solutions[..., 3] = q4[..., None, None]
+        solutions[..., 4] = q5[..., None]
+        solutions[..., 5] = q6[..., None]
+        solutions[..., 6] = q7[..., None, None, None]
+        # the equivalent angles nearest to the middle of the joint ranges
+        solutions -= 2 * np.pi * np.round((solutions - self._center) / (2 * np.pi))
+        in_limits = (solutions >= PANDA_LOWER_LIMITS) & (
+            solutions <= PANDA_UPPER_LIMITS
+        )
+        valid = valid[..., None, None] & in_limits.all(axis=-1)
+        return solutions.reshape(batch_size, num_angles, 8, 7), valid.reshape(
+            batch_size, num_angles, 8
+        )
+
+    def _nearest(
+        self, solutions: np.ndarray, valid: np.ndarray, joint_angles: np.ndarray
+    ) -> tuple:
+        """The nearest valid solution for each angle of the last joint, and its squared distance."""
+        steps = solutions - joint_angles[:, None, None]
+        distances = np.sum(steps**2, axis=-1)
+        valid = valid & (np.abs(steps).max(axis=-1) <= self.max_joint_step)
+        distances = np.where(valid, distances, np.inf)
+        best = np.argmin(distances, axis=-1)
+        solutions = np.take_along_axis(solutions, best[..., None, None], axis=-2)[
+            ..., 0, :
+        ]
+        return (
+            solutions,
+            np.take_along_axis(distances, best[..., None], axis=-1)[..., 0],
+        )
+
+    def solve(
+        self,
+        positions: np.ndarray,
+        orientations: Optional[np.ndarray],
+        joint_angles: np.ndarray,
+    ) -> np.ndarray:
+        if orientations is None:
+            # the orientation of the current pose
+            _, rotations = self.kinematics.forward(joint_angles)
+        else:
+            rotations = quaternion_to_matrix(orientations)
+        positions = np.asarray(positions, dtype=np.float64)
+        joint_angles = np.asarray(joint_angles, dtype=np.float64)
+        relative_positions = positions - self.kinematics.base_position
+        if self.last_joint_angle is not None:
+            candidates = np.full((len(joint_angles), 1), self.last_joint_angle)
+        else:
+            candidates = joint_angles[:, 6:7] + self.offsets
+        solutions, distances = self._nearest(
+            *self._solve(relative_positions, rotations, candidates), joint_angles
+        )
+        best = np.argmin(distances, axis=-1)
+        rows = np.arange(len(joint_angles))
+        result, distance = solutions[rows, best], distances[rows, best]
+        if self.last_joint_angle is None and len(self.offsets) >= 3:
+            # refine the angle of the last joint: minimum of the parabola through the best candidate and its
+            # neighbors, kept if the solution there is nearer
+            index = np.clip(best, 1, len(self.offsets) - 2)
+            d0, d1, d2 = (distances[rows, index + i] for i in (-1, 0, 1))
+            with np.errstate(invalid="ignore", divide="ignore"):
+                curvature = d0 - 2 * d1 + d2
+                shift = np.where(curvature > 0, 0.5 * (d0 - d2) / curvature, 0.0)
+            shift = np.nan_to_num(np.clip(shift, -1.0, 1.0))
+            step = self.offsets[1] - self.offsets[0]
+            refined_angles = candidates[rows, index] + shift * step
+            refined, refined_distance = self._nearest(
+                *self._solve(relative_positions, rotations, refined_angles[:, None]),
+                joint_angles
+            )
+            better = refined_distance[:, 0] < distance
+            result = np.where(better[:, None], refined[:, 0], result)
+            distance = np.where(better, refined_distance[:, 0], distance)
+        unsolved = ~np.isfinite(distance)
+        if np.any(unsolved):
+            result[unsolved] = self.fallback.solve(
+                positions[unsolved],
+                None if orientations is None else orientations[unsolved],
+                joint_angles[unsolved],
+            )
+        return result
+
+
+_BACKENDS: Dict[str, Callable[[np.ndarray], IKSolver]] = {}
+
+
+def register_ik_backend(name: str, factory: Callable[[np.ndarray], IKSolver]) -> None:
+    """Register an IK backend, to select it by name, e.g. ``gym.make(env_id, ik_backend=name)``.
+
+    Args:
+        name (str): The name of the backend.
+        factory (callable): Function creating the solver, from the position of the base of the robot.
+    """
+    _BACKENDS[name] = factory
+
+
+def available_ik_backends() -> List[str]:
+    """Returns the names of the IK backends, "pybullet" included."""
+    return ["pybullet"] + sorted(_BACKENDS)
+
+
+def make_ik_solver(
+    backend: Union[str, IKSolver], base_position: np.ndarray
+) -> Optional[IKSolver]:
+    """Create the IK solver of a backend.
+
+    Args:
+        backend (str or IKSolver): The name of the backend. A solver is returned as is.
+        base_position (np.ndarray): Position of the base of the robot, as (x, y, z).
+
+    Returns:
+        IKSolver: The solver, or None for the "pybullet" backend, solved by the simulation.
+    """
+    if isinstance(backend, IKSolver):
+        return backend
+    if backend == "pybullet":
+        return None
+    if backend not in _BACKENDS:
+        raise ValueError(
+            "Unknown IK backend {}, must be in {}".format(
+                backend, available_ik_backends()
+            )
+        )
+    return _BACKENDS[backend](base_position)
+
+
+register_ik_backend("analytic", AnalyticPandaIK)
+register_ik_backend("dls", DampedLeastSquaresIK)
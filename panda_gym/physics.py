@@ -0,0 +1,154 @@
+"""Physics profiles: the timestep, the number of substeps and the solver parameters of a simulation.
+
+A profile trades the fidelity of the simulation for speed. The built-in profiles all keep the duration of a step
+(`timestep * n_substeps`) to 0.04 s, so that the actions have the same effect and the episodes the same duration
+whatever the profile; only the resolution of the physics changes.
+
+    - "default": the historical parameters, 20 substeps of 2 ms with the default solver (50 iterations).
+    - "accurate": 40 substeps of 1 ms and 100 solver iterations, as a reference.
+    - "fast": 10 substeps of 4 ms and 20 solver iterations.
+    - "fastest": 4 substeps of 10 ms and 10 solver iterations. Fine when the contacts do not matter, e.g. Reach.
+    - "deterministic": the "default" parameters, with sorted overlapping pairs (`deterministicOverlappingPairs`), so
+      that a step only depends on the current state. Required to replay episodes exactly, see `panda_gym.replay`.
+
+Other profiles can be registered with `register_profile`.
+"""
+
+from typing import Any, Dict, List, Optional, Union
+
+
+class PhysicsProfile:
+    """Parameters of the physics engine.
+
+    Args:
+        timestep (float): Duration of a substep, in seconds.
+        n_substeps (int): Number of substeps per step.
+        num_solver_iterations (int, optional): Maximum number of iterations of the constraint solver.
+            Defaults to None (unchanged, the default of PyBullet is 50).
+        engine_parameters (dict, optional): Other options of `setPhysicsEngineParameter`, such as
+            `enableConeFriction` or `deterministicOverlappingPairs`. Defaults to None.
+        position_gain (float, optional): Position gain of the joint motors. PyBullet corrects this fraction of the
+            position error at each substep, so the gain must be adapted to the timestep for the motors to keep the
+            same response, see `position_gain_for`. Defaults to None (PyBullet default, 0.1).
+    """
+
+    def __init__(
+        self,
+        timestep: float,
+        n_substeps: int,
+        num_solver_iterations: Optional[int] = None,
+        engine_parameters: Optional[Dict[str, Any]] = None,
+        position_gain: Optional[float] = None,
+    ) -> None:
+        assert timestep > 0 and n_substeps > 0
+        self.timestep = timestep
+        self.n_substeps = n_substeps
+        self.num_solver_iterations = num_solver_iterations
+        self.engine_parameters = dict(engine_parameters or {})
+        self.position_gain = position_gain
+
+    @property
+    def dt(self) -> float:
+        """Duration of a step, in seconds."""
+        return self.timestep * self.n_substeps
+
+    def get_engine_parameters(self) -> Dict[str, Any]:
+        """Returns the keyword arguments of `setPhysicsEngineParameter`, including the timestep."""
+        parameters = {"fixedTimeStep": self.timestep}
+        if self.num_solver_iterations is not None:
+            parameters["numSolverIterations"] = self.num_solver_iterations
+        parameters.update(self.engine_parameters)
+        return parameters
+
+
+def position_gain_for(timestep: float) -> float:
+    """Position gain giving the joint motors the same response as the default gain (0.1) with 2 ms substeps.
+
+    Args:
+        timestep (float): Duration of a substep, in seconds.
+
+    Returns:
+        float: The position gain.
+    """
+    # The default gain leaves 0.9 of the error after each 2 ms substep
+    return 1.0 - 0.9 ** (timestep / 0.002)
+
+
+_PROFILES: Dict[str, PhysicsProfile] = {}
+
+
+def register_profile(name: str, profile: PhysicsProfile) -> None:
+    """Register a physics profile, to select it by name, e.g. ``gym.make(env_id, physics_profile=name)``.
+
+    Args:
+        name (str): The name of the profile.
+        profile (PhysicsProfile): The profile.
+    """
+    _PROFILES[name] = profile
+
+
+def get_profile(profile: Union[str, PhysicsProfile]) -> PhysicsProfile:
+    """Get a registered physics profile.
+
+    Args:
+        profile (str or PhysicsProfile): The name of the profile. A profile is returned as is.
+
+    Returns:
+        PhysicsProfile: The profile.
+    """
+    if isinstance(profile, PhysicsProfile):
+        return profile
+    if profile not in _PROFILES:
+        raise ValueError(
+            "Unknown physics profile {}, must be in {}".format(
+                profile, available_profiles()
+            )
+        )
+    return _PROFILES[profile]
+
+
+def available_profiles() -> List[str]:
+    """Returns the names of the registered physics profiles."""
+    return sorted(_PROFILES)
+
+
+register_profile(
+    "default",
+    PhysicsProfile(timestep=1 / 500, n_substeps=20, num_solver_iterations=50),
+)
+register_profile(
+    "deterministic",
+    PhysicsProfile(
+        timestep=1 / 500,
+        n_substeps=20,
+        num_solver_iterations=50,
+        engine_parameters={"deterministicOverlappingPairs": 1},
+    ),
+)
+register_profile(
+    "accurate",
+    PhysicsProfile(
+        timestep=1 / 1000,
+        n_substeps=40,
+        num_solver_iterations=100,
+        position_gain=position_gain_for(1 / 1000),
+    ),
+)
+register_profile(
+    "fast",
+    PhysicsProfile(
+        timestep=1 / 250,
+        n_substeps=10,
+        num_solver_iterations=20,
+        position_gain=position_gain_for(1 / 250),
+    ),
+)
+register_profile(
+    "fastest",
+    PhysicsProfile(
+        timestep=1 / 100,
+        n_substeps=4,
+        num_solver_iterations=10,
+        position_gain=position_gain_for(1 / 100),
+    ),
+)
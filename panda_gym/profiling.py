@@ -0,0 +1,259 @@
+"""Profiling of the phases of `step` and `reset`.
+
+The `StepProfiler` instruments an environment by shadowing the methods called by `step` and `reset` with timed
+versions, as instance attributes. Nothing is changed in the environment code, so that a detached profiler costs
+nothing.
+"""
+
+import functools
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import gym
+
+_MISSING = object()
+
+
+class PhaseStats:
+    """Statistics of a phase.
+
+    Args:
+        name (str): The name of the phase.
+    """
+
+    __slots__ = ("name", "calls", "time", "api_calls")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.calls = 0
+        self.time = 0.0
+        self.api_calls = 0
+
+    @property
+    def mean_time(self) -> float:
+        """Mean time per call, in seconds."""
+        return self.time / self.calls if self.calls else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "time": self.time,
+            "mean_time": self.mean_time,
+            "api_calls": self.api_calls,
+        }
+
+
+class CountingClient:
+    """Proxy of a PyBullet client that counts the API calls, and charges them to the current phase of a profiler.
+
+    Args:
+        client (Any): The PyBullet client.
+        profiler (StepProfiler): The profiler.
+    """
+
+    def __init__(self, client: Any, profiler: "StepProfiler") -> None:
+        self._client = client
+        self._profiler = profiler
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self._client, name)
+        if not callable(attribute):
+            return attribute  # constants, such as JOINT_FIXED
+        profiler = self._profiler
+
+        @functools.wraps(attribute)
+        def counted(*args: Any, **kwargs: Any) -> Any:
+            profiler._count_api_call(name)
+            return attribute(*args, **kwargs)
+
+        return counted
+
+
+class StepProfiler:
+    """Time the phases of `step` and `reset`, and optionally count the PyBullet API calls of each phase.
+
+    The phases are "step" and "reset", and inside them "set_action" (including the inverse kinematics),
+    "sim.step" (all the substeps), "get_obs", "render" (pixel observations and `render`), "is_success",
+    "compute_reward", "robot.reset" and "task.reset". The time of a phase excludes the time of the phases nested
+    in it: the time of "step" is the time spent in `step` outside of the other phases.
+
+    The methods are instrumented when the profiler is attached, and restored when it is detached. Attach only one
+    profiler at a time to an environment.
+
+    Args:
+        env (gym.Env): A panda-gym environment.
+        count_api_calls (bool, optional): Whether to count the PyBullet API calls, through a proxy of the physics
+            client. It adds a small overhead to every call. Defaults to False.
+        callback (callable, optional): Function called at the end of each `step` and `reset`, with the name of the
+            call ("step" or "reset") and the time of each of its phases, in seconds, as a dict. Defaults to None.
+    """
+
+    # (owner attribute of the env, method name, phase name)
+    INSTRUMENTED = [
+        (None, "step", "step"),
+        (None, "reset", "reset"),
+        (None, "_get_obs", "get_obs"),
+        (None, "_get_pixel_obs", "render"),
+        (None, "render", "render"),
+        ("robot", "set_action", "set_action"),
+        ("robot", "reset", "robot.reset"),
+        ("sim", "step", "sim.step"),
+        ("task", "is_success", "is_success"),
+        ("task", "compute_reward", "compute_reward"),
+        ("task", "reset", "task.reset"),
+    ]
+
+    def __init__(
+        self,
+        env: gym.Env,
+        count_api_calls: bool = False,
+        callback: Optional[Callable[[str, Dict[str, float]], None]] = None,
+    ) -> None:
+        self.env = env.unwrapped
+        self.count_api_calls = count_api_calls
+        self.callback = callback
+        self.phases: Dict[str, PhaseStats] = {}
+        self.api_calls: Dict[str, int] = {}  # by function name
+        self._stack: List[PhaseStats] = []
+        self._last_time = 0.0
+        # time of the phases of the current step or reset, for the callback
+        self._call_times: Dict[str, float] = {}
+        self._patched = []
+        self.attached = False
+
+    def _get_phase(self, name: str) -> PhaseStats:
+        phase = self.phases.get(name)
+        if phase is None:
+            phase = self.phases[name] = PhaseStats(name)
+        return phase
+
+    def _charge(self, now: float) -> None:
+        """Charge the time elapsed since the last event to the current phase."""
+        phase = self._stack[-1]
+        elapsed = now - self._last_time
+        phase.time += elapsed
+        self._call_times[phase.name] = self._call_times.get(phase.name, 0.0) + elapsed
+        self._last_time = now
+
+    def _enter(self, phase: PhaseStats) -> None:
+        now = time.perf_counter()
+        if self._stack:
+            self._charge(now)
+        else:
+            self._call_times = {}
+        self._stack.append(phase)
+        self._last_time = now
+
+    def _exit(self) -> None:
+        self._charge(time.perf_counter())
+        phase = self._stack.pop()
+        phase.calls += 1
+        if not self._stack and self.callback is not None:
+            self.callback(phase.name, self._call_times)
+
+    def _count_api_call(self, name: str) -> None:
+        self.api_calls[name] = self.api_calls.get(name, 0) + 1
+        phase = self._stack[-1] if self._stack else self._get_phase("other")
+        phase.api_calls += 1
+
+    def _timed(self, method: Callable, phase: PhaseStats) -> Callable:
+        @functools.wraps(method)
+        def timed(*args: Any, **kwargs: Any) -> Any:
+            self._enter(phase)
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self._exit()
+
+        return timed
+
+    def _patch(self, owner: Any, name: str, value: Any) -> None:
+        # keep the instance attribute, if any, to restore it when detaching
+        self._patched.append((owner, name, vars(owner).get(name, _MISSING)))
+        setattr(owner, name, value)
+
+    def attach(self) -> "StepProfiler":
+        """Instrument the environment.
+
+        Returns:
+            StepProfiler: The profiler itself.
+        """
+        if self.attached:
+            return self
+        for owner_name, method_name, phase_name in self.INSTRUMENTED:
+            owner = self.env if owner_name is None else getattr(self.env, owner_name)
+            method = getattr(owner, method_name)
+            timed = self._timed(method, self._get_phase(phase_name))
+            self._patch(owner, method_name, timed)
+        if self.count_api_calls:
+            sim = self.env.sim
+            self._patch(sim, "physics_client", CountingClient(sim.physics_client, self))
+        self.attached = True
+        return self
+
+    def detach(self) -> None:
+        """Restore the environment, the statistics are kept."""
+        for owner, name, original in reversed(self._patched):
+            if original is _MISSING:
+                delattr(owner, name)  # uncover the method of the class
+            else:
+                setattr(owner, name, original)
+        self._patched.clear()
+        self._stack.clear()
+        self.attached = False
+
+    def reset_stats(self) -> None:
+        """Clear the statistics."""
+        for phase in self.phases.values():
+            phase.calls = 0
+            phase.time = 0.0
+            phase.api_calls = 0
+        self.api_calls.clear()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Statistics of the phases.
+
+        Returns:
+            dict: By phase, the number of calls ("calls"), the total and mean time in seconds ("time" and
+                "mean_time") and the number of PyBullet API calls ("api_calls"), for the phases called at least
+                once.
+        """
+        return {
+            name: phase.as_dict()
+            for name, phase in self.phases.items()
+            if phase.calls or phase.api_calls
+        }
+
+    def report(self) -> str:
+        """Statistics of the phases as a table, sorted by decreasing total time.
+
+        Returns:
+            str: The table.
+        """
+        total = sum(phase.time for phase in self.phases.values()) or 1.0
+        lines = [
+            "{:<16}{:>10}{:>12}{:>14}{:>8}{:>12}".format(
+                "phase", "calls", "time (s)", "mean (us)", "%", "api calls"
+            )
+        ]
+        phases = sorted(self.phases.values(), key=lambda phase: -phase.time)
+        for phase in phases:
+            if not (phase.calls or phase.api_calls):
+                continue
+            lines.append(
+                "{:<16}{:>10}{:>12.4f}{:>14.1f}{:>8.1f}{:>12}".format(
+                    phase.name,
+                    phase.calls,
+                    phase.time,
+                    phase.mean_time * 1e6,
+                    100 * phase.time / total,
+                    phase.api_calls,
+                )
+            )
+        return "\n".join(lines)
+
+    def __enter__(self) -> "StepProfiler":
+        return self.attach()
+
+    def __exit__(self, *args: Any) -> None:
+        self.detach()
@@ -1,6 +1,6 @@
 import os
 from contextlib import contextmanager
-from typing import Any, Dict, Iterator, Optional
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Union
 
 import numpy as np
 import pybullet as p
@@ -8,6 +8,175 @@ import pybullet_data
 import pybullet_utils.bullet_client as bc
 
 import panda_gym.assets
+from panda_gym.physics import PhysicsProfile, get_profile
+
+
+class Camera:
+    """Camera looking at a target, with cached view and projection matrices.
+
+    The matrices are only recomputed when the parameters they depend on change, so a fixed camera computes them
+    once. The parameters can be changed by assigning the attributes.
+
+    A camera can also be attached to a link of a body, e.g. a wrist camera. It then ignores the target, distance
+    and angles: its pose follows the pose of the link, and its view matrix is computed by `PyBullet` at rendering.
+
+    Args:
+        width (int, optional): Image width. Defaults to 720.
+        height (int, optional): Image height. Defaults to 480.
+        target_position (np.ndarray, optional): Camera targetting this postion, as (x, y, z).
+            Defaults to [0., 0., 0.].
+        distance (float, optional): Distance of the camera. Defaults to 1.4.
+        yaw (float, optional): Yaw of the camera. Defaults to 45.
+        pitch (float, optional): Pitch of the camera. Defaults to -30.
+        roll (int, optional): Rool of the camera. Defaults to 0.
+        fov (float, optional): Vertical field of view, in degrees. Defaults to 60.
+        near_val (float, optional): Distance to the near clipping plane. Defaults to 0.1.
+        far_val (float, optional): Distance to the far clipping plane. Defaults to 100.
+        shadow (bool, optional): Whether to render the shadows. Defaults to True.
+        renderer (str, optional): "OpenGL" to use the OpenGL renderer when the simulation has a window, "Tiny" to
+            always use the CPU renderer. Without window, PyBullet always uses the CPU renderer. Defaults to "OpenGL".
+        body_name (str, optional): Name of the body the camera is attached to. Defaults to None (fixed camera).
+        link (int, optional): Link of the body the camera is attached to, -1 for the base. Defaults to -1.
+        eye_offset (np.ndarray, optional): Position of the camera in the link frame, as (x, y, z).
+            Defaults to [0., 0., 0.].
+        forward_axis (np.ndarray, optional): Viewing direction in the link frame. Defaults to [0., 0., 1.].
+        up_axis (np.ndarray, optional): Up direction of the image in the link frame. Defaults to [1., 0., 0.].
+    """
+
+    # The shape and data type of the image of each modality
+    MODALITIES = {
+        "rgb": (3, np.uint8),
+        "depth": (None, np.float32),
+        "segmentation": (None, np.int32),
+    }
+
+    def __init__(
+        self,
+        width: int = 720,
+        height: int = 480,
+        target_position: Optional[np.ndarray] = None,
+        distance: float = 1.4,
+        yaw: float = 45,
+        pitch: float = -30,
+        roll: float = 0,
+        fov: float = 60,
+        near_val: float = 0.1,
+        far_val: float = 100.0,
+        shadow: bool = True,
+        renderer: str = "OpenGL",
+        body_name: Optional[str] = None,
+        link: int = -1,
+        eye_offset: Optional[np.ndarray] = None,
+        forward_axis: Optional[np.ndarray] = None,
+        up_axis: Optional[np.ndarray] = None,
+    ) -> None:
+        if renderer not in ("OpenGL", "Tiny"):
+            raise ValueError("The 'renderer' argument is must be in {'Tiny', 'OpenGL'}")
+        self.width = width
+        self.height = height
+        self.target_position = target_position
+        self.distance = distance
+        self.yaw = yaw
+        self.pitch = pitch
+        self.roll = roll
+        self.fov = fov
+        self.near_val = near_val
+        self.far_val = far_val
+        self.shadow = shadow
+        self.renderer = renderer
+        self.body_name = body_name
+        self.link = link
+        self.eye_offset = np.zeros(3) if eye_offset is None else np.asarray(eye_offset)
+        self.forward_axis = (
+            np.array([0.0, 0.0, 1.0])
+            if forward_axis is None
+            else np.asarray(forward_axis)
+        )
+        self.up_axis = (
+            np.array([1.0, 0.0, 0.0]) if up_axis is None else np.asarray(up_axis)
+        )
+        self._view_key = self._projection_key = None
+        self._view_matrix = self._projection_matrix = None
+        self._buffers = {}
+
+    @property
+    def view_matrix(self) -> List[float]:
+        """The view matrix, as a flat list of 16 floats."""
+        target_position = self.target_position
+        if target_position is None:
+            target_position = (0.0, 0.0, 0.0)
+        key = (tuple(target_position), self.distance, self.yaw, self.pitch, self.roll)
+        if key != self._view_key:
+            self._view_matrix = p.computeViewMatrixFromYawPitchRoll(
+                cameraTargetPosition=target_position,
+                distance=self.distance,
+                yaw=self.yaw,
+                pitch=self.pitch,
+                roll=self.roll,
+                upAxisIndex=2,
+            )
+            self._view_key = key
+        return self._view_matrix
+
+    def get_attached_view_matrix(
+        self, position: np.ndarray, orientation: np.ndarray
+    ) -> List[float]:
+        """The view matrix of an attached camera, given the pose of the link it is attached to.
+
+        Args:
+            position (np.ndarray): Position of the link, as (x, y, z).
+            orientation (np.ndarray): Orientation of the link, as quaternion (x, y, z, w).
+
+        Returns:
+            list: The view matrix, as a flat list of 16 floats.
+        """
+        key = (tuple(position), tuple(orientation))
+        if key != self._view_key:
+            rotation = np.array(p.getMatrixFromQuaternion(orientation)).reshape(3, 3)
+            eye_position = position + rotation @ self.eye_offset
+            self._view_matrix = p.computeViewMatrix(
+                cameraEyePosition=eye_position,
+                cameraTargetPosition=eye_position + rotation @ self.forward_axis,
+                cameraUpVector=rotation @ self.up_axis,
+            )
+            self._view_key = key
+        return self._view_matrix
+
+    @property
+    def projection_matrix(self) -> List[float]:
+        """The projection matrix, as a flat list of 16 floats."""
+        key = (self.width, self.height, self.fov, self.near_val, self.far_val)
+        if key != self._projection_key:
+            self._projection_matrix = p.computeProjectionMatrixFOV(
+                fov=self.fov,
+                aspect=float(self.width) / self.height,
+                nearVal=self.near_val,
+                farVal=self.far_val,
+            )
+            self._projection_key = key
+        return self._projection_matrix
+
+    @property
+    def buffer(self) -> np.ndarray:
+        """Preallocated RGB image of shape (height, width, 3), reused by `PyBullet.render_camera`."""
+        return self.get_buffer("rgb")
+
+    def get_buffer(self, modality: str) -> np.ndarray:
+        """Preallocated image of a modality, reused by `PyBullet.render_camera_images`.
+
+        Args:
+            modality (str): "rgb", "depth" or "segmentation".
+
+        Returns:
+            np.ndarray: Array of shape (height, width, 3) and type uint8 for "rgb", (height, width) and type
+                float32 for "depth", (height, width) and type int32 for "segmentation".
+        """
+        n_channels, dtype = self.MODALITIES[modality]
+        shape = (self.height, self.width) + ((n_channels,) if n_channels else ())
+        buffer = self._buffers.get(modality)
+        if buffer is None or buffer.shape != shape:
+            buffer = self._buffers[modality] = np.empty(shape, dtype=dtype)
+        return buffer
 
 
 class PyBullet:
@@ -20,6 +189,12 @@ class PyBullet:
             Defaults to np.array([223, 54, 45]).
         renderer (str, optional): Renderer, either "Tiny" or OpenGL". Defaults to "Tiny" if render mode is "human"
             and "OpenGL" if render mode is "rgb_array". Only "OpenGL" is available for human render mode.
+        physics_profile (str or PhysicsProfile, optional): Timestep, number of substeps and solver parameters, as
+            a registered profile name, e.g. "fast", or a `PhysicsProfile`. Overrides `n_substeps`. Defaults to None
+            (timestep of 2 ms, `n_substeps` substeps).
+        kinematic (bool, optional): Whether to skip the dynamics. `control_joints` then moves the joints directly to
+            their target, and `step` does not simulate anything. Only valid for scenes whose bodies are all static or
+            driven by `control_joints`. Defaults to False.
     """
 
     def __init__(
@@ -28,8 +203,11 @@ class PyBullet:
         n_substeps: int = 20,
         background_color: Optional[np.ndarray] = None,
         renderer: str = "Tiny",
+        physics_profile: Optional[Union[str, PhysicsProfile]] = None,
+        kinematic: bool = False,
     ) -> None:
         self.render_mode = render_mode
+        self.kinematic = kinematic
         background_color = (
             background_color
             if background_color is not None
@@ -62,21 +240,84 @@ class PyBullet:
 
         self.n_substeps = n_substeps
         self.timestep = 1.0 / 500
+        self.position_gain = None  # PyBullet default
         self.physics_client.setTimeStep(self.timestep)
         self.physics_client.resetSimulation()
         self.physics_client.setAdditionalSearchPath(pybullet_data.getDataPath())
         self.physics_client.setGravity(0, 0, -9.81)
+        if physics_profile is not None:
+            self.set_physics_profile(physics_profile)
         self._bodies_idx = {}
+        # Step-scoped cache of the body, link, joint and contact states. It is filled lazily, on the first read
+        # after a change of the simulation state, and cleared by every method that changes this state.
+        self._base_state_cache = {}
+        self._link_state_cache = {}
+        self._joint_state_cache = {}
+        self._contact_cache = {}
+        # Last motor command of each joint, as {body_name: {joint: (target_angle, force)}}. PyBullet does not expose
+        # the motor targets, they are tracked here so that `get_state` can capture them.
+        self._motor_targets = {}
+        self._movable_joints = {}
+        # Contact points set by `set_state`, reported instead of the ones of PyBullet until the next step
+        self._restored_contacts = None
+        # Link states and contact points reported when each state was saved, see `restore_state`
+        self._saved_reports = {}
+        # Visual and collision shapes already created in this client, keyed by their parameters
+        self._shape_cache = {}
+        self._camera = Camera()  # camera used by `render`
+        # Cameras declared with `add_camera`, rendered together by `render_rig`
+        self._rig: Dict[str, Camera] = {}
+        self._rig_buffers = {}
 
     @property
     def dt(self):
         """Timestep."""
         return self.timestep * self.n_substeps
 
+    def set_physics_profile(self, profile: Union[str, PhysicsProfile]) -> None:
+        """Set the timestep, the number of substeps and the solver parameters.
+
+        Args:
+            profile (str or PhysicsProfile): A registered profile name, e.g. "fast", or a `PhysicsProfile`.
+        """
+        profile = get_profile(profile)
+        self.timestep = profile.timestep
+        self.n_substeps = profile.n_substeps
+        self.position_gain = profile.position_gain
+        self.physics_client.setPhysicsEngineParameter(**profile.get_engine_parameters())
+
+    def set_deterministic_overlapping_pairs(self, enabled: bool = True) -> None:
+        """Sort the overlapping pairs, so that the solver order, and thus the result of a step, only depends on the
+        current state and not on the history of the simulation. Required for `restore_state` to be followed by
+        exactly the same steps as after `save_state`. It changes the trajectories numerically, so it is disabled
+        by default, see the "deterministic" physics profile.
+
+        Args:
+            enabled (bool, optional): Whether to sort the overlapping pairs. Defaults to True.
+        """
+        self.physics_client.setPhysicsEngineParameter(
+            deterministicOverlappingPairs=int(enabled)
+        )
+
     def step(self) -> None:
-        """Step the simulation."""
-        for _ in range(self.n_substeps):
-            self.physics_client.stepSimulation()
+        """Step the simulation. In kinematic mode, the joints were already moved by `control_joints`."""
+        if not self.kinematic:
+            for _ in range(self.n_substeps):
+                self.physics_client.stepSimulation()
+        self._restored_contacts = None
+        self.invalidate_state_cache()
+
+    def invalidate_state_cache(self) -> None:
+        """Clear the cached states.
+
+        The states of the bodies, links, joints and contacts are read at most once per step and then served from a
+        cache. The cache is cleared automatically by `step`, `restore_state` and the `set_*` methods. Call
+        this method after changing the simulation state directly through `physics_client`.
+        """
+        self._base_state_cache.clear()
+        self._link_state_cache.clear()
+        self._joint_state_cache.clear()
+        self._contact_cache.clear()
 
     def close(self) -> None:
         """Close the simulation."""
@@ -89,7 +330,9 @@ class PyBullet:
             int: A state id assigned by PyBullet, which is the first non-negative
             integer available for indexing.
         """
-        return self.physics_client.saveState()
+        state_id = self.physics_client.saveState()
+        self._saved_reports[state_id] = self._get_report()
+        return state_id
 
     def restore_state(self, state_id: int) -> None:
         """Restore a simulation state.
@@ -98,6 +341,12 @@ class PyBullet:
             state_id: The simulation state id returned by save_state().
         """
         self.physics_client.restoreState(state_id)
+        self._restored_contacts = None
+        self.invalidate_state_cache()
+        # `restoreState` does not restore the link states and the contact points reported until the next step
+        report = self._saved_reports.get(state_id)
+        if report is not None:
+            self._set_report(report)
 
     def remove_state(self, state_id: int) -> None:
         """Remove a simulation state. This will make this state_id available again for returning in save_state().
@@ -106,6 +355,19 @@ class PyBullet:
             state_id: The simulation state id returned by save_state().
         """
         self.physics_client.removeState(state_id)
+        self._saved_reports.pop(state_id, None)
+
+    def get_saved_report_nbytes(self, state_id: int) -> int:
+        """Size of the base states, link states and contact points saved with a state, see `_get_report`.
+
+        Args:
+            state_id: The simulation state id returned by save_state().
+
+        Returns:
+            int: The size, in bytes. 0 if the state has no saved report.
+        """
+        report = self._saved_reports.get(state_id, {})
+        return sum(array.nbytes for array in report.values())
 
     def render(
         self,
@@ -137,31 +399,205 @@ class PyBullet:
             RGB np.ndarray or None: An RGB array if mode is 'rgb_array', else None.
         """
         if self.render_mode == "rgb_array":
-            target_position = (
-                target_position if target_position is not None else np.zeros(3)
-            )
-            view_matrix = self.physics_client.computeViewMatrixFromYawPitchRoll(
-                cameraTargetPosition=target_position,
-                distance=distance,
-                yaw=yaw,
-                pitch=pitch,
-                roll=roll,
-                upAxisIndex=2,
-            )
-            proj_matrix = self.physics_client.computeProjectionMatrixFOV(
-                fov=60, aspect=float(width) / height, nearVal=0.1, farVal=100.0
-            )
-            (_, _, rgba, _, _) = self.physics_client.getCameraImage(
-                width=width,
-                height=height,
-                viewMatrix=view_matrix,
-                projectionMatrix=proj_matrix,
-                shadow=True,
-                renderer=p.ER_BULLET_HARDWARE_OPENGL,
+            camera = self._camera
+            camera.width, camera.height = width, height
+            camera.target_position = target_position
+            camera.distance = distance
+            camera.yaw, camera.pitch, camera.roll = yaw, pitch, roll
+            # a new array, since the callers may keep the frames
+            image = np.empty((height, width, 3), dtype=np.uint8)
+            return self.render_camera(camera, out=image)
+
+    def render_camera(
+        self, camera: Camera, out: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """Render the RGB image seen by a camera, whatever the render mode.
+
+        Args:
+            camera (Camera): The camera.
+            out (np.ndarray, optional): Array of shape (height, width, 3) and type uint8 to write the image in.
+                Defaults to the preallocated buffer of the camera, which is overwritten at the next call.
+
+        Returns:
+            np.ndarray: The RGB image, `out` if given.
+        """
+        out = {} if out is None else {"rgb": out}
+        return self.render_camera_images(camera, ("rgb",), out=out)["rgb"]
+
+    def render_camera_images(
+        self,
+        camera: Camera,
+        modalities: Sequence[str] = ("rgb",),
+        out: Optional[Dict[str, np.ndarray]] = None,
+    ) -> Dict[str, np.ndarray]:
+        """Render the images seen by a camera, in a single call to the renderer.
+
+        Args:
+            camera (Camera): The camera.
+            modalities (list of str, optional): Among "rgb" (RGB image), "depth" (distance to the camera plane,
+                in meters) and "segmentation" (unique id of the body seen by each pixel, -1 for the background).
+                Defaults to ("rgb",).
+            out (dict, optional): Arrays to write the images in, by modality. See `Camera.get_buffer` for their
+                shapes. Defaults to the preallocated buffers of the camera, which are overwritten at the next call.
+
+        Returns:
+            dict: The images, by modality.
+        """
+        out = {} if out is None else out
+        view_matrix = self.get_view_matrix(camera)
+        flags = 0 if "segmentation" in modalities else p.ER_NO_SEGMENTATION_MASK
+        renderer = (
+            p.ER_TINY_RENDERER
+            if camera.renderer == "Tiny"
+            else p.ER_BULLET_HARDWARE_OPENGL
+        )
+        _, _, rgba, depth, segmentation = self.physics_client.getCameraImage(
+            width=camera.width,
+            height=camera.height,
+            viewMatrix=view_matrix,
+            projectionMatrix=camera.projection_matrix,
+            shadow=camera.shadow,
+            renderer=renderer,
+            flags=flags,
+        )
+        images = {}
+        shape = (camera.height, camera.width)
+        for modality in modalities:
+            image = out.get(modality)
+            images[modality] = camera.get_buffer(modality) if image is None else image
+        # PyBullet returns flat tuples when it is built without NumPy support, hence the asarray/reshape
+        if "rgb" in modalities:
+            rgba = np.asarray(rgba, dtype=np.uint8).reshape(shape + (4,))
+            np.copyto(images["rgb"], rgba[..., :3])
+        if "depth" in modalities:
+            # convert the non-linear depth buffer into distances
+            near, far = camera.near_val, camera.far_val
+            depth = np.asarray(depth, dtype=np.float32).reshape(shape)
+            np.multiply(depth, far - near, out=images["depth"])
+            np.subtract(far, images["depth"], out=images["depth"])
+            np.divide(far * near, images["depth"], out=images["depth"])
+        if "segmentation" in modalities:
+            segmentation = np.asarray(segmentation, dtype=np.int32).reshape(shape)
+            np.copyto(images["segmentation"], segmentation)
+        return images
+
+    def get_view_matrix(self, camera: Camera) -> List[float]:
+        """Get the view matrix of a camera, following the body it is attached to, if any.
+
+        Args:
+            camera (Camera): The camera.
+
+        Returns:
+            list: The view matrix, as a flat list of 16 floats.
+        """
+        if camera.body_name is None:
+            return camera.view_matrix
+        if camera.link == -1:
+            position = self.get_base_position(camera.body_name)
+            orientation = self.get_base_orientation(camera.body_name)
+        else:
+            position = self.get_link_position(camera.body_name, camera.link)
+            orientation = self.get_link_orientation(camera.body_name, camera.link)
+        return camera.get_attached_view_matrix(position, orientation)
+
+    def add_camera(self, name: str, camera: Camera) -> None:
+        """Add a camera to the rig rendered by `render_rig`.
+
+        Args:
+            name (str): The camera name. Must be unique in the rig.
+            camera (Camera): The camera. All the cameras of the rig must have the same image size.
+        """
+        assert name not in self._rig, "A camera named {} already exists.".format(name)
+        for other in self._rig.values():
+            assert (other.width, other.height) == (
+                camera.width,
+                camera.height,
+            ), "All the cameras of the rig must have the same image size."
+        self._rig[name] = camera
+
+    def remove_camera(self, name: str) -> None:
+        """Remove a camera from the rig.
+
+        Args:
+            name (str): The camera name.
+        """
+        del self._rig[name]
+
+    @property
+    def camera_names(self) -> List[str]:
+        """Names of the cameras of the rig, in the order of the images returned by `render_rig`."""
+        return list(self._rig)
+
+    def render_rig(self, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Render the RGB images of all the cameras of the rig.
+
+        Args:
+            out (np.ndarray, optional): Array of shape (n_cams, height, width, 3) and type uint8 to write the
+                images in. Defaults to a preallocated buffer, which is overwritten at the next call.
+
+        Returns:
+            np.ndarray: The images, in the order of `camera_names`, `out` if given.
+        """
+        out = {} if out is None else {"rgb": out}
+        return self.render_rig_images(("rgb",), out=out)["rgb"]
+
+    def render_rig_images(
+        self,
+        modalities: Sequence[str] = ("rgb",),
+        out: Optional[Dict[str, np.ndarray]] = None,
+    ) -> Dict[str, np.ndarray]:
+        """Render the images of all the cameras of the rig, each camera in a single call to the renderer.
+
+        The images are written directly in the stacked arrays, and the view matrices of the fixed cameras are
+        computed once.
+
+        Args:
+            modalities (list of str, optional): Among "rgb", "depth" and "segmentation" (see
+                `render_camera_images`). Defaults to ("rgb",).
+            out (dict, optional): Arrays of shape (n_cams, ...) to write the images in, by modality. Defaults to
+                preallocated buffers, which are overwritten at the next call.
+
+        Returns:
+            dict: The stacked images, by modality, in the order of `camera_names`.
+        """
+        assert self._rig, "No camera in the rig, add cameras with `add_camera`."
+        out = {} if out is None else out
+        cameras = list(self._rig.values())
+        images = {}
+        for modality in modalities:
+            shape = (len(cameras),) + cameras[0].get_buffer(modality).shape
+            image = out.get(modality)
+            if image is None:
+                image = self._rig_buffers.get(modality)
+                if image is None or image.shape != shape:
+                    dtype = Camera.MODALITIES[modality][1]
+                    image = self._rig_buffers[modality] = np.empty(shape, dtype=dtype)
+            images[modality] = image
+        for i, camera in enumerate(cameras):
+            camera_out = {modality: image[i] for modality, image in images.items()}
+            self.render_camera_images(camera, modalities, out=camera_out)
+        return images
+
+    def _get_base_state(self, body: str) -> np.ndarray:
+        """Get the state of the base of the body, from the cache if possible.
+
+        Args:
+            body (str): Body unique name.
+
+        Returns:
+            np.ndarray: The state, as position (x, y, z), orientation (x, y, z, w), velocity (vx, vy, vz)
+                and angular velocity (wx, wy, wz). Must not be modified.
+        """
+        body_idx = self._bodies_idx[body]
+        state = self._base_state_cache.get(body_idx)
+        if state is None:
+            position, orientation = self.physics_client.getBasePositionAndOrientation(
+                body_idx
             )
-            # With Python3.10, pybullet return flat tuple instead of array. So we need to build create the array.
-            rgba = np.array(rgba, dtype=np.uint8).reshape((height, width, 4))
-            return rgba[..., :3]
+            velocity, angular_velocity = self.physics_client.getBaseVelocity(body_idx)
+            state = np.concatenate((position, orientation, velocity, angular_velocity))
+            self._base_state_cache[body_idx] = state
+        return state
 
     def get_base_position(self, body: str) -> np.ndarray:
         """Get the position of the body.
@@ -172,10 +608,7 @@ class PyBullet:
         Returns:
             np.ndarray: The position, as (x, y, z).
         """
-        position = self.physics_client.getBasePositionAndOrientation(
-            self._bodies_idx[body]
-        )[0]
-        return np.array(position)
+        return self._get_base_state(body)[0:3].copy()
 
     def get_base_orientation(self, body: str) -> np.ndarray:
         """Get the orientation of the body.
@@ -186,10 +619,7 @@ class PyBullet:
         Returns:
             np.ndarray: The orientation, as quaternion (x, y, z, w).
         """
-        orientation = self.physics_client.getBasePositionAndOrientation(
-            self._bodies_idx[body]
-        )[1]
-        return np.array(orientation)
+        return self._get_base_state(body)[3:7].copy()
 
     def get_base_rotation(self, body: str, type: str = "euler") -> np.ndarray:
         """Get the rotation of the body.
@@ -219,8 +649,7 @@ class PyBullet:
         Returns:
             np.ndarray: The velocity, as (vx, vy, vz).
         """
-        velocity = self.physics_client.getBaseVelocity(self._bodies_idx[body])[0]
-        return np.array(velocity)
+        return self._get_base_state(body)[7:10].copy()
 
     def get_base_angular_velocity(self, body: str) -> np.ndarray:
         """Get the angular velocity of the body.
@@ -231,10 +660,7 @@ class PyBullet:
         Returns:
             np.ndarray: The angular velocity, as (wx, wy, wz).
         """
-        angular_velocity = self.physics_client.getBaseVelocity(self._bodies_idx[body])[
-            1
-        ]
-        return np.array(angular_velocity)
+        return self._get_base_state(body)[10:13].copy()
 
     def get_link_position(self, body: str, link: int) -> np.ndarray:
         """Get the position of the link of the body.
@@ -246,8 +672,7 @@ class PyBullet:
         Returns:
             np.ndarray: The position, as (x, y, z).
         """
-        position = self.physics_client.getLinkState(self._bodies_idx[body], link)[0]
-        return np.array(position)
+        return self.get_link_states(body, [link])[0, 0:3]
 
     def get_link_orientation(self, body: str, link: int) -> np.ndarray:
         """Get the orientation of the link of the body.
@@ -259,23 +684,64 @@ class PyBullet:
         Returns:
             np.ndarray: The rotation, as (rx, ry, rz).
         """
-        orientation = self.physics_client.getLinkState(self._bodies_idx[body], link)[1]
-        return np.array(orientation)
+        return self.get_link_states(body, [link])[0, 3:7]
 
+    def get_contacts(self, bodyA: str, bodyB: str) -> np.ndarray:
+        """Get a summary of the contact points between two bodies, computed during the last step.
 
-    def get_contact_normals(self, bodyA: int, bodyB: int) -> np.ndarray:
-        """Get the position of points between two bodies.
+        The simulator is queried at most once per step for a given pair of bodies.
 
         Args:
-            bodyA (int): Index of the body.
-            bodyB (int): Index of the body.
+            bodyA (str): Body unique name.
+            bodyB (str): Body unique name.
 
         Returns:
-            np.ndarray: The position, as (x, y, z).
+            np.ndarray: Array of shape (n_contacts, 6). Each row is the link index on bodyA, the contact
+                normal on bodyB (nx, ny, nz), the normal force and the contact distance. Must not be modified.
+        """
+        key = (self._bodies_idx[bodyA], self._bodies_idx[bodyB])
+        contacts = self._contact_cache.get(key)
+        if contacts is None and self._restored_contacts is not None:
+            contacts = self._get_restored_contacts(bodyA, bodyB)
+            self._contact_cache[key] = contacts
+        elif contacts is None:
+            points = self.physics_client.getContactPoints(bodyA=key[0], bodyB=key[1])
+            contacts = np.empty((len(points), 6))
+            for i, point in enumerate(points):
+                contacts[i, 0] = point[3]
+                contacts[i, 1:4] = point[7]
+                contacts[i, 4] = point[9]
+                contacts[i, 5] = point[8]
+            self._contact_cache[key] = contacts
+        return contacts
+
+    def _get_restored_contacts(self, bodyA: str, bodyB: str) -> np.ndarray:
+        """Contacts between two bodies, from the contact points restored by `set_state`."""
+        bodies = list(self._bodies_idx)
+        a, b = bodies.index(bodyA), bodies.index(bodyB)
+        contacts = self._restored_contacts
+        # the contact points between A and B are stored once, either seen from A or seen from B
+        from_a = contacts[(contacts[:, 0] == a) & (contacts[:, 1] == b)]
+        from_b = contacts[(contacts[:, 0] == b) & (contacts[:, 1] == a)]
+        out = np.empty((len(from_a) + len(from_b), 6))
+        out[: len(from_a), 0] = from_a[:, 2]
+        out[: len(from_a), 1:] = from_a[:, 4:9]
+        out[len(from_a) :, 0] = from_b[:, 3]
+        out[len(from_a) :, 1:4] = -from_b[:, 4:7]
+        out[len(from_a) :, 4:] = from_b[:, 7:9]
+        return out
+
+    def get_contact_normals(self, bodyA: str, bodyB: str) -> np.ndarray:
+        """Get the normals of the contact points between two bodies.
+
+        Args:
+            bodyA (str): Body unique name.
+            bodyB (str): Body unique name.
+
+        Returns:
+            np.ndarray: Array of shape (n_contacts, 3). Each row is the contact normal on bodyB, as (nx, ny, nz).
         """
-        points = p.getContactPoints(bodyA=self._bodies_idx[bodyA], bodyB=self._bodies_idx[bodyB])
-        normals = np.array([point[7] for point in points])
-        return np.array(normals)
+        return self.get_contacts(bodyA, bodyB)[:, 1:4].copy()
 
     def get_link_velocity(self, body: str, link: int) -> np.ndarray:
         """Get the velocity of the link of the body.
@@ -287,10 +753,7 @@ class PyBullet:
         Returns:
             np.ndarray: The velocity, as (vx, vy, vz).
         """
-        velocity = self.physics_client.getLinkState(
-            self._bodies_idx[body], link, computeLinkVelocity=True
-        )[6]
-        return np.array(velocity)
+        return self.get_link_states(body, [link])[0, 7:10]
 
     def get_link_angular_velocity(self, body: str, link: int) -> np.ndarray:
         """Get the angular velocity of the link of the body.
@@ -302,10 +765,7 @@ class PyBullet:
         Returns:
             np.ndarray: The angular velocity, as (wx, wy, wz).
         """
-        angular_velocity = self.physics_client.getLinkState(
-            self._bodies_idx[body], link, computeLinkVelocity=True
-        )[7]
-        return np.array(angular_velocity)
+        return self.get_link_states(body, [link])[0, 10:13]
 
     def get_joint_angle(self, body: str, joint: int) -> float:
         """Get the angle of the joint of the body.
@@ -317,7 +777,7 @@ class PyBullet:
         Returns:
             float: The angle.
         """
-        return self.physics_client.getJointState(self._bodies_idx[body], joint)[0]
+        return self.get_joint_states(body, [joint])[0, 0]
 
     def get_joint_velocity(self, body: str, joint: int) -> float:
         """Get the velocity of the joint of the body.
@@ -329,7 +789,96 @@ class PyBullet:
         Returns:
             float: The velocity.
         """
-        return self.physics_client.getJointState(self._bodies_idx[body], joint)[1]
+        return self.get_joint_states(body, [joint])[0, 1]
+
+    def get_joint_states(
+        self, body: str, joints: np.ndarray, out: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """Get the angles and the velocities of several joints of the body, in a single call.
+
+        Args:
+            body (str): Body unique name.
+            joints (np.ndarray): List of joint indices, as a list of ints.
+            out (np.ndarray, optional): Preallocated array of shape (n_joints, 2) to write the result in.
+                Defaults to None.
+
+        Returns:
+            np.ndarray: Array of shape (n_joints, 2). Each row is (angle, velocity).
+        """
+        body_idx = self._bodies_idx[body]
+        missing = [
+            int(joint)
+            for joint in joints
+            if (body_idx, joint) not in self._joint_state_cache
+        ]
+        if missing:
+            states = self.physics_client.getJointStates(body_idx, missing)
+            for joint, state in zip(missing, states):
+                self._joint_state_cache[(body_idx, joint)] = (state[0], state[1])
+        if out is None:
+            out = np.empty((len(joints), 2))
+        for i, joint in enumerate(joints):
+            out[i] = self._joint_state_cache[(body_idx, joint)]
+        return out
+
+    def get_joint_angles(self, body: str, joints: np.ndarray) -> np.ndarray:
+        """Get the angles of several joints of the body, in a single call.
+
+        Args:
+            body (str): Body unique name.
+            joints (np.ndarray): List of joint indices, as a list of ints.
+
+        Returns:
+            np.ndarray: The angles.
+        """
+        return self.get_joint_states(body, joints)[:, 0]
+
+    def get_link_states(
+        self,
+        body: str,
+        links: np.ndarray,
+        compute_velocity: bool = True,
+        out: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """Get the state of several links of the body, in a single call.
+
+        Args:
+            body (str): Body unique name.
+            links (np.ndarray): List of link indices, as a list of ints.
+            compute_velocity (bool, optional): Whether to compute the link velocities. Defaults to True.
+            out (np.ndarray, optional): Preallocated array of shape (n_links, 13), or (n_links, 7) if
+                compute_velocity is False, to write the result in. Defaults to None.
+
+        Returns:
+            np.ndarray: Array of shape (n_links, 13). Each row is the position (x, y, z), the orientation
+                as quaternion (x, y, z, w), the velocity (vx, vy, vz) and the angular velocity (wx, wy, wz).
+                The last two are omitted if compute_velocity is False.
+        """
+        body_idx = self._bodies_idx[body]
+        missing = [
+            int(link)
+            for link in links
+            if (body_idx, link) not in self._link_state_cache
+        ]
+        if missing:
+            # Velocities are always computed, so that the cached state serves both kinds of queries. Without
+            # dynamics, the link states are not updated by the steps and are computed from the joint states.
+            states = self.physics_client.getLinkStates(
+                body_idx,
+                missing,
+                computeLinkVelocity=1,
+                computeForwardKinematics=int(self.kinematic),
+            )
+            for link, state in zip(missing, states):
+                self._link_state_cache[(body_idx, link)] = np.concatenate(
+                    (state[0], state[1], state[6], state[7])
+                )
+        n_columns = 13 if compute_velocity else 7
+        if out is None:
+            out = np.empty((len(links), n_columns))
+        for i, link in enumerate(links):
+            out[i] = self._link_state_cache[(body_idx, link)][:n_columns]
+        return out
 
     def set_base_pose(
         self, body: str, position: np.ndarray, orientation: np.ndarray
@@ -346,6 +895,7 @@ class PyBullet:
         self.physics_client.resetBasePositionAndOrientation(
             bodyUniqueId=self._bodies_idx[body], posObj=position, ornObj=orientation
         )
+        self.invalidate_state_cache()
 
     def set_joint_angles(
         self, body: str, joints: np.ndarray, angles: np.ndarray
@@ -371,6 +921,7 @@ class PyBullet:
         self.physics_client.resetJointState(
             bodyUniqueId=self._bodies_idx[body], jointIndex=joint, targetValue=angle
         )
+        self.invalidate_state_cache()
 
     def control_joints(
         self,
@@ -379,7 +930,7 @@ class PyBullet:
         target_angles: np.ndarray,
         forces: np.ndarray,
     ) -> None:
-        """Control the joints motor.
+        """Control the joints motor. In kinematic mode, move the joints directly, see `_move_joints`.
 
         Args:
             body (str): Body unique name.
@@ -387,13 +938,203 @@ class PyBullet:
             target_angles (np.ndarray): List of target angles, as a list of floats.
             forces (np.ndarray): Forces to apply, as a list of floats.
         """
-        self.physics_client.setJointMotorControlArray(
-            self._bodies_idx[body],
-            jointIndices=joints,
-            controlMode=self.physics_client.POSITION_CONTROL,
-            targetPositions=target_angles,
-            forces=forces,
-        )
+        if self.kinematic:
+            self._move_joints(body, joints, target_angles)
+        else:
+            kwargs = {}
+            if self.position_gain is not None:
+                kwargs["positionGains"] = [self.position_gain] * len(joints)
+            self.physics_client.setJointMotorControlArray(
+                self._bodies_idx[body],
+                jointIndices=joints,
+                controlMode=self.physics_client.POSITION_CONTROL,
+                targetPositions=target_angles,
+                forces=forces,
+                **kwargs,
+            )
+        motor_targets = self._motor_targets.setdefault(body, {})
+        for joint, target_angle, force in zip(joints, target_angles, forces):
+            motor_targets[int(joint)] = (float(target_angle), float(force))
+
+    def _move_joints(
+        self, body: str, joints: np.ndarray, target_angles: np.ndarray
+    ) -> None:
+        """Move the joints to the target angles, as ideal motors would do in one step.
+
+        The joints are reset to their target, with the velocity that covers the displacement in one step.
+        """
+        angles = self.get_joint_angles(body, joints)
+        new_angles = np.asarray(target_angles, dtype=np.float64)
+        velocities = (new_angles - angles) / self.dt
+        body_idx = self._bodies_idx[body]
+        for joint, angle, velocity in zip(joints, new_angles, velocities):
+            self.physics_client.resetJointState(
+                body_idx, int(joint), targetValue=angle, targetVelocity=velocity
+            )
+        self.invalidate_state_cache()
+
+    def _get_movable_joints(self, body: str) -> np.ndarray:
+        """Indices of the non-fixed joints of the body."""
+        joints = self._movable_joints.get(body)
+        if joints is None:
+            body_idx = self._bodies_idx[body]
+            joints = np.array(
+                [
+                    joint
+                    for joint in range(self.physics_client.getNumJoints(body_idx))
+                    if self.physics_client.getJointInfo(body_idx, joint)[2]
+                    != self.physics_client.JOINT_FIXED
+                ],
+                dtype=np.int64,
+            )
+            self._movable_joints[body] = joints
+        return joints
+
+    def get_state(self) -> Dict[str, np.ndarray]:
+        """Get the state of the simulation as plain arrays, that can be sent to another process.
+
+        Unlike `save_state`, the state does not depend on the physics client. It contains the base pose and velocity
+        of every body, the position and velocity of every non-fixed joint and the last motor command of each joint.
+        It also contains the link states and the contact points as reported by PyBullet, which are only updated by
+        `step`, so that the observations are the same after `set_state`.
+
+        Returns:
+            dict: The state, as a dict of arrays. Restore it with `set_state`.
+        """
+        bodies = list(self._bodies_idx)
+        joint_states = []
+        motor_bodies, motor_commands = [], []
+        for i, body in enumerate(bodies):
+            joint_states.append(
+                self.get_joint_states(body, self._get_movable_joints(body))
+            )
+            for joint, (angle, force) in self._motor_targets.get(body, {}).items():
+                motor_bodies.append(i)
+                motor_commands.append((joint, angle, force))
+        return {
+            "bodies": np.array(bodies),
+            "joint_states": np.concatenate(joint_states).reshape(-1, 2),
+            "motor_bodies": np.array(motor_bodies, dtype=np.int64),
+            "motor_commands": np.array(motor_commands, dtype=np.float64).reshape(-1, 3),
+            **self._get_report(),
+        }
+
+    def _get_report(self) -> Dict[str, np.ndarray]:
+        """Get the base states, link states and contact points, as reported by PyBullet.
+
+        The link states and the contact points are only updated by `step`: they may not match the positions of
+        the joints. They are saved with the states, so that the observations are the same after a restore.
+
+        Returns:
+            dict: The base states ("base_states"), the states of all the links ("link_states") and the contact
+                points ("contacts"), in the format of `get_state`.
+        """
+        bodies = list(self._bodies_idx)
+        base_states = [self._get_base_state(body) for body in bodies]
+        link_states = []
+        for body in bodies:
+            links = np.arange(self.physics_client.getNumJoints(self._bodies_idx[body]))
+            link_states.append(self.get_link_states(body, links))
+        if self._restored_contacts is not None:
+            contacts = self._restored_contacts
+        else:
+            body_indices = {idx: i for i, idx in enumerate(self._bodies_idx.values())}
+            contacts = [
+                (body_indices[point[1]], body_indices[point[2]], point[3], point[4])
+                + point[7]
+                + (point[9], point[8])
+                for point in self.physics_client.getContactPoints()
+            ]
+        return {
+            "base_states": np.array(base_states).reshape(len(bodies), 13),
+            "link_states": np.concatenate(link_states).reshape(-1, 13),
+            "contacts": np.array(contacts, dtype=np.float64).reshape(-1, 9),
+        }
+
+    def _set_report(self, report: Dict[str, np.ndarray]) -> None:
+        """Serve the base states, link states and contact points of a report from the cache, until the next step.
+
+        Args:
+            report (dict): The report, as returned by `_get_report`.
+        """
+        link_states = iter(report["link_states"])
+        body_indices = self._bodies_idx.values()
+        for body_idx, base_state in zip(body_indices, report["base_states"]):
+            self._base_state_cache[body_idx] = base_state.copy()
+            for link in range(self.physics_client.getNumJoints(body_idx)):
+                self._link_state_cache[(body_idx, link)] = next(link_states).copy()
+        self._restored_contacts = report["contacts"].copy()
+
+    def set_state(self, state: Dict[str, np.ndarray]) -> None:
+        """Set the state of the simulation from a state returned by `get_state`, possibly in another process.
+
+        The simulation must contain the same bodies, created in the same order.
+
+        Args:
+            state (dict): The state, as returned by `get_state`.
+        """
+        bodies = list(self._bodies_idx)
+        assert list(state["bodies"]) == bodies, "The bodies must be the same."
+        client = self.physics_client
+        joint_states = iter(state["joint_states"])
+        for body, base_state in zip(bodies, state["base_states"]):
+            body_idx = self._bodies_idx[body]
+            client.resetBasePositionAndOrientation(
+                body_idx, base_state[0:3], base_state[3:7]
+            )
+            client.resetBaseVelocity(body_idx, base_state[7:10], base_state[10:13])
+            for joint in self._get_movable_joints(body):
+                angle, velocity = next(joint_states)
+                client.resetJointState(body_idx, int(joint), angle, velocity)
+        self._motor_targets = {}
+        for i in np.unique(state["motor_bodies"]):
+            commands = state["motor_commands"][state["motor_bodies"] == i]
+            self.control_joints(
+                bodies[i],
+                joints=commands[:, 0].astype(np.int64),
+                target_angles=commands[:, 1],
+                forces=commands[:, 2],
+            )
+        self.invalidate_state_cache()
+        # Until the next step, PyBullet reports the link states and the contact points of the previous state
+        # of this client. Serve the saved ones from the cache instead.
+        self._set_report(state)
+
+    def get_poses(self) -> np.ndarray:
+        """Get the kinematic state of the simulation: the base pose and the joint angles of every body.
+
+        This is all that is needed to render the scene, e.g. in another client built from the same scene with
+        `set_poses`. It is much smaller than the state returned by `get_state`.
+
+        Returns:
+            np.ndarray: For each body, in the order of creation, the base position (x, y, z), the base orientation
+                as quaternion (x, y, z, w) and the angles of the non-fixed joints, as a flat array.
+        """
+        poses = []
+        for body in self._bodies_idx:
+            poses.append(self._get_base_state(body)[:7])
+            joints = self._get_movable_joints(body)
+            if len(joints) > 0:
+                poses.append(self.get_joint_angles(body, joints))
+        return np.concatenate(poses)
+
+    def set_poses(self, poses: np.ndarray) -> None:
+        """Teleport all the bodies to the poses returned by `get_poses`. The velocities are not changed.
+
+        Args:
+            poses (np.ndarray): The poses, as returned by `get_poses` in a simulation with the same bodies.
+        """
+        client = self.physics_client
+        start = 0
+        for body, body_idx in self._bodies_idx.items():
+            client.resetBasePositionAndOrientation(
+                body_idx, poses[start : start + 3], poses[start + 3 : start + 7]
+            )
+            start += 7
+            for joint in self._get_movable_joints(body):
+                client.resetJointState(body_idx, joint, poses[start])
+                start += 1
+        self.invalidate_state_cache()
 
     def inverse_kinematics(
         self, body: str, link: int, position: np.ndarray, orientation: np.ndarray
@@ -417,6 +1158,35 @@ class PyBullet:
         )
         return np.array(joint_state)
 
+    def get_jacobian(
+        self, body: str, link: int, joint_angles: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """Compute the Jacobian of a link.
+
+        Args:
+            body (str): Body unique name.
+            link (int): Link index in the body.
+            joint_angles (np.ndarray, optional): Angles of the non-fixed joints of the body. Defaults to None (the
+                current angles).
+
+        Returns:
+            np.ndarray: The Jacobian of the link center of mass, of shape (6, n_movable_joints): the linear
+                velocity on the first 3 rows and the angular velocity on the last 3, by velocity of the non-fixed
+                joints.
+        """
+        if joint_angles is None:
+            joint_angles = self.get_joint_angles(body, self._get_movable_joints(body))
+        zeros = [0.0] * len(joint_angles)
+        linear, angular = self.physics_client.calculateJacobian(
+            bodyUniqueId=self._bodies_idx[body],
+            linkIndex=link,
+            localPosition=[0.0, 0.0, 0.0],
+            objPositions=list(joint_angles),
+            objVelocities=zeros,
+            objAccelerations=zeros,
+        )
+        return np.array([*linear, *angular])
+
     def place_visualizer(
         self, target_position: np.ndarray, distance: float, yaw: float, pitch: float
     ) -> None:
@@ -634,30 +1404,97 @@ class PyBullet:
             collision_kwargs (dict, optional): Collision kwargs. Defaults to {}.
         """
         position = position if position is not None else np.zeros(3)
-        baseVisualShapeIndex = self.physics_client.createVisualShape(
-            geom_type, **visual_kwargs
+        self.create_bodies(
+            [body_name],
+            geom_type,
+            positions=[position],
+            mass=mass,
+            ghost=ghost,
+            lateral_friction=lateral_friction,
+            spinning_friction=spinning_friction,
+            visual_kwargs=visual_kwargs,
+            collision_kwargs=collision_kwargs,
         )
+
+    def _get_shape(self, kind: str, geom_type: int, kwargs: Dict[str, Any]) -> int:
+        """Get a visual or collision shape, created on the first request.
+
+        Shapes are immutable in PyBullet, so bodies with the same geometry can share them.
+
+        Args:
+            kind (str): "visual" or "collision".
+            geom_type (int): The geometry type. See self.physics_client.GEOM_<shape>.
+            kwargs (dict): The kwargs of createVisualShape or createCollisionShape.
+
+        Returns:
+            int: The shape index.
+        """
+        key = (kind, geom_type) + tuple(
+            (name, tuple(np.ravel(value).tolist()) if np.ndim(value) else value)
+            for name, value in sorted(kwargs.items())
+        )
+        shape = self._shape_cache.get(key)
+        if shape is None:
+            if kind == "visual":
+                shape = self.physics_client.createVisualShape(geom_type, **kwargs)
+            else:
+                shape = self.physics_client.createCollisionShape(geom_type, **kwargs)
+            self._shape_cache[key] = shape
+        return shape
+
+    def create_bodies(
+        self,
+        body_names: Sequence[str],
+        geom_type: int,
+        positions: np.ndarray,
+        mass: float = 0.0,
+        ghost: bool = False,
+        lateral_friction: Optional[float] = None,
+        spinning_friction: Optional[float] = None,
+        visual_kwargs: Dict[str, Any] = {},
+        collision_kwargs: Dict[str, Any] = {},
+    ) -> None:
+        """Create several bodies with the same geometry, in a single call.
+
+        The shapes are shared between the bodies, and with any body previously created with the same geometry.
+
+        Args:
+            body_names (list of str): The names of the bodies. Must be unique in the sim.
+            geom_type (int): The geometry type. See self.physics_client.GEOM_<shape>.
+            positions (np.ndarray): The positions, as an array of shape (n_bodies, 3).
+            mass (float, optional): The mass of each body in kg. Defaults to 0.
+            ghost (bool, optional): Whether the bodies can collide. Defaults to False.
+            lateral_friction (float or None, optional): Lateral friction. If None, use the default pybullet
+                value. Defaults to None.
+            spinning_friction (float or None, optional): Spinning friction. If None, use the default pybullet
+                value. Defaults to None.
+            visual_kwargs (dict, optional): Visual kwargs. Defaults to {}.
+            collision_kwargs (dict, optional): Collision kwargs. Defaults to {}.
+        """
+        assert len(body_names) == len(positions), "Expected one position per body."
+        baseVisualShapeIndex = self._get_shape("visual", geom_type, visual_kwargs)
         if not ghost:
-            baseCollisionShapeIndex = self.physics_client.createCollisionShape(
-                geom_type, **collision_kwargs
+            baseCollisionShapeIndex = self._get_shape(
+                "collision", geom_type, collision_kwargs
             )
         else:
             baseCollisionShapeIndex = -1
-        self._bodies_idx[body_name] = self.physics_client.createMultiBody(
+        body_ids = self.physics_client.createMultiBody(
             baseVisualShapeIndex=baseVisualShapeIndex,
             baseCollisionShapeIndex=baseCollisionShapeIndex,
             baseMass=mass,
-            basePosition=position,
+            batchPositions=np.asarray(positions, dtype=np.float64).tolist(),
         )
-
-        if lateral_friction is not None:
-            self.set_lateral_friction(
-                body=body_name, link=-1, lateral_friction=lateral_friction
-            )
-        if spinning_friction is not None:
-            self.set_spinning_friction(
-                body=body_name, link=-1, spinning_friction=spinning_friction
-            )
+        for body_name, body_id in zip(body_names, body_ids):
+            self._bodies_idx[body_name] = body_id
+            if lateral_friction is not None:
+                self.set_lateral_friction(
+                    body=body_name, link=-1, lateral_friction=lateral_friction
+                )
+            if spinning_friction is not None:
+                self.set_spinning_friction(
+                    body=body_name, link=-1, spinning_friction=spinning_friction
+                )
 
     def create_plane(self, z_offset: float) -> None:
         """Create a plane. (Actually, it is a thin box.)
@@ -737,3 +1574,262 @@ class PyBullet:
             linkIndex=link,
             spinningFriction=spinning_friction,
         )
+
+
+class BatchedPyBullet:
+    """Batch of independent simulations living in the same process.
+
+    Each simulation has its own client. The methods mirror those of `PyBullet`, with a leading batch axis
+    on the per-simulation inputs and outputs. This avoids the cost of inter-process communication for
+    small scenes, where it outweighs the cost of stepping the simulations sequentially.
+
+    Args:
+        sims (list of PyBullet): The simulations. They must contain the same bodies. The batch takes
+            ownership of them: `close` closes all of them.
+    """
+
+    def __init__(self, sims: Sequence[PyBullet]) -> None:
+        assert len(sims) > 0, "At least one simulation is required."
+        self.sims = list(sims)
+        self.num_sims = len(self.sims)
+
+    @classmethod
+    def create(cls, num_sims: int, n_substeps: int = 20) -> "BatchedPyBullet":
+        """Create a batch of empty simulations, each with its own DIRECT client.
+
+        Args:
+            num_sims (int): Number of simulations.
+            n_substeps (int, optional): Number of sim substep when step() is called. Defaults to 20.
+
+        Returns:
+            BatchedPyBullet: The batch.
+        """
+        sims = [
+            PyBullet(render_mode="rgb_array", n_substeps=n_substeps, renderer="Tiny")
+            for _ in range(num_sims)
+        ]
+        return cls(sims)
+
+    def __len__(self) -> int:
+        return self.num_sims
+
+    @property
+    def dt(self):
+        """Timestep."""
+        return self.sims[0].dt
+
+    def step(self) -> None:
+        """Step all the simulations."""
+        for sim in self.sims:
+            sim.step()
+
+    def close(self) -> None:
+        """Close all the simulations."""
+        for sim in self.sims:
+            sim.close()
+
+    def save_state(self) -> List[int]:
+        """Save the current state of all the simulations.
+
+        Returns:
+            list of int: The state id of each simulation.
+        """
+        return [sim.save_state() for sim in self.sims]
+
+    def restore_state(self, state_ids: Sequence[int]) -> None:
+        """Restore the state of all the simulations.
+
+        Args:
+            state_ids (list of int): The state id of each simulation, as returned by save_state().
+        """
+        for sim, state_id in zip(self.sims, state_ids):
+            sim.restore_state(state_id)
+
+    def remove_state(self, state_ids: Sequence[int]) -> None:
+        """Remove a state of all the simulations.
+
+        Args:
+            state_ids (list of int): The state id of each simulation, as returned by save_state().
+        """
+        for sim, state_id in zip(self.sims, state_ids):
+            sim.remove_state(state_id)
+
+    def get_base_position(self, body: str) -> np.ndarray:
+        """Get the position of the body in every simulation.
+
+        Args:
+            body (str): Body unique name.
+
+        Returns:
+            np.ndarray: The positions, as an array of shape (num_sims, 3).
+        """
+        out = np.empty((self.num_sims, 3))
+        for i, sim in enumerate(self.sims):
+            out[i] = sim._get_base_state(body)[0:3]
+        return out
+
+    def get_base_orientation(self, body: str) -> np.ndarray:
+        """Get the orientation of the body in every simulation.
+
+        Args:
+            body (str): Body unique name.
+
+        Returns:
+            np.ndarray: The orientations as quaternions, as an array of shape (num_sims, 4).
+        """
+        out = np.empty((self.num_sims, 4))
+        for i, sim in enumerate(self.sims):
+            out[i] = sim._get_base_state(body)[3:7]
+        return out
+
+    def get_base_velocity(self, body: str) -> np.ndarray:
+        """Get the velocity of the body in every simulation.
+
+        Args:
+            body (str): Body unique name.
+
+        Returns:
+            np.ndarray: The velocities, as an array of shape (num_sims, 3).
+        """
+        out = np.empty((self.num_sims, 3))
+        for i, sim in enumerate(self.sims):
+            out[i] = sim._get_base_state(body)[7:10]
+        return out
+
+    def get_base_angular_velocity(self, body: str) -> np.ndarray:
+        """Get the angular velocity of the body in every simulation.
+
+        Args:
+            body (str): Body unique name.
+
+        Returns:
+            np.ndarray: The angular velocities, as an array of shape (num_sims, 3).
+        """
+        out = np.empty((self.num_sims, 3))
+        for i, sim in enumerate(self.sims):
+            out[i] = sim._get_base_state(body)[10:13]
+        return out
+
+    def get_link_states(
+        self, body: str, links: np.ndarray, compute_velocity: bool = True
+    ) -> np.ndarray:
+        """Get the state of several links of the body in every simulation.
+
+        Args:
+            body (str): Body unique name.
+            links (np.ndarray): List of link indices, as a list of ints.
+            compute_velocity (bool, optional): Whether to compute the link velocities. Defaults to True.
+
+        Returns:
+            np.ndarray: Array of shape (num_sims, n_links, 13). See `PyBullet.get_link_states`.
+        """
+        out = np.empty((self.num_sims, len(links), 13 if compute_velocity else 7))
+        for i, sim in enumerate(self.sims):
+            sim.get_link_states(body, links, compute_velocity, out=out[i])
+        return out
+
+    def get_joint_states(self, body: str, joints: np.ndarray) -> np.ndarray:
+        """Get the angles and velocities of several joints of the body in every simulation.
+
+        Args:
+            body (str): Body unique name.
+            joints (np.ndarray): List of joint indices, as a list of ints.
+
+        Returns:
+            np.ndarray: Array of shape (num_sims, n_joints, 2). See `PyBullet.get_joint_states`.
+        """
+        out = np.empty((self.num_sims, len(joints), 2))
+        for i, sim in enumerate(self.sims):
+            sim.get_joint_states(body, joints, out=out[i])
+        return out
+
+    def get_joint_angles(self, body: str, joints: np.ndarray) -> np.ndarray:
+        """Get the angles of several joints of the body in every simulation.
+
+        Args:
+            body (str): Body unique name.
+            joints (np.ndarray): List of joint indices, as a list of ints.
+
+        Returns:
+            np.ndarray: The angles, as an array of shape (num_sims, n_joints).
+        """
+        return self.get_joint_states(body, joints)[..., 0]
+
+    def set_base_pose(
+        self, body: str, positions: np.ndarray, orientations: np.ndarray
+    ) -> None:
+        """Set the pose of the body in every simulation.
+
+        Args:
+            body (str): Body unique name.
+            positions (np.ndarray): The positions, as an array of shape (num_sims, 3).
+            orientations (np.ndarray): The orientations, as an array of shape (num_sims, 4) for quaternions
+                or (num_sims, 3) for Euler angles.
+        """
+        for sim, position, orientation in zip(self.sims, positions, orientations):
+            sim.set_base_pose(body, position, orientation)
+
+    def set_joint_angles(
+        self, body: str, joints: np.ndarray, angles: np.ndarray
+    ) -> None:
+        """Set the angles of the joints of the body in every simulation.
+
+        Args:
+            body (str): Body unique name.
+            joints (np.ndarray): List of joint indices, as a list of ints.
+            angles (np.ndarray): The angles, as an array of shape (num_sims, n_joints).
+        """
+        for sim, sim_angles in zip(self.sims, angles):
+            sim.set_joint_angles(body, joints, sim_angles)
+
+    def control_joints(
+        self,
+        body: str,
+        joints: np.ndarray,
+        target_angles: np.ndarray,
+        forces: np.ndarray,
+    ) -> None:
+        """Control the joints motor in every simulation.
+
+        Args:
+            body (str): Body unique name.
+            joints (np.ndarray): List of joint indices, as a list of ints.
+            target_angles (np.ndarray): The target angles, as an array of shape (num_sims, n_joints).
+            forces (np.ndarray): Forces to apply, as a list of floats.
+        """
+        for sim, sim_target_angles in zip(self.sims, target_angles):
+            sim.control_joints(body, joints, sim_target_angles, forces)
+
+    def inverse_kinematics(
+        self, body: str, link: int, positions: np.ndarray, orientations: np.ndarray
+    ) -> np.ndarray:
+        """Compute the inverse kinematics in every simulation.
+
+        Args:
+            body (str): Body unique name.
+            link (int): Link index in the body.
+            positions (np.ndarray): Desired positions of the end-effector, as an array of shape (num_sims, 3).
+            orientations (np.ndarray): Desired orientations of the end-effector as quaternions, as an array of
+                shape (num_sims, 4).
+
+        Returns:
+            np.ndarray: The new joint states, as an array of shape (num_sims, n_joints).
+        """
+        joint_states = [
+            sim.inverse_kinematics(body, link, position, orientation)
+            for sim, position, orientation in zip(self.sims, positions, orientations)
+        ]
+        return np.stack(joint_states)
+
+    def get_jacobian(self, body: str, link: int) -> np.ndarray:
+        """Compute the Jacobian of a link in every simulation.
+
+        Args:
+            body (str): Body unique name.
+            link (int): Link index in the body.
+
+        Returns:
+            np.ndarray: The Jacobians, as an array of shape (num_sims, 6, n_movable_joints). See
+                `PyBullet.get_jacobian`.
+        """
+        return np.stack([sim.get_jacobian(body, link) for sim in self.sims])
@@ -0,0 +1,246 @@
+"""Recording of the rendered episodes, streamed to disk with a fixed memory footprint."""
+
+import glob
+import os
+import shutil
+import subprocess
+from typing import Any, Callable, Optional
+
+import gym
+import numpy as np
+
+
+class NpzChunkWriter:
+    """Write frames in compressed NPZ chunks.
+
+    The frames are rendered in a preallocated chunk buffer, which is compressed to ``{prefix}_{k:04d}.npz`` (key
+    ``"frames"``) when full, and reused for the next chunk.
+
+    Args:
+        frame_shape (tuple): Shape of a frame, as (height, width, 3).
+        chunk_len (int): Number of frames per chunk.
+    """
+
+    extension = ".npz"
+
+    def __init__(self, frame_shape: tuple, chunk_len: int) -> None:
+        assert chunk_len > 0, "The chunk length must be positive."
+        self._buffer = np.empty((chunk_len,) + tuple(frame_shape), dtype=np.uint8)
+        self._num_frames = 0
+        self._num_chunks = 0
+        self._prefix = None
+
+    def open(self, prefix: str) -> None:
+        """Start a new recording.
+
+        Args:
+            prefix (str): Path prefix of the chunks.
+        """
+        self._prefix = prefix
+        self._num_frames = 0
+        self._num_chunks = 0
+
+    @property
+    def next_frame(self) -> np.ndarray:
+        """Slot to render the next frame in, before calling `commit`."""
+        return self._buffer[self._num_frames]
+
+    def commit(self) -> None:
+        """Add the frame rendered in `next_frame` to the recording."""
+        self._num_frames += 1
+        if self._num_frames == len(self._buffer):
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._num_frames == 0:
+            return
+        path = "{}_{:04d}.npz".format(self._prefix, self._num_chunks)
+        np.savez_compressed(path, frames=self._buffer[: self._num_frames])
+        self._num_chunks += 1
+        self._num_frames = 0
+
+    def close(self) -> None:
+        """Write the last chunk and end the recording."""
+        self._flush()
+        self._prefix = None
+
+
+class FFmpegWriter:
+    """Write frames in a video file, by piping the raw frames to a ffmpeg process.
+
+    Args:
+        frame_shape (tuple): Shape of a frame, as (height, width, 3).
+        fps (float): Frames per second of the video.
+        ffmpeg (str, optional): Path of the ffmpeg executable. Defaults to the one found in the PATH.
+    """
+
+    extension = ".mp4"
+
+    def __init__(
+        self, frame_shape: tuple, fps: float, ffmpeg: Optional[str] = None
+    ) -> None:
+        ffmpeg = shutil.which("ffmpeg") if ffmpeg is None else ffmpeg
+        if ffmpeg is None:
+            raise RuntimeError(
+                "ffmpeg was not found, install it or use the npz format."
+            )
+        self.ffmpeg = ffmpeg
+        self.fps = fps
+        self._frame = np.empty(frame_shape, dtype=np.uint8)
+        self._process = None
+
+    def open(self, prefix: str) -> None:
+        """Start a new video.
+
+        Args:
+            prefix (str): Path of the video, without extension.
+        """
+        height, width, _ = self._frame.shape
+        command = [
+            self.ffmpeg,
+            "-y",
+            "-loglevel",
+            "error",
+            "-f",
+            "rawvideo",
+            "-pix_fmt",
+            "rgb24",
+            "-s",
+            "{}x{}".format(width, height),
+            "-r",
+            str(self.fps),
+            "-i",
+            "-",
+            "-an",
+            # H.264 with yuv420p requires even dimensions
+            "-vf",
+            "pad=ceil(iw/2)*2:ceil(ih/2)*2",
+            "-pix_fmt",
+            "yuv420p",
+            prefix + self.extension,
+        ]
+        self._process = subprocess.Popen(command, stdin=subprocess.PIPE)
+
+    @property
+    def next_frame(self) -> np.ndarray:
+        """Slot to render the next frame in, before calling `commit`."""
+        return self._frame
+
+    def commit(self) -> None:
+        """Send the frame rendered in `next_frame` to ffmpeg."""
+        self._process.stdin.write(memoryview(self._frame))
+
+    def close(self) -> None:
+        """Wait for ffmpeg to finish the video."""
+        if self._process is None:
+            return
+        self._process.stdin.close()
+        returncode = self._process.wait()
+        self._process = None
+        if returncode != 0:
+            raise RuntimeError("ffmpeg exited with code {}".format(returncode))
+
+
+class RecordEpisodes(gym.Wrapper):
+    """Wrapper recording the rendered episodes to disk, as they are played.
+
+    A frame is rendered after each `reset` and `step`, directly in the buffer of the writer, and written to disk
+    on the fly, so the memory used does not grow with the length or the number of the episodes. The episode
+    `i` is written in ``{directory}/{name_prefix}_{i:06d}``, with the ``.mp4`` extension with ffmpeg, and as
+    ``_{k:04d}.npz`` chunks otherwise (see `load_episode`).
+
+    Args:
+        env (gym.Env): A panda-gym environment. The frames are seen from its render camera.
+        directory (str): Directory of the recordings, created if needed.
+        episode_trigger (callable, optional): Function of the episode index returning whether to record the
+            episode. Defaults to None (record all the episodes).
+        video_format (str, optional): "npz", "mp4" (requires ffmpeg) or "auto" to use ffmpeg when it is
+            installed. Defaults to "npz".
+        max_buffer_bytes (int, optional): Memory ceiling of the frame buffer, in bytes. With the npz format,
+            it sets the number of frames per chunk. Defaults to 32 MiB.
+        name_prefix (str, optional): Prefix of the file names. Defaults to "episode".
+    """
+
+    def __init__(
+        self,
+        env: gym.Env,
+        directory: str,
+        episode_trigger: Optional[Callable[[int], bool]] = None,
+        video_format: str = "npz",
+        max_buffer_bytes: int = 32 * 2**20,
+        name_prefix: str = "episode",
+    ) -> None:
+        super().__init__(env)
+        if video_format == "auto":
+            video_format = "npz" if shutil.which("ffmpeg") is None else "mp4"
+        if video_format not in ("npz", "mp4"):
+            raise ValueError("The video format must be in {'npz', 'mp4', 'auto'}")
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.episode_trigger = episode_trigger
+        self.name_prefix = name_prefix
+        self.camera = env.unwrapped.get_render_camera()
+        frame_shape = (self.camera.height, self.camera.width, 3)
+        if video_format == "mp4":
+            self.writer = FFmpegWriter(frame_shape, fps=env.metadata["render_fps"])
+        else:
+            chunk_len = max(1, max_buffer_bytes // int(np.prod(frame_shape)))
+            self.writer = NpzChunkWriter(frame_shape, chunk_len)
+        self.episode_id = -1
+        self.recording = False
+
+    def _record_frame(self) -> None:
+        if self.recording:
+            self.env.unwrapped.sim.render_camera(
+                self.camera, out=self.writer.next_frame
+            )
+            self.writer.commit()
+
+    def reset(self, **kwargs: Any) -> Any:
+        observation = self.env.reset(**kwargs)
+        if self.recording:
+            self.writer.close()
+        self.episode_id += 1
+        self.recording = self.episode_trigger is None or self.episode_trigger(
+            self.episode_id
+        )
+        if self.recording:
+            name = "{}_{:06d}".format(self.name_prefix, self.episode_id)
+            self.writer.open(os.path.join(self.directory, name))
+        self._record_frame()
+        return observation
+
+    def step(self, action: Any) -> Any:
+        result = self.env.step(action)
+        self._record_frame()
+        return result
+
+    def close(self) -> None:
+        if self.recording:
+            self.writer.close()
+            self.recording = False
+        super().close()
+
+
+def load_episode(
+    directory: str, episode_id: int, name_prefix: str = "episode"
+) -> np.ndarray:
+    """Load the frames of an episode recorded in the npz format by `RecordEpisodes`.
+
+    Args:
+        directory (str): Directory of the recordings.
+        episode_id (int): Index of the episode.
+        name_prefix (str, optional): Prefix of the file names. Defaults to "episode".
+
+    Returns:
+        np.ndarray: The frames, of shape (num_frames, height, width, 3).
+    """
+    pattern = "{}_{:06d}_*.npz".format(name_prefix, episode_id)
+    paths = sorted(glob.glob(os.path.join(directory, pattern)))
+    if not paths:
+        raise FileNotFoundError("No recording of episode {}".format(episode_id))
+    chunks = []
+    for path in paths:
+        with np.load(path) as data:
+            chunks.append(data["frames"])
+    return np.concatenate(chunks)
@@ -0,0 +1,232 @@
+"""Rendering decoupled from the physics stepping.
+
+PyBullet holds the GIL during its calls, so a rendering thread would still block the step loop. Instead, the
+`AsyncRenderer` forks a render process, which inherits a copy of the scene in its own physics client. After each
+step, the poses of the bodies are written in a free slot of a shared memory ring and the render process renders
+them into the same slot, while the step loop goes on. When all the slots are busy, the frame is dropped rather
+than stalling the step loop.
+"""
+
+import multiprocessing as mp
+import traceback
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import gym
+import numpy as np
+import pybullet as p
+
+from panda_gym.pybullet import Camera, PyBullet
+from panda_gym.shared_memory import as_array, shared_array
+
+
+def _render_worker(
+    sim: PyBullet,
+    camera: Camera,
+    modalities: Sequence[str],
+    shared_slots: List[Dict[str, Any]],
+    requests: Any,
+    done: Any,
+) -> None:
+    """Render loop. Sets the poses of a slot, renders them in the same slot and reports the slot as done."""
+    slots = [
+        {key: as_array(shared) for key, shared in slot.items()} for slot in shared_slots
+    ]
+    try:
+        while True:
+            index = requests.get()
+            if index is None:
+                break
+            slot = slots[index]
+            sim.set_poses(slot["poses"])
+            images = {modality: slot[modality] for modality in modalities}
+            sim.render_camera_images(camera, modalities, out=images)
+            done.put((index, None))
+    except (KeyboardInterrupt, Exception):
+        done.put((None, traceback.format_exc()))
+
+
+class AsyncRenderer:
+    """Render the frames of a simulation in a separate process.
+
+    The render process is forked from the current process, so the simulation must be fully built before
+    creating the renderer, and must not add or remove bodies afterwards. It requires the "fork" start method and
+    a simulation without window (render mode "rgb_array" with the "Tiny" renderer).
+
+    Args:
+        sim (PyBullet): The simulation.
+        camera (Camera, optional): The camera. Defaults to the default `Camera`.
+        modalities (list of str, optional): Rendered images, among "rgb", "depth" and "segmentation" (see
+            `PyBullet.render_camera_images`). Defaults to ("rgb",).
+        max_pending (int, optional): Number of frames that can be requested and not yet collected. Beyond, the
+            requested frames are dropped. Defaults to 4.
+    """
+
+    def __init__(
+        self,
+        sim: PyBullet,
+        camera: Optional[Camera] = None,
+        modalities: Sequence[str] = ("rgb",),
+        max_pending: int = 4,
+    ) -> None:
+        assert max_pending > 0, "max_pending must be positive."
+        if sim.connection_mode != p.DIRECT:
+            raise ValueError(
+                "Asynchronous rendering requires a simulation without window."
+            )
+        ctx = mp.get_context("fork")
+        self.sim = sim
+        self.camera = Camera() if camera is None else camera
+        self.modalities = tuple(modalities)
+        self.num_requested = 0
+        self.num_dropped = 0
+        num_poses = len(sim.get_poses())
+        shared_slots = []
+        for _ in range(max_pending):
+            slot = {"poses": shared_array(ctx, (num_poses,), np.float64)}
+            for modality in self.modalities:
+                image = self.camera.get_buffer(modality)
+                slot[modality] = shared_array(ctx, image.shape, image.dtype)
+            shared_slots.append(slot)
+        self._slots = [
+            {key: as_array(shared) for key, shared in slot.items()}
+            for slot in shared_slots
+        ]
+        self._free_slots = list(range(max_pending))
+        self._frame_ids = [-1] * max_pending
+        self._requests = ctx.SimpleQueue()
+        self._done = ctx.SimpleQueue()
+        self._process = ctx.Process(
+            target=_render_worker,
+            name="AsyncRenderer",
+            args=(
+                sim,
+                self.camera,
+                self.modalities,
+                shared_slots,
+                self._requests,
+                self._done,
+            ),
+            daemon=True,
+        )
+        self._process.start()
+        self.closed = False
+
+    @property
+    def num_pending(self) -> int:
+        """Number of requested frames not yet collected."""
+        return len(self._slots) - len(self._free_slots)
+
+    def request(self) -> bool:
+        """Request a frame of the current state of the simulation. Does not wait for the frame to be rendered.
+
+        Returns:
+            bool: Whether the frame was requested, False if it was dropped because too many frames are pending.
+        """
+        frame_id = self.num_requested
+        self.num_requested += 1
+        if not self._free_slots:
+            self.num_dropped += 1
+            return False
+        index = self._free_slots.pop()
+        self._slots[index]["poses"][:] = self.sim.get_poses()
+        self._frame_ids[index] = frame_id
+        self._requests.put(index)
+        return True
+
+    def collect(self, block: bool = False) -> List[Tuple[int, Dict[str, np.ndarray]]]:
+        """Collect the rendered frames.
+
+        Args:
+            block (bool, optional): Whether to wait for all the pending frames. Defaults to False.
+
+        Returns:
+            list: The frames as (frame_id, images) tuples, in the order of the requests. The frame id is the index
+                of the request, the ids of the dropped frames are missing. The images are copies, by modality.
+        """
+        frames = []
+        while self.num_pending > 0 and (block or not self._done.empty()):
+            index, error = self._done.get()
+            if error is not None:
+                self.close(terminate=True)
+                raise RuntimeError("The render process raised an exception:\n" + error)
+            images = {
+                modality: self._slots[index][modality].copy()
+                for modality in self.modalities
+            }
+            frames.append((self._frame_ids[index], images))
+            self._free_slots.append(index)
+        return frames
+
+    def close(self, terminate: bool = False) -> None:
+        """Stop the render process. The pending frames are lost.
+
+        Args:
+            terminate (bool, optional): Whether to terminate the process instead of asking it to stop.
+                Defaults to False.
+        """
+        if self.closed:
+            return
+        if terminate:
+            self._process.terminate()
+        else:
+            self._requests.put(None)
+        self._process.join()
+        self.closed = True
+
+    def __del__(self) -> None:
+        if not getattr(self, "closed", True):
+            self.close(terminate=True)
+
+
+class AsyncRender(gym.Wrapper):
+    """Wrapper rendering a frame after each `reset` and `step`, in a separate process.
+
+    The frames are seen from the render camera of the environment (`render_width`, `render_target_position`,
+    ...). Collect them with `collect_frames`; frames requested while `max_pending` frames are already pending are
+    dropped, and counted in `renderer.num_dropped`.
+
+    Args:
+        env (gym.Env): A panda-gym environment, with render mode "rgb_array" and the "Tiny" renderer.
+        modalities (list of str, optional): Rendered images, among "rgb", "depth" and "segmentation".
+            Defaults to ("rgb",).
+        max_pending (int, optional): Number of frames that can be requested and not yet collected.
+            Defaults to 4.
+    """
+
+    def __init__(
+        self, env: gym.Env, modalities: Sequence[str] = ("rgb",), max_pending: int = 4
+    ) -> None:
+        super().__init__(env)
+        self.renderer = AsyncRenderer(
+            env.unwrapped.sim,
+            env.unwrapped.get_render_camera(),
+            modalities=modalities,
+            max_pending=max_pending,
+        )
+
+    def reset(self, **kwargs: Any) -> Any:
+        observation = self.env.reset(**kwargs)
+        self.renderer.request()
+        return observation
+
+    def step(self, action: Any) -> Any:
+        result = self.env.step(action)
+        self.renderer.request()
+        return result
+
+    def collect_frames(
+        self, block: bool = False
+    ) -> List[Tuple[int, Dict[str, np.ndarray]]]:
+        """Collect the rendered frames. See `AsyncRenderer.collect`.
+
+        Args:
+            block (bool, optional): Whether to wait for all the pending frames. Defaults to False.
+
+        Returns:
+            list: The frames as (frame_id, images) tuples.
+        """
+        return self.renderer.collect(block)
+
+    def close(self) -> None:
+        self.renderer.close()
+        super().close()
@@ -0,0 +1,140 @@
+"""Deterministic replay of recorded episodes.
+
+An episode of a panda-gym environment is fully determined by the seed of its reset and by the actions taken. The
+`Replay` engine replays such an action log, e.g. to regenerate the pixel observations of a dataset collected
+without them, without running the policy again.
+"""
+
+import bisect
+from typing import Dict, Iterator, Optional, Sequence, Tuple, Union
+
+import gym
+import numpy as np
+
+
+class Replay:
+    """Replay an episode from the seed of its reset and the actions taken.
+
+    The steps that are skipped are simulated at maximum speed: only the actions are applied and the simulation
+    stepped, without computing the observations, the rewards, nor rendering. The state of the environment is
+    saved every `checkpoint_interval` steps when first reached, so that any step is then reconstructed by
+    restoring the closest checkpoint before it and simulating at most `checkpoint_interval - 1` steps.
+
+    The replay keeps track of the state of the environment: do not step or reset the environment directly
+    while replaying.
+
+    The steps after a restored checkpoint are only the same as the original ones if the overlapping pairs are
+    sorted: the replay enables it in the simulation. To reproduce the recorded episode exactly, it must have
+    been played with the same setting, in an environment made with ``physics_profile="deterministic"``.
+
+    Args:
+        env (gym.Env): The panda-gym environment the episode was played in, or a new one with the same id and
+            arguments. The replay resets it.
+        seed (int): The seed given to `reset` at the start of the episode.
+        actions (np.ndarray): The actions taken, of shape (num_steps, ...).
+        checkpoint_interval (int, optional): Number of steps between two checkpoints. Defaults to None (no
+            checkpoint, every reconstruction starts from the reset).
+    """
+
+    def __init__(
+        self,
+        env: gym.Env,
+        seed: int,
+        actions: Union[np.ndarray, Sequence],
+        checkpoint_interval: Optional[int] = None,
+    ) -> None:
+        assert checkpoint_interval is None or checkpoint_interval > 0
+        self.env = env.unwrapped
+        self.env.sim.set_deterministic_overlapping_pairs()
+        self.seed = seed
+        self.actions = actions
+        self.checkpoint_interval = checkpoint_interval
+        # Steps with a checkpoint, sorted, and the id of their saved state
+        self._checkpoint_steps = []
+        self._checkpoints: Dict[int, int] = {}
+        self._step = None  # step of the current state of the environment
+
+    def __len__(self) -> int:
+        """Number of actions. The states go from step 0 (after the reset) to step `len(self)`."""
+        return len(self.actions)
+
+    def _restart(self, step: int) -> None:
+        """Bring the environment to the closest known state before a step."""
+        i = bisect.bisect_right(self._checkpoint_steps, step)
+        checkpoint_step = self._checkpoint_steps[i - 1] if i > 0 else None
+        if self._step is not None and self._step <= step:
+            if checkpoint_step is None or checkpoint_step <= self._step:
+                return  # the current state is the closest
+        if checkpoint_step is not None:
+            self.env.restore_state(self._checkpoints[checkpoint_step])
+            self._step = checkpoint_step
+        else:
+            self.env.reset(seed=self.seed)
+            self._step = 0
+
+    def _save_checkpoint(self) -> None:
+        interval = self.checkpoint_interval
+        if interval is None or self._step % interval != 0:
+            return
+        if self._step in self._checkpoints:
+            return
+        state_id = self.env.save_state()
+        # protect the checkpoints from the eviction of the snapshot pool
+        self.env.snapshots.acquire(state_id)
+        self._checkpoints[self._step] = state_id
+        bisect.insort(self._checkpoint_steps, self._step)
+
+    def _advance(self) -> None:
+        """Apply the next action and step the simulation, without computing the observation."""
+        self.env.robot.set_action(self.actions[self._step])
+        self.env.sim.step()
+        self._step += 1
+        self._save_checkpoint()
+
+    def seek(self, step: int) -> Dict[str, np.ndarray]:
+        """Reconstruct the state of the environment after a number of steps.
+
+        Args:
+            step (int): The step, from 0 (after the reset) to `len(self)` (after the last action).
+
+        Returns:
+            dict: The observation at this step. If the environment has pixel observations with frame stacking,
+                the stacks are filled with the frame of this step.
+        """
+        if not 0 <= step <= len(self):
+            raise IndexError("Step {} out of range [0, {}]".format(step, len(self)))
+        self._restart(step)
+        self._save_checkpoint()
+        with self.env.sim.no_rendering():
+            while self._step < step:
+                self._advance()
+        return self.env._get_obs(reset=True)
+
+    def play(
+        self, start: int = 0, stop: Optional[int] = None
+    ) -> Iterator[Tuple[int, Dict[str, np.ndarray]]]:
+        """Replay the steps one after the other, with their observations.
+
+        Args:
+            start (int, optional): First step. Defaults to 0.
+            stop (int, optional): Last step, excluded. Defaults to `len(self) + 1` (until the end).
+
+        Yields:
+            tuple: The step and the observation at this step. The environment is in the state of this step,
+                so that it can be rendered, e.g. with `env.render()`.
+        """
+        stop = len(self) + 1 if stop is None else stop
+        if start < stop:
+            yield start, self.seek(start)
+        for step in range(start + 1, stop):
+            self._advance()
+            yield step, self.env._get_obs()
+
+    def close(self) -> None:
+        """Remove the checkpoints."""
+        for state_id in self._checkpoints.values():
+            self.env.snapshots.release(state_id)
+            self.env.remove_state(state_id)
+        self._checkpoints.clear()
+        self._checkpoint_steps.clear()
+        self._step = None
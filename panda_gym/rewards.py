@@ -0,0 +1,306 @@
+"""Reward kernels, independent of the tasks and of the simulation.
+
+A kernel is a function ``kernel(achieved_goal, desired_goal, distance_threshold, out=None)`` that returns the
+float32 rewards for goals of shape (..., goal_dim). Tasks select their kernel by name, and the same kernel can be
+used to relabel transitions without creating any environment:
+
+>>> from panda_gym.rewards import get_kernel
+>>> kernel = get_kernel("dense_distance")
+>>> rewards = kernel(achieved_goals, desired_goals, 0.05)
+
+Every kernel has a pure NumPy implementation. When Numba is installed, a JIT-compiled implementation is also
+registered and used by default.
+"""
+
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from panda_gym.utils import angle_distance, goal_distance
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+Kernel = Callable[..., np.ndarray]
+
+_KERNELS: Dict[str, Dict[str, Kernel]] = {}
+
+DEFAULT_BACKEND = "numpy" if numba is None else "numba"
+
+
+def register_kernel(name: str, backend: str = "numpy") -> Callable[[Kernel], Kernel]:
+    """Decorator registering a reward kernel.
+
+    Args:
+        name (str): The kernel name, e.g. "dense_distance".
+        backend (str, optional): The backend implementing the kernel, "numpy" or "numba". Defaults to "numpy".
+
+    Returns:
+        callable: The decorator.
+    """
+
+    def decorator(kernel: Kernel) -> Kernel:
+        _KERNELS.setdefault(name, {})[backend] = kernel
+        return kernel
+
+    return decorator
+
+
+def get_kernel(name: str, backend: Optional[str] = None) -> Kernel:
+    """Get a registered reward kernel.
+
+    Args:
+        name (str): The kernel name. See `available_kernels`.
+        backend (str, optional): "numpy" or "numba". Defaults to Numba when it is installed, NumPy otherwise.
+            If the requested backend does not implement the kernel, the NumPy implementation is returned.
+
+    Returns:
+        callable: The kernel ``kernel(achieved_goal, desired_goal, distance_threshold, out=None)``.
+    """
+    if name not in _KERNELS:
+        raise ValueError(
+            "Unknown reward kernel {}, available kernels: {}".format(
+                name, available_kernels()
+            )
+        )
+    implementations = _KERNELS[name]
+    backend = DEFAULT_BACKEND if backend is None else backend
+    if backend == "numba" and numba is None:
+        raise ImportError(
+            "The numba backend requires numba, install it with `pip install numba`."
+        )
+    return implementations.get(backend, implementations["numpy"])
+
+
+def available_kernels() -> List[str]:
+    """Returns the names of the registered reward kernels."""
+    return sorted(_KERNELS)
+
+
+# NumPy kernels
+
+
+@register_kernel("sparse_distance")
+def sparse_distance(
+    achieved_goal: np.ndarray,
+    desired_goal: np.ndarray,
+    distance_threshold: float,
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """-1 if the distance between the goals is greater than the threshold, 0 otherwise."""
+    d = goal_distance(achieved_goal, desired_goal)
+    return np.negative(d > distance_threshold, dtype=np.float32, out=out)
+
+
+@register_kernel("dense_distance")
+def dense_distance(
+    achieved_goal: np.ndarray,
+    desired_goal: np.ndarray,
+    distance_threshold: float,
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Opposite of the distance between the goals."""
+    d = goal_distance(achieved_goal, desired_goal)
+    return np.negative(d, dtype=np.float32, out=out)
+
+
+@register_kernel("sparse_angle")
+def sparse_angle(
+    achieved_goal: np.ndarray,
+    desired_goal: np.ndarray,
+    distance_threshold: float,
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """-1 if the geodesic distance between the quaternions is greater than the threshold, 0 otherwise."""
+    d = angle_distance(achieved_goal, desired_goal)
+    return np.negative(d > distance_threshold, dtype=np.float32, out=out)
+
+
+@register_kernel("dense_angle")
+def dense_angle(
+    achieved_goal: np.ndarray,
+    desired_goal: np.ndarray,
+    distance_threshold: float,
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Opposite of the geodesic distance between the quaternions."""
+    d = angle_distance(achieved_goal, desired_goal)
+    return np.negative(d, dtype=np.float32, out=out)
+
+
+# The grasp kernels expect goals laid out as [grasped, touching, ee_position (3), object_position (3)].
+
+
+@register_kernel("sparse_grasp")
+def sparse_grasp(
+    achieved_goal: np.ndarray,
+    desired_goal: np.ndarray,
+    distance_threshold: float,
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Difference between the achieved and the desired grasp flags."""
+    grasp_reward = achieved_goal[..., 0] - desired_goal[..., 0]
+    return np.add(grasp_reward, 0, out=out, dtype=np.float32)
+
+
+@register_kernel("dense_grasp")
+def dense_grasp(
+    achieved_goal: np.ndarray,
+    desired_goal: np.ndarray,
+    distance_threshold: float,
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Weighted sum of the end-effector distance, contact and grasp terms."""
+    d = goal_distance(achieved_goal[..., 2:5], desired_goal[..., 2:5])
+    distance_reward = np.minimum(distance_threshold - d, 0)
+    contact_reward = achieved_goal[..., 1] - desired_goal[..., 1]
+    grasp_reward = achieved_goal[..., 0] - desired_goal[..., 0]
+    reward = 0.25 * distance_reward + 0.25 * contact_reward
+    return np.add(reward, 0.5 * grasp_reward, out=out, dtype=np.float32)
+
+
+@register_kernel("sparse_pick_and_place")
+def sparse_pick_and_place(
+    achieved_goal: np.ndarray,
+    desired_goal: np.ndarray,
+    distance_threshold: float,
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """-1 if the object is farther from the target than the threshold, 0 otherwise."""
+    return sparse_distance(
+        achieved_goal[..., 5:8], desired_goal[..., 5:8], distance_threshold, out=out
+    )
+
+
+@register_kernel("dense_pick_and_place")
+def dense_pick_and_place(
+    achieved_goal: np.ndarray,
+    desired_goal: np.ndarray,
+    distance_threshold: float,
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Weighted sum of the end-effector distance, contact, grasp and target distance terms."""
+    obj_d = goal_distance(achieved_goal[..., 2:5], desired_goal[..., 2:5])
+    target_d = goal_distance(achieved_goal[..., 5:8], desired_goal[..., 5:8])
+    distance_reward = np.minimum(distance_threshold - obj_d, 0)
+    target_reward = np.minimum(distance_threshold - target_d, 0)
+    contact_reward = achieved_goal[..., 1] - desired_goal[..., 1]
+    grasp_reward = achieved_goal[..., 0] - desired_goal[..., 0]
+    distance_reward = np.where(grasp_reward == 0, 0, distance_reward)
+    reward = 1 / 6 * distance_reward + 2 / 6 * contact_reward + 2 / 6 * grasp_reward
+    return np.add(reward, 1 / 6 * target_reward, out=out, dtype=np.float32)
+
+
+# Numba kernels. The JIT functions loop over 2D float32 arrays, `_numba_kernel` takes care of the batch shape.
+
+if numba is not None:
+
+    def _numba_kernel(name: str) -> Callable[[Callable], Kernel]:
+        """Decorator wrapping a JIT-compiled row loop ``fn(a, b, threshold, out)`` into a kernel and registering it."""
+
+        def decorator(fn: Callable) -> Kernel:
+            jitted = numba.njit(cache=True)(fn)
+
+            def kernel(
+                achieved_goal: np.ndarray,
+                desired_goal: np.ndarray,
+                distance_threshold: float,
+                out: Optional[np.ndarray] = None,
+            ) -> np.ndarray:
+                achieved_goal = np.ascontiguousarray(achieved_goal, dtype=np.float32)
+                desired_goal = np.ascontiguousarray(desired_goal, dtype=np.float32)
+                assert achieved_goal.shape == desired_goal.shape
+                goal_dim = achieved_goal.shape[-1]
+                if out is None:
+                    out = np.empty(achieved_goal.shape[:-1], dtype=np.float32)
+                # the JIT functions write into a contiguous float32 array, any other out is filled from a copy,
+                # as with the NumPy kernels
+                result = out
+                if not (out.flags.c_contiguous and out.dtype == np.float32):
+                    result = np.empty(out.shape, dtype=np.float32)
+                jitted(
+                    achieved_goal.reshape(-1, goal_dim),
+                    desired_goal.reshape(-1, goal_dim),
+                    np.float32(distance_threshold),
+                    result.reshape(-1),
+                )
+                if result is not out:
+                    np.copyto(out, result)
+                return out
+
+            kernel.__name__ = fn.__name__
+            kernel.__doc__ = _KERNELS[name]["numpy"].__doc__
+            return register_kernel(name, backend="numba")(kernel)
+
+        return decorator
+
+    @numba.njit(cache=True)
+    def _norm(a, b, start, stop):
+        total = np.float32(0.0)
+        for j in range(start, stop):
+            diff = a[j] - b[j]
+            total += diff * diff
+        return np.sqrt(total)
+
+    @numba.njit(cache=True)
+    def _angle(a, b):
+        inner = np.float32(0.0)
+        for j in range(a.shape[0]):
+            inner += a[j] * b[j]
+        return 1 - inner * inner
+
+    @_numba_kernel("sparse_distance")
+    def _sparse_distance(a, b, threshold, out):
+        for i in range(a.shape[0]):
+            out[i] = -1.0 if _norm(a[i], b[i], 0, a.shape[1]) > threshold else 0.0
+
+    @_numba_kernel("dense_distance")
+    def _dense_distance(a, b, threshold, out):
+        for i in range(a.shape[0]):
+            out[i] = -_norm(a[i], b[i], 0, a.shape[1])
+
+    @_numba_kernel("sparse_angle")
+    def _sparse_angle(a, b, threshold, out):
+        for i in range(a.shape[0]):
+            out[i] = -1.0 if _angle(a[i], b[i]) > threshold else 0.0
+
+    @_numba_kernel("dense_angle")
+    def _dense_angle(a, b, threshold, out):
+        for i in range(a.shape[0]):
+            out[i] = -_angle(a[i], b[i])
+
+    @_numba_kernel("sparse_grasp")
+    def _sparse_grasp(a, b, threshold, out):
+        for i in range(a.shape[0]):
+            out[i] = a[i, 0] - b[i, 0]
+
+    @_numba_kernel("dense_grasp")
+    def _dense_grasp(a, b, threshold, out):
+        for i in range(a.shape[0]):
+            distance_reward = min(threshold - _norm(a[i], b[i], 2, 5), 0.0)
+            contact_reward = a[i, 1] - b[i, 1]
+            grasp_reward = a[i, 0] - b[i, 0]
+            out[i] = 0.25 * distance_reward + 0.25 * contact_reward + 0.5 * grasp_reward
+
+    @_numba_kernel("sparse_pick_and_place")
+    def _sparse_pick_and_place(a, b, threshold, out):
+        for i in range(a.shape[0]):
+            out[i] = -1.0 if _norm(a[i], b[i], 5, 8) > threshold else 0.0
+
+    @_numba_kernel("dense_pick_and_place")
+    def _dense_pick_and_place(a, b, threshold, out):
+        for i in range(a.shape[0]):
+            grasp_reward = a[i, 0] - b[i, 0]
+            contact_reward = a[i, 1] - b[i, 1]
+            distance_reward = 0.0
+            if grasp_reward != 0:
+                distance_reward = min(threshold - _norm(a[i], b[i], 2, 5), 0.0)
+            target_reward = min(threshold - _norm(a[i], b[i], 5, 8), 0.0)
+            out[i] = (
+                1 / 6 * distance_reward
+                + 2 / 6 * contact_reward
+                + 2 / 6 * grasp_reward
+                + 1 / 6 * target_reward
+            )
@@ -0,0 +1,33 @@
+"""NumPy arrays in untyped shared memory blocks, shared by the vector envs and the asynchronous renderer.
+
+The blocks are allocated from a multiprocessing context before the processes are started, and each process then
+gets its own NumPy view of them, without any copy.
+"""
+
+from typing import Any, Tuple
+
+import numpy as np
+
+
+def shared_array(
+    ctx: Any, shape: Tuple[int, ...], dtype: np.dtype
+) -> Tuple[Any, Tuple[int, ...], np.dtype]:
+    """Allocate an untyped shared memory block large enough for an array.
+
+    Args:
+        ctx: Multiprocessing context.
+        shape (tuple): Shape of the array.
+        dtype (np.dtype): Data type of the array.
+
+    Returns:
+        tuple: The raw shared block, the shape and the data type. Use `as_array` to get the NumPy view.
+    """
+    dtype = np.dtype(dtype)
+    n_bytes = max(int(np.prod(shape)) * dtype.itemsize, 1)
+    return ctx.RawArray("B", n_bytes), shape, dtype
+
+
+def as_array(shared: Tuple[Any, Tuple[int, ...], np.dtype]) -> np.ndarray:
+    """NumPy view of a shared block allocated with `shared_array`."""
+    raw, shape, dtype = shared
+    return np.frombuffer(raw, dtype=dtype, count=int(np.prod(shape))).reshape(shape)
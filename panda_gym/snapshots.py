@@ -0,0 +1,205 @@
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pybullet
+
+from panda_gym.pybullet import PyBullet
+
+
+class Snapshot:
+    """A saved state of the environment.
+
+    Args:
+        state_id (int): The PyBullet state id.
+        goal (np.ndarray or None): A copy of the task goal.
+        rng_state (dict or None): The state of the bit generator of the task random number generator.
+        nbytes (int): Estimated memory footprint, in bytes.
+    """
+
+    __slots__ = ("state_id", "goal", "rng_state", "nbytes", "ref_count")
+
+    def __init__(
+        self,
+        state_id: int,
+        goal: Optional[np.ndarray],
+        rng_state: Optional[Dict[str, Any]],
+        nbytes: int,
+    ) -> None:
+        self.state_id = state_id
+        self.goal = goal
+        self.rng_state = rng_state
+        self.nbytes = nbytes
+        self.ref_count = 0
+
+
+class SnapshotPool:
+    """Pool of environment snapshots with a bounded size.
+
+    Each snapshot holds an in-memory PyBullet state (`saveState`), a copy of the task goal and the state of the
+    task random number generator, so that restoring a snapshot is exact. When the pool is full, saving a new
+    snapshot evicts the least recently used snapshots (the PyBullet state is removed with `removeState`).
+
+    Snapshots can be pinned with `acquire` to protect them from eviction, and unpinned with `release`. Pinned
+    snapshots are never evicted, so the pool can temporarily exceed its capacity if all of them are pinned.
+
+    The snapshots are identified by increasing ids, owned by the pool: PyBullet reuses the id of a removed state,
+    so that an id of PyBullet could silently designate a newer state once its snapshot is evicted.
+
+    Args:
+        sim (PyBullet): The simulation.
+        capacity (int, optional): Maximum number of unpinned snapshots kept alive. None for no limit.
+            Defaults to None.
+    """
+
+    def __init__(self, sim: PyBullet, capacity: Optional[int] = None) -> None:
+        assert capacity is None or capacity > 0, "The capacity must be positive."
+        self.sim = sim
+        self.capacity = capacity
+        self._snapshots: "OrderedDict[int, Snapshot]" = OrderedDict()
+        self._next_id = 0
+        self._num_evictions = 0
+        self._num_unpinned = 0
+        # estimated size of a PyBullet state, computed at the first save
+        self._state_nbytes = None
+
+    def __len__(self) -> int:
+        return len(self._snapshots)
+
+    def __contains__(self, state_id: int) -> bool:
+        return state_id in self._snapshots
+
+    def _estimate_state_nbytes(self) -> int:
+        """Estimate the size of a PyBullet state: base pose and velocity, and position and velocity of the joints."""
+        client = self.sim.physics_client
+        num_doubles = 0
+        for i in range(client.getNumBodies()):
+            body = client.getBodyUniqueId(i)
+            num_doubles += 13 + 2 * client.getNumJoints(body)
+        return 8 * num_doubles
+
+    def save(
+        self,
+        goal: Optional[np.ndarray] = None,
+        np_random: Optional[np.random.Generator] = None,
+    ) -> int:
+        """Save the current state.
+
+        Args:
+            goal (np.ndarray, optional): The task goal, copied in the snapshot. Defaults to None.
+            np_random (np.random.Generator, optional): Random number generator whose state is saved.
+                Defaults to None.
+
+        Returns:
+            int: The snapshot unique identifier.
+        """
+        if self._state_nbytes is None:
+            self._state_nbytes = self._estimate_state_nbytes()
+        state_id = self.sim.save_state()
+        goal = None if goal is None else np.array(goal, copy=True)
+        rng_state = None if np_random is None else np_random.bit_generator.state
+        nbytes = self._state_nbytes + self.sim.get_saved_report_nbytes(state_id)
+        nbytes += 0 if goal is None else goal.nbytes
+        snapshot_id = self._next_id
+        self._next_id += 1
+        self._snapshots[snapshot_id] = Snapshot(state_id, goal, rng_state, nbytes)
+        self._num_unpinned += 1
+        self._evict()
+        return snapshot_id
+
+    def _evict(self) -> None:
+        """Remove the least recently used unpinned snapshots until the capacity is respected."""
+        if self.capacity is None:
+            return
+        while self._num_unpinned > self.capacity:
+            # the snapshots are ordered from the least to the most recently used
+            state_id = next(
+                state_id
+                for state_id, snapshot in self._snapshots.items()
+                if snapshot.ref_count == 0
+            )
+            self.remove(state_id)
+            self._num_evictions += 1
+
+    def _get(self, state_id: int) -> Snapshot:
+        if state_id not in self._snapshots:
+            raise pybullet.error(
+                "No snapshot with id {}, it was removed or evicted.".format(state_id)
+            )
+        return self._snapshots[state_id]
+
+    def restore(
+        self, state_id: int, np_random: Optional[np.random.Generator] = None
+    ) -> Snapshot:
+        """Restore the simulation state of a snapshot and mark it as the most recently used.
+
+        Args:
+            state_id (int): The snapshot unique identifier.
+            np_random (np.random.Generator, optional): Random number generator whose state is restored, if it was
+                saved. Defaults to None.
+
+        Returns:
+            Snapshot: The snapshot, whose goal is to be restored by the caller.
+        """
+        snapshot = self._get(state_id)
+        self.sim.restore_state(snapshot.state_id)
+        if np_random is not None and snapshot.rng_state is not None:
+            np_random.bit_generator.state = snapshot.rng_state
+        self._snapshots.move_to_end(state_id)
+        return snapshot
+
+    def remove(self, state_id: int) -> None:
+        """Remove a snapshot, whether it is pinned or not.
+
+        Args:
+            state_id (int): The snapshot unique identifier.
+        """
+        snapshot = self._get(state_id)
+        del self._snapshots[state_id]
+        if snapshot.ref_count == 0:
+            self._num_unpinned -= 1
+        self.sim.remove_state(snapshot.state_id)
+
+    def acquire(self, state_id: int) -> None:
+        """Pin a snapshot, so that it is not evicted until it is released.
+
+        Args:
+            state_id (int): The snapshot unique identifier.
+        """
+        snapshot = self._get(state_id)
+        if snapshot.ref_count == 0:
+            self._num_unpinned -= 1
+        snapshot.ref_count += 1
+
+    def release(self, state_id: int) -> None:
+        """Unpin a snapshot. Once no longer pinned, it can be evicted.
+
+        Args:
+            state_id (int): The snapshot unique identifier.
+        """
+        snapshot = self._get(state_id)
+        assert snapshot.ref_count > 0, "Snapshot {} is not acquired.".format(state_id)
+        snapshot.ref_count -= 1
+        if snapshot.ref_count == 0:
+            self._num_unpinned += 1
+            self._evict()
+
+    def clear(self) -> None:
+        """Remove all the snapshots."""
+        for state_id in list(self._snapshots):
+            self.remove(state_id)
+
+    def stats(self) -> Dict[str, int]:
+        """Statistics of the pool.
+
+        Returns:
+            dict: The number of live snapshots ("live"), of pinned snapshots ("pinned"), the estimated memory used
+            by the live snapshots in bytes ("bytes"), including the goals and the link states and contact points
+            saved with the PyBullet states, and the number of evictions so far ("evictions").
+        """
+        return {
+            "live": len(self._snapshots),
+            "pinned": len(self._snapshots) - self._num_unpinned,
+            "bytes": sum(snapshot.nbytes for snapshot in self._snapshots.values()),
+            "evictions": self._num_evictions,
+        }
@@ -1,31 +1,187 @@
+from typing import Dict, Optional, Tuple
+
 import numpy as np
+from gym import spaces
 
 
-def distance(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+def distance(
+    a: np.ndarray, b: np.ndarray, out: Optional[np.ndarray] = None
+) -> np.ndarray:
     """Compute the distance between two array. This function is vectorized.
 
+    Use `goal_distance` for a float32 result.
+
+    Args:
+        a (np.ndarray): First array, of shape (..., n).
+        b (np.ndarray): Second array, of shape (..., n).
+        out (np.ndarray, optional): Array of shape (...) to write the result in. Defaults to None.
+
+    Returns:
+        np.ndarray: The distance between the arrays, of shape (...), in the dtype of the arrays.
+    """
+    assert a.shape == b.shape
+    distance = np.asarray(np.linalg.norm(a - b, axis=-1))
+    if out is None:
+        return distance
+    out[...] = distance
+    return out
+
+
+def goal_distance(
+    a: np.ndarray, b: np.ndarray, out: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """Compute the distance between two array, in float32. This function is vectorized.
+
     Args:
-        a (np.ndarray): First array.
-        b (np.ndarray): Second array.
+        a (np.ndarray): First array, of shape (..., n).
+        b (np.ndarray): Second array, of shape (..., n).
+        out (np.ndarray, optional): Array of shape (...) to write the result in. Defaults to None.
 
     Returns:
-        np.ndarray: The distance between the arrays.
+        np.ndarray: The distance between the arrays, as float32, of shape (...).
     """
     assert a.shape == b.shape
-    distance = np.linalg.norm(a - b, axis=-1)
-    return distance if isinstance(distance, np.ndarray) else np.array([distance])
+    diff = np.subtract(a, b, dtype=np.float32)
+    return np.sqrt(np.einsum("...i,...i->...", diff, diff), out=out)
 
 
-def angle_distance(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+def angle_distance(
+    a: np.ndarray, b: np.ndarray, out: Optional[np.ndarray] = None
+) -> np.ndarray:
     """Compute the geodesic distance between two array of angles. This function is vectorized.
 
     Args:
-        a (np.ndarray): First array.
-        b (np.ndarray): Second array.
+        a (np.ndarray): First array of quaternions, of shape (..., 4).
+        b (np.ndarray): Second array of quaternions, of shape (..., 4).
+        out (np.ndarray, optional): Array of shape (...) to write the result in. Defaults to None.
 
     Returns:
-        np.ndarray: The geodesic distance between the angles.
+        np.ndarray: The geodesic distance between the angles, as float32, of shape (...).
     """
     assert a.shape == b.shape
-    dist = 1 - np.inner(a, b) ** 2
-    return dist
+    inner = np.einsum(
+        "...i,...i->...",
+        a.astype(np.float32, copy=False),
+        b.astype(np.float32, copy=False),
+    )
+    return np.subtract(1, np.square(inner), out=out, dtype=np.float32)
+
+
+def batch_space(space: spaces.Space, n: int) -> spaces.Space:
+    """Create the space of a batch of `n` elements of `space`.
+
+    Args:
+        space (spaces.Space): The space of a single element. Box, Discrete and Dict are supported.
+        n (int): Batch size.
+
+    Returns:
+        spaces.Space: The batched space.
+    """
+    if isinstance(space, spaces.Box):
+        low = np.repeat(space.low[np.newaxis], n, axis=0)
+        high = np.repeat(space.high[np.newaxis], n, axis=0)
+        return spaces.Box(low=low, high=high, dtype=space.dtype)
+    elif isinstance(space, spaces.Discrete):
+        return spaces.MultiDiscrete(np.full((n,), space.n))
+    elif isinstance(space, spaces.Dict):
+        return spaces.Dict(
+            {key: batch_space(subspace, n) for key, subspace in space.spaces.items()}
+        )
+    else:
+        raise NotImplementedError("Unsupported space {}".format(space))
+
+
+class FrameStack:
+    """Ring buffer of the last frames, which are returned stacked without copying.
+
+    Each frame is stored twice, at slots `i` and `i + num_frames` of a buffer of `2 * num_frames` frames, so
+    that the last `num_frames` frames are always contiguous in the buffer and the stack is a view of it.
+
+    Args:
+        num_frames (int): Number of stacked frames.
+        frame_shape (tuple): Shape of a frame.
+        dtype (np.dtype): Data type of the frames.
+    """
+
+    def __init__(
+        self, num_frames: int, frame_shape: Tuple[int, ...], dtype: np.dtype
+    ) -> None:
+        assert num_frames > 0, "The number of frames must be positive."
+        self.num_frames = num_frames
+        self._buffer = np.zeros((2 * num_frames,) + tuple(frame_shape), dtype=dtype)
+        self._index = 0
+
+    @property
+    def next_frame(self) -> np.ndarray:
+        """Slot to write the next frame in, before calling `push`."""
+        return self._buffer[self._index + self.num_frames]
+
+    def push(self, reset: bool = False) -> np.ndarray:
+        """Add the frame written in `next_frame` to the stack.
+
+        Args:
+            reset (bool, optional): Whether to fill the whole stack with the frame, at the start of an episode.
+                Defaults to False.
+
+        Returns:
+            np.ndarray: The stack, from the oldest to the newest frame, of shape (num_frames, *frame_shape).
+                It is a view of the buffer, overwritten by the next calls.
+        """
+        frame = self.next_frame
+        if reset:
+            self._buffer[: self.num_frames] = frame
+            self._buffer[self.num_frames :] = self._buffer[0]
+        elif self.num_frames > 1:
+            self._buffer[self._index] = frame
+        stack = self._buffer[self._index + 1 : self._index + 1 + self.num_frames]
+        self._index = (self._index + 1) % self.num_frames
+        return stack
+
+
+class ObservationLayout:
+    """Named slices of a single preallocated float32 buffer.
+
+    The fields are laid out contiguously, in the given order, so that consecutive fields can be returned together
+    as a single view with `span`.
+
+    Args:
+        sizes (dict): The size of each field, by name, in the order of the buffer.
+        buffer (np.ndarray, optional): Float32 buffer of shape (size,) to write the fields in, for instance a row
+            of a batch buffer. Defaults to None (allocated).
+    """
+
+    def __init__(
+        self, sizes: Dict[str, int], buffer: Optional[np.ndarray] = None
+    ) -> None:
+        self.slices = {}
+        start = 0
+        for name, size in sizes.items():
+            self.slices[name] = slice(start, start + size)
+            start += size
+        self.size = start
+        self.bind(np.zeros(self.size, dtype=np.float32) if buffer is None else buffer)
+
+    def bind(self, buffer: np.ndarray) -> None:
+        """Write the fields in another buffer. The views previously returned are no longer updated.
+
+        Args:
+            buffer (np.ndarray): Float32 buffer of shape (size,).
+        """
+        assert buffer.shape == (self.size,), "Expected a buffer of shape {}".format(
+            (self.size,)
+        )
+        assert buffer.dtype == np.float32, "Expected a float32 buffer."
+        self.buffer = buffer
+        self.views = {name: buffer[s] for name, s in self.slices.items()}
+
+    def span(self, first: str, last: str) -> slice:
+        """Slice of the buffer covering the fields from `first` to `last`, included.
+
+        Args:
+            first (str): Name of the first field.
+            last (str): Name of the last field.
+
+        Returns:
+            slice: The slice.
+        """
+        return slice(self.slices[first].start, self.slices[last].stop)
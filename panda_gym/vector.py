@@ -0,0 +1,310 @@
+import multiprocessing as mp
+import traceback
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import gym
+import numpy as np
+from gym import spaces
+
+from panda_gym.envs.core import BatchedRobotTaskEnv, RobotTaskEnv
+from panda_gym.shared_memory import as_array, shared_array
+from panda_gym.utils import batch_space
+
+
+def _action_dtype(action_space: spaces.Space) -> np.dtype:
+    if isinstance(action_space, spaces.Discrete):
+        return np.dtype(np.int64)
+    return np.dtype(action_space.dtype)
+
+
+def _worker(
+    index: int,
+    env_fn: Callable[[], gym.Env],
+    pipe: Any,
+    parent_pipe: Any,
+    shared_buffers: Dict[str, Any],
+) -> None:
+    """Worker loop. Steps one environment and writes the results in its row of the shared buffers.
+
+    The pipe only carries the command names; every array goes through the shared buffers.
+    """
+    parent_pipe.close()
+    buffers = {key: as_array(shared) for key, shared in shared_buffers.items()}
+    env = None
+    try:
+        env = env_fn()
+        while True:
+            command, data = pipe.recv()
+            if command == "reset":
+                observation = env.reset(seed=data)
+                for key, value in observation.items():
+                    buffers[key][index] = value
+                pipe.send((True, None))
+            elif command == "step":
+                action = buffers["actions"][index]
+                if isinstance(env.action_space, spaces.Discrete):
+                    action = int(action)
+                observation, reward, done, info = env.step(action)
+                buffers["rewards"][index] = reward
+                buffers["dones"][index] = done
+                buffers["is_success"][index] = info.get("is_success", False)
+                buffers["truncated"][index] = info.get("TimeLimit.truncated", False)
+                if done:
+                    for key, value in observation.items():
+                        buffers["final_" + key][index] = value
+                    observation = env.reset()
+                for key, value in observation.items():
+                    buffers[key][index] = value
+                pipe.send((True, None))
+            elif command == "close":
+                pipe.send((True, None))
+                break
+            else:
+                raise RuntimeError("Received unknown command `{}`.".format(command))
+    except (KeyboardInterrupt, Exception):
+        pipe.send((False, traceback.format_exc()))
+    finally:
+        if env is not None:
+            env.close()
+        pipe.close()
+
+
+class SharedMemoryVectorEnv:
+    """Run several environments in parallel, each in its own worker process.
+
+    Unlike pipe-based vector environments, the actions and the observations are exchanged through
+    preallocated shared memory buffers: the pipes only carry the command names. The batch API mirrors
+    `RobotTaskEnv`: `reset` returns the batched observation dict and `step` returns
+    `(observation, reward, done, info)`, where every entry has a leading axis of size `num_envs`.
+
+    Environments that are done are automatically reset. In that case, the observation returned is the
+    first observation of the new episode, and the last observation of the finished episode is stored
+    in `info["final_observation"]`. As in the vector environments of gym, the boolean mask
+    `info["_final_observation"]` tells which rows are valid: the rows of the environments that are not
+    done hold stale data.
+
+    Args:
+        env_fns (list of callable): Functions creating the environments. With the "spawn" start method,
+            they must be picklable (use `functools.partial` rather than lambdas).
+        context (str, optional): Multiprocessing start method, "fork", "spawn" or "forkserver". Defaults
+            to the default start method of the platform.
+        copy (bool, optional): Whether to return copies of the shared buffers. If False, the returned
+            arrays are views that are overwritten at the next `reset` or `step`. Defaults to True.
+        from_template (bool, optional): Whether to build the environment once, in the main process, and give
+            each worker a copy of it instead of building one environment per worker. Building the scene (mainly
+            loading the URDF meshes) dominates the construction time, while the copy costs a process fork. All
+            the `env_fns` must then create identical environments, only the first one is called. Requires the
+            "fork" start method. Defaults to False.
+    """
+
+    def __init__(
+        self,
+        env_fns: Sequence[Callable[[], gym.Env]],
+        context: Optional[str] = None,
+        copy: bool = True,
+        from_template: bool = False,
+    ) -> None:
+        self.num_envs = len(env_fns)
+        self.copy = copy
+        # Get the spaces from a dummy environment, as gym.vector.AsyncVectorEnv does
+        dummy_env = env_fns[0]()
+        self.single_observation_space = dummy_env.observation_space
+        self.single_action_space = dummy_env.action_space
+        self.metadata = dummy_env.metadata
+        ctx = mp.get_context(context)
+        if from_template:
+            if ctx.get_start_method() != "fork":
+                raise ValueError("from_template requires the 'fork' start method.")
+            # The forked workers inherit a copy of the environment, scene included
+            env_fns = [partial(_get_template, dummy_env)] * self.num_envs
+            # The copies also share the same random number generator, draw a different seed for each one
+            seeds = np.random.SeedSequence().generate_state(self.num_envs)
+            self._first_reset_seeds = [int(seed) for seed in seeds]
+        else:
+            dummy_env.close()
+            del dummy_env
+            self._first_reset_seeds = None
+        self.observation_space = batch_space(
+            self.single_observation_space, self.num_envs
+        )
+        self.action_space = batch_space(self.single_action_space, self.num_envs)
+
+        self._observation_keys = tuple(self.single_observation_space.spaces)
+        shared_buffers = {}
+        for key, space in self.single_observation_space.spaces.items():
+            shape = (self.num_envs,) + space.shape
+            shared_buffers[key] = shared_array(ctx, shape, space.dtype)
+            shared_buffers["final_" + key] = shared_array(ctx, shape, space.dtype)
+        shared_buffers["actions"] = shared_array(
+            ctx,
+            (self.num_envs,) + self.single_action_space.shape,
+            _action_dtype(self.single_action_space),
+        )
+        shared_buffers["rewards"] = shared_array(ctx, (self.num_envs,), np.float32)
+        for key in ["dones", "is_success", "truncated"]:
+            shared_buffers[key] = shared_array(ctx, (self.num_envs,), np.bool_)
+        self._buffers = {
+            key: as_array(shared) for key, shared in shared_buffers.items()
+        }
+
+        self._parent_pipes, self._processes = [], []
+        for index, env_fn in enumerate(env_fns):
+            parent_pipe, child_pipe = ctx.Pipe()
+            process = ctx.Process(
+                target=_worker,
+                name="Worker<{}>-{}".format(type(self).__name__, index),
+                args=(index, env_fn, child_pipe, parent_pipe, shared_buffers),
+                daemon=True,
+            )
+            self._parent_pipes.append(parent_pipe)
+            self._processes.append(process)
+            process.start()
+            child_pipe.close()
+        if from_template:
+            dummy_env.close()
+        self.closed = False
+
+    def _receive(self) -> None:
+        """Wait for all the workers and raise if one of them failed."""
+        results = [pipe.recv() for pipe in self._parent_pipes]
+        errors = [message for success, message in results if not success]
+        if errors:
+            self.close(terminate=True)
+            raise RuntimeError("A worker raised an exception:\n{}".format(errors[0]))
+
+    def _get_obs(self, prefix: str = "") -> Dict[str, np.ndarray]:
+        keys = self._observation_keys
+        if self.copy:
+            return {key: self._buffers[prefix + key].copy() for key in keys}
+        return {key: self._buffers[prefix + key] for key in keys}
+
+    def reset(
+        self, seed: Optional[Union[int, List[int]]] = None
+    ) -> Dict[str, np.ndarray]:
+        """Reset all the environments.
+
+        Args:
+            seed (int or list of int, optional): Seed(s). If an int is given, the environment `i` is seeded
+                with `seed + i`. Defaults to None.
+
+        Returns:
+            dict: The batched observation.
+        """
+        if seed is None and self._first_reset_seeds is not None:
+            seeds = self._first_reset_seeds
+        elif seed is None or isinstance(seed, int):
+            seeds = [None if seed is None else seed + i for i in range(self.num_envs)]
+        else:
+            seeds = list(seed)
+            assert len(seeds) == self.num_envs, "Expected one seed per environment."
+        for pipe, env_seed in zip(self._parent_pipes, seeds):
+            pipe.send(("reset", env_seed))
+        self._receive()
+        self._first_reset_seeds = None
+        return self._get_obs()
+
+    def step(
+        self, actions: np.ndarray
+    ) -> Tuple[Dict[str, np.ndarray], np.ndarray, np.ndarray, Dict[str, Any]]:
+        """Step all the environments.
+
+        Args:
+            actions (np.ndarray): The actions, with a leading axis of size `num_envs`.
+
+        Returns:
+            tuple: The batched observation, rewards, dones and info.
+        """
+        self._buffers["actions"][:] = actions
+        for pipe in self._parent_pipes:
+            pipe.send(("step", None))
+        self._receive()
+        rewards, dones = self._buffers["rewards"], self._buffers["dones"]
+        info = {
+            "is_success": self._buffers["is_success"].copy(),
+            "TimeLimit.truncated": self._buffers["truncated"].copy(),
+            "final_observation": self._get_obs(prefix="final_"),
+            "_final_observation": dones.copy(),
+        }
+        return self._get_obs(), rewards.copy(), dones.copy(), info
+
+    def close(self, terminate: bool = False) -> None:
+        """Close the workers.
+
+        Args:
+            terminate (bool, optional): Whether to terminate the processes instead of asking them to
+                stop. Defaults to False.
+        """
+        if self.closed:
+            return
+        if not terminate:
+            for pipe in self._parent_pipes:
+                pipe.send(("close", None))
+            for pipe in self._parent_pipes:
+                pipe.recv()
+        for process in self._processes:
+            if terminate and process.is_alive():
+                process.terminate()
+            process.join()
+        for pipe in self._parent_pipes:
+            pipe.close()
+        self.closed = True
+
+    def __del__(self) -> None:
+        if not getattr(self, "closed", True):
+            self.close(terminate=True)
+
+
+def _get_template(env: gym.Env) -> gym.Env:
+    return env
+
+
+def make_vector_env(
+    env_id: str,
+    num_envs: int,
+    context: Optional[str] = None,
+    copy: bool = True,
+    from_template: bool = False,
+    **kwargs: Any
+) -> SharedMemoryVectorEnv:
+    """Create a vector of environments running in worker processes.
+
+    Args:
+        env_id (str): The environment id, e.g. "PandaPickAndPlace-v3".
+        num_envs (int): The number of environments.
+        context (str, optional): Multiprocessing start method. Defaults to the platform default.
+        copy (bool, optional): Whether to return copies of the shared buffers. Defaults to True.
+        from_template (bool, optional): Whether to build the environment once and fork it into the workers.
+            See `SharedMemoryVectorEnv`. Defaults to False.
+        **kwargs: Passed to `gym.make`.
+
+    Returns:
+        SharedMemoryVectorEnv: The vector environment.
+    """
+    env_fns = [partial(gym.make, env_id, **kwargs) for _ in range(num_envs)]
+    return SharedMemoryVectorEnv(
+        env_fns, context=context, copy=copy, from_template=from_template
+    )
+
+
+def make_batched_env(env_id: str, num_envs: int, **kwargs: Any) -> BatchedRobotTaskEnv:
+    """Create a batch of environments stepped in lockstep in the current process.
+
+    This is cheaper than `make_vector_env` for small scenes, where the cost of inter-process communication
+    outweighs the cost of stepping the simulations sequentially.
+
+    Args:
+        env_id (str): The environment id, e.g. "PandaReach-v3".
+        num_envs (int): The number of environments.
+        **kwargs: Passed to `gym.make`.
+
+    Returns:
+        BatchedRobotTaskEnv: The batched environment.
+    """
+    env_fns = [partial(_make_unwrapped, env_id, **kwargs) for _ in range(num_envs)]
+    max_episode_steps = gym.spec(env_id).max_episode_steps
+    return BatchedRobotTaskEnv(env_fns, max_episode_steps=max_episode_steps)
+
+
+def _make_unwrapped(env_id: str, **kwargs: Any) -> RobotTaskEnv:
+    return gym.make(env_id, **kwargs).unwrapped
@@ -21,6 +21,11 @@ setup(
     package_data={"panda_gym": ["version.txt"]},
     version=__version__,
     install_requires=["gym", "pybullet", "numpy", "scipy"],
+    entry_points={
+        "console_scripts": [
+            "panda-gym-benchmark=panda_gym.benchmarks.suite:main",
+        ],
+    },
     extras_require={
         "develop": [
             "pytest-cov",
@@ -30,6 +35,7 @@ setup(
             "sphinx",
             "sphinx-rtd-theme",
         ],
+        "numba": ["numba"],
     },
     classifiers=[
         "License :: OSI Approved :: MIT License",
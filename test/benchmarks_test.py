@@ -0,0 +1,58 @@
+import json
+
+from panda_gym.benchmarks.suite import main, registered_env_ids, run
+
+
+def test_registered_env_ids():
+    env_ids = registered_env_ids()
+    assert len(env_ids) == 96
+    assert "PandaReachJointsDenseDiscrete-v4" in env_ids
+
+
+def test_run():
+    results = run(
+        env_ids=["PandaPush-v3", "PandaStackJoints*Discrete-v3"],
+        num_steps=5,
+        num_resets=2,
+        resolutions=[(32, 48)],
+        num_frames=1,
+        reward_batch_size=16,
+        workers=[1, 2],
+        num_vector_steps=2,
+    )
+    assert sorted(results["envs"]) == [
+        "PandaPush-v3",
+        "PandaStackJointsDenseDiscrete-v3",
+        "PandaStackJointsDiscrete-v3",
+    ]
+    for result in results["envs"].values():
+        assert set(result["render_fps"]) == {"32x48"}
+        assert result["steps_per_sec"] > 0 and result["reward_per_sec"] > 0
+    assert [result["num_envs"] for result in results["vector_scaling"]] == [1, 2]
+    assert results["metadata"]["arguments"]["num_steps"] == 5
+    json.dumps(results)
+
+
+def test_main(tmp_path):
+    path = str(tmp_path / "results.json")
+    args = ["--env-ids", "PandaFlip-v3", "--steps", "2", "--resets", "1"]
+    args += ["--resolutions", "16x16", "--frames", "1", "--no-vector", "--output", path]
+    main(args)
+    with open(path) as file:
+        results = json.load(file)
+    assert list(results["envs"]) == ["PandaFlip-v3"]
+    assert results["vector_scaling"] == []
+
+
+def test_physics_benchmark():
+    from panda_gym.benchmarks.physics import run as run_physics
+
+    results = run_physics(["Reach", "Push"], ["accurate", "fast"], 1, 5)
+    assert results["Push"]["accurate"]["ee_error"] == 0.0
+    assert results["Push"]["accurate"]["success_agreement"] == 1.0
+    assert set(results["Reach"]["fast"]) == {
+        "steps_per_sec",
+        "ee_error",
+        "goal_error",
+        "success_agreement",
+    }
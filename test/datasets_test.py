@@ -0,0 +1,57 @@
+import gym
+import numpy as np
+import pytest
+
+import panda_gym
+from panda_gym.datasets import Dataset, RecordDataset
+
+
+def record(directory, num_episodes, **kwargs):
+    env = RecordDataset(gym.make("PandaPush-v3"), str(directory), **kwargs)
+    env.action_space.seed(0)
+    observations, actions = [], []
+    for episode in range(num_episodes):
+        observation, done = env.reset(seed=episode), False
+        observations.append(observation["observation"])
+        while not done:
+            action = env.action_space.sample()
+            observation, _, done, _ = env.step(action)
+            observations.append(observation["observation"])
+            actions.append(action)
+        actions.append(np.zeros(3))  # the last step has no action
+    env.close()
+    return np.array(observations), np.array(actions)
+
+
+def test_dataset(tmp_path):
+    observations, actions = record(tmp_path, 3, shard_size=64)
+    dataset = Dataset(str(tmp_path))
+    assert len(dataset) == len(observations) == 153
+    assert dataset.num_episodes == 3
+    assert len(list(tmp_path.glob("shard_*"))) == 3
+    batch = dataset.get_batch(np.arange(len(dataset)))
+    assert np.array_equal(batch["observation"], observations)
+    assert np.array_equal(batch["action"], actions.astype(np.float32))
+    assert np.array_equal(dataset[70]["observation"], observations[70])
+    # the second episode spans two shards
+    episode = dataset.get_episode(1)
+    assert np.array_equal(episode["observation"], observations[51:102])
+    assert episode["is_first"][0] and episode["is_last"][-1]
+    assert episode["is_first"].sum() == episode["is_last"].sum() == 1
+    with pytest.raises(IndexError):
+        dataset[153]
+    with pytest.raises(FileExistsError):
+        record(tmp_path, 1)
+
+
+def test_dataset_states(tmp_path):
+    record(tmp_path, 1, save_states=True)
+    dataset = Dataset(str(tmp_path))
+    env = gym.make("PandaPush-v3")
+    env.reset()
+    env.unwrapped.from_bytes(dataset.get_state(20))
+    assert np.allclose(
+        env.unwrapped._get_obs()["observation"], dataset[20]["observation"]
+    )
+    dataset.close()
+    env.close()
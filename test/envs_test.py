@@ -1,4 +1,6 @@
 import gym
+import numpy as np
+import pytest
 
 import panda_gym
 
@@ -132,3 +134,189 @@ def test_dense_stack_joints():
 def test_dense_flip_joints():
     env = gym.make("PandaFlipJointsDense-v3")
     run_env(env)
+
+
+@pytest.mark.parametrize("env_id", ["PandaReach-v3", "PandaStack-v3"])
+def test_observation_mode(env_id):
+    copy_env = gym.make(env_id)
+    view_env = gym.make(env_id, observation_mode="view")
+    copy_observation = copy_env.reset(seed=0)
+    view_observation = view_env.reset(seed=0)
+    for _ in range(3):
+        action = copy_env.action_space.sample()
+        saved = {key: value.copy() for key, value in copy_observation.items()}
+        next_copy_observation, _, _, _ = copy_env.step(action)
+        next_view_observation, _, _, _ = view_env.step(action)
+        for key, value in next_copy_observation.items():
+            assert value.dtype == np.float32
+            assert np.array_equal(value, next_view_observation[key])
+            # the copies are not overwritten by the next step, the views are
+            assert np.array_equal(copy_observation[key], saved[key])
+            assert np.shares_memory(view_observation[key], next_view_observation[key])
+        copy_observation = next_copy_observation
+        view_observation = next_view_observation
+    copy_env.close()
+    view_env.close()
+
+
+@pytest.mark.parametrize("physics_profile", ["accurate", "fastest"])
+def test_physics_profile(physics_profile):
+    env = gym.make("PandaPickAndPlace-v3", physics_profile=physics_profile)
+    assert env.unwrapped.sim.dt == pytest.approx(0.04)
+    run_env(env)
+
+
+def test_default_physics_profile():
+    from panda_gym.physics import PhysicsProfile
+
+    def push(physics_profile):
+        """Push the object, so that the contacts matter."""
+        env = gym.make("PandaPush-v3", physics_profile=physics_profile)
+        unwrapped = env.unwrapped
+        env.reset(seed=0)
+        observations = []
+        for _ in range(50):
+            target = unwrapped.sim.get_base_position("object")
+            action = 10 * (target - unwrapped.robot.get_ee_position())
+            observation, _, _, _ = env.step(np.clip(action, -1.0, 1.0))
+            observations.append(observation["observation"])
+        env.close()
+        return np.array(observations)
+
+    # the parameters before the physics profiles: only the timestep and the number of substeps were set
+    reference = push(PhysicsProfile(timestep=1 / 500, n_substeps=20))
+    assert np.array_equal(push("default"), reference)
+    # the sorted overlapping pairs change the trajectory
+    assert not np.array_equal(push("deterministic"), reference)
+
+
+@pytest.mark.parametrize("ik_backend", ["analytic", "dls"])
+def test_ik_backend(ik_backend):
+    from panda_gym.kinematics import PandaKinematics
+
+    run_env(gym.make("PandaPickAndPlace-v3", ik_backend=ik_backend))
+    env = gym.make("PandaPickAndPlace-v3", ik_backend=ik_backend)
+    env.reset(seed=0)
+    robot = env.unwrapped.robot
+    kinematics = PandaKinematics(np.array([-0.6, 0.0, 0.0]))
+    target_position = robot.get_ee_position() + np.array([0.02, -0.02, 0.01])
+    joint_angles = robot.inverse_kinematics(
+        robot.ee_link, target_position, robot.ee_orientation
+    )
+    assert joint_angles.shape == (9,)
+    position, _ = kinematics.forward(joint_angles[:7])
+    assert np.allclose(position, target_position, atol=1e-3)
+    env.close()
+
+
+def test_ee_velocity_control():
+    run_env(gym.make("PandaPushEEVelocity-v3"))
+    env = gym.make("PandaPickAndPlaceEEVelocity-v3")
+    assert env.action_space.shape == (4,)
+    env.reset(seed=0)
+    robot = env.unwrapped.robot
+    for axis in range(3):
+        ee_position = robot.get_ee_position()
+        action = np.zeros(4)
+        action[axis] = 1.0
+        for _ in range(3):
+            env.step(action)
+        displacement = robot.get_ee_position() - ee_position
+        assert displacement[axis] > 0.05
+        # the end-effector keeps pointing down
+        assert np.allclose(
+            robot.get_link_states([robot.ee_link])[0, 3:7],
+            robot.ee_orientation,
+            atol=0.02,
+        )
+    env.close()
+    env = gym.make("PandaReach-v3", control_type="ee_velocity_6d")
+    assert env.action_space.shape == (6,)
+    run_env(env)
+
+
+@pytest.mark.parametrize("env_id", ["PandaReach-v3", "PandaReachJoints-v4"])
+def test_kinematic_reach(env_id):
+    from panda_gym.profiling import StepProfiler
+
+    env = gym.make(env_id, kinematic=True)
+    with StepProfiler(env, count_api_calls=True) as profiler:
+        run_env(env)
+    assert "stepSimulation" not in profiler.api_calls
+    # the observed end-effector follows the joints, with the velocity of the step
+    env = gym.make(env_id, kinematic=True)
+    unwrapped = env.unwrapped
+    observation = env.reset(seed=0)
+    for _ in range(5):
+        position = observation["observation"][:3].copy()
+        observation, _, _, _ = env.step(env.action_space.sample())
+        assert np.allclose(
+            observation["observation"][:3], unwrapped.robot.get_ee_position(), atol=1e-6
+        )
+        displacement = observation["observation"][:3] - position
+        velocity = observation["observation"][3:6]
+        assert np.allclose(velocity * unwrapped.sim.dt, displacement, atol=5e-3)
+    env.close()
+
+
+def test_kinematic_reach_tolerance():
+    dynamic_env = gym.make("PandaReach-v3").unwrapped
+    kinematic_env = gym.make("PandaReach-v3", kinematic=True).unwrapped
+    rng = np.random.default_rng(0)
+    errors = []
+    for episode in range(10):
+        dynamic_env.reset(seed=episode)
+        kinematic_env.reset(seed=episode)
+        for _ in range(50):
+            # from the same joint angles, compare the end-effector after the same action
+            angles = dynamic_env.robot.get_joint_angles(dynamic_env.robot.joint_indices)
+            kinematic_env.robot.set_joint_angles(angles)
+            action = rng.uniform(-1.0, 1.0, 3).astype(np.float32)
+            dynamic_observation, _, _, _ = dynamic_env.step(action)
+            kinematic_observation, _, _, _ = kinematic_env.step(action)
+            errors.append(
+                np.linalg.norm(
+                    dynamic_observation["achieved_goal"]
+                    - kinematic_observation["achieved_goal"]
+                )
+            )
+    # the tolerance given in the documentation, 2.5 cm on average and 5.6 cm at the 95th percentile, with a
+    # margin of 20% for the sampling of the 500 steps
+    assert np.mean(errors) < 1.2 * 0.025
+    assert np.percentile(errors, 95) < 1.2 * 0.056
+    # the joints reach their target in one step
+    robot = kinematic_env.robot
+    target_angles = robot.get_joint_angles(robot.joint_indices) + 0.1
+    kinematic_env.sim.control_joints(
+        "panda", robot.joint_indices, target_angles, robot.joint_forces
+    )
+    assert np.allclose(robot.get_joint_angles(robot.joint_indices), target_angles)
+    dynamic_env.close()
+    kinematic_env.close()
+
+
+def test_kinematic_reach_success():
+    def scripted_reacher(kinematic):
+        env = gym.make("PandaReach-v3", kinematic=kinematic)
+        successes, lengths = [], []
+        for episode in range(50):
+            observation = env.reset(seed=episode)
+            for length in range(1, 51):
+                # move the end-effector straight towards the goal
+                displacement = (
+                    observation["desired_goal"] - observation["achieved_goal"]
+                )
+                action = np.clip(displacement / 0.05, -1.0, 1.0)
+                observation, _, _, info = env.step(action)
+                if info["is_success"]:
+                    break
+            successes.append(info["is_success"])
+            lengths.append(length)
+        env.close()
+        return np.mean(successes), np.mean(lengths)
+
+    # the documentation gives 100% in both modes, in 2.2 and 2.6 steps on average
+    kinematic_success, kinematic_length = scripted_reacher(kinematic=True)
+    dynamic_success, dynamic_length = scripted_reacher(kinematic=False)
+    assert kinematic_success == dynamic_success == 1.0
+    assert kinematic_length <= dynamic_length < 3.0
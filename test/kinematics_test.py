@@ -0,0 +1,171 @@
+import numpy as np
+import pytest
+
+from panda_gym.kinematics import (
+    PANDA_LOWER_LIMITS,
+    PANDA_UPPER_LIMITS,
+    AnalyticPandaIK,
+    DampedLeastSquaresIK,
+    PandaKinematics,
+    available_ik_backends,
+    damped_least_squares,
+    make_ik_solver,
+    orientation_error,
+    quaternion_error,
+    quaternion_to_matrix,
+)
+from panda_gym.pybullet import PyBullet
+
+BASE_POSITION = np.array([-0.6, 0.0, 0.0])
+NEUTRAL = np.array([0.00, 0.41, 0.00, -1.85, 0.00, 2.26, 0.79])
+
+
+def _make_sim():
+    sim = PyBullet()
+    sim.loadURDF(
+        body_name="panda",
+        fileName="franka_panda/panda.urdf",
+        basePosition=BASE_POSITION,
+        useFixedBase=True,
+    )
+    return sim
+
+
+def _random_angles(rng, batch_size):
+    return rng.uniform(PANDA_LOWER_LIMITS, PANDA_UPPER_LIMITS, (batch_size, 7))
+
+
+def test_forward_kinematics():
+    sim = _make_sim()
+    body = sim._bodies_idx["panda"]
+    kinematics = PandaKinematics(BASE_POSITION)
+    joint_angles = _random_angles(np.random.default_rng(0), 10)
+    positions, rotations = kinematics.forward(joint_angles)
+    assert positions.shape == (10, 3) and rotations.shape == (10, 3, 3)
+    for angles, position, rotation in zip(joint_angles, positions, rotations):
+        sim.set_joint_angles("panda", np.arange(7), angles)
+        state = sim.physics_client.getLinkState(body, 11, computeForwardKinematics=1)
+        assert np.allclose(position, state[4], atol=1e-6)
+        assert np.allclose(rotation, quaternion_to_matrix(state[5]), atol=1e-6)
+    sim.close()
+
+
+def test_jacobian():
+    sim = _make_sim()
+    kinematics = PandaKinematics(BASE_POSITION)
+    angles = NEUTRAL + 0.1
+    sim.set_joint_angles("panda", np.arange(7), angles)
+    assert np.allclose(
+        kinematics.jacobian(angles), sim.get_jacobian("panda", 11)[:, :7], atol=1e-6
+    )
+    sim.close()
+
+
+def test_quaternion_error():
+    rng = np.random.default_rng(0)
+    quaternions = rng.normal(size=(2, 16, 4))
+    quaternions /= np.linalg.norm(quaternions, axis=-1, keepdims=True)
+    errors = quaternion_error(quaternions[0], quaternions[1])
+    expected = orientation_error(
+        quaternion_to_matrix(quaternions[0]), quaternion_to_matrix(quaternions[1])
+    )
+    assert errors.shape == (16, 3)
+    assert np.allclose(errors, expected)
+    assert np.allclose(
+        quaternion_error(quaternions[0, 0], quaternions[1, 0]), expected[0]
+    )
+
+
+def test_damped_least_squares():
+    kinematics = PandaKinematics(BASE_POSITION)
+    jacobian = kinematics.jacobian(NEUTRAL)
+    twist = np.array([0.001, -0.002, 0.001, 0.0, 0.0, 0.0])
+    step = damped_least_squares(jacobian, twist, damping=1e-3)
+    assert step.shape == (7,)
+    assert np.allclose(jacobian @ step, twist, atol=1e-5)
+    # the damping shortens the step
+    damped_step = damped_least_squares(jacobian, twist, damping=1.0)
+    assert np.linalg.norm(damped_step) < np.linalg.norm(step)
+
+
+def _targets(rng, batch_size):
+    """Reachable targets, near the current joint angles."""
+    kinematics = PandaKinematics(BASE_POSITION)
+    joint_angles = NEUTRAL + rng.normal(0.0, 0.1, (batch_size, 7))
+    target_angles = joint_angles + rng.normal(0.0, 0.05, (batch_size, 7))
+    positions, rotations = kinematics.forward(target_angles)
+    # quaternions (x, y, z, w) of the rotation matrices, away from w = 0
+    w = 0.5 * np.sqrt(1.0 + np.trace(rotations, axis1=-2, axis2=-1))
+    x = (rotations[:, 2, 1] - rotations[:, 1, 2]) / (4 * w)
+    y = (rotations[:, 0, 2] - rotations[:, 2, 0]) / (4 * w)
+    z = (rotations[:, 1, 0] - rotations[:, 0, 1]) / (4 * w)
+    orientations = np.stack([x, y, z, w], axis=-1)
+    return positions, orientations, joint_angles
+
+
+@pytest.mark.parametrize(
+    "solver",
+    [
+        AnalyticPandaIK(BASE_POSITION),
+        DampedLeastSquaresIK(BASE_POSITION, max_iterations=50),
+    ],
+)
+def test_ik_solver(solver):
+    rng = np.random.default_rng(1)
+    positions, orientations, joint_angles = _targets(rng, 20)
+    solutions = solver.solve(positions, orientations, joint_angles)
+    assert solutions.shape == (20, 7)
+    assert np.all(solutions >= PANDA_LOWER_LIMITS) and np.all(
+        solutions <= PANDA_UPPER_LIMITS
+    )
+    achieved_positions, achieved_rotations = solver.kinematics.forward(solutions)
+    assert np.allclose(achieved_positions, positions, atol=1e-3)
+    assert np.allclose(
+        achieved_rotations, quaternion_to_matrix(orientations), atol=1e-3
+    )
+    # the solutions are near the current joint angles
+    assert np.max(np.abs(solutions - joint_angles)) < 0.5
+    # position only
+    solutions = solver.solve(positions, None, joint_angles)
+    achieved_positions, _ = solver.kinematics.forward(solutions)
+    assert np.allclose(achieved_positions, positions, atol=1e-3)
+
+
+def test_analytic_ik_exact():
+    positions, orientations, joint_angles = _targets(np.random.default_rng(2), 20)
+    solver = AnalyticPandaIK(BASE_POSITION)
+    solutions = solver.solve(positions, orientations, joint_angles)
+    achieved_positions, achieved_rotations = solver.kinematics.forward(solutions)
+    assert np.allclose(achieved_positions, positions, atol=1e-9)
+    assert np.allclose(
+        achieved_rotations, quaternion_to_matrix(orientations), atol=1e-9
+    )
+    # with a fixed last joint, the solutions can be far from the current joint angles
+    solver = AnalyticPandaIK(BASE_POSITION, last_joint_angle=0.8, max_joint_step=np.inf)
+    solutions = solver.solve(positions, orientations, joint_angles)
+    assert np.allclose(solutions[:, 6], 0.8)
+    achieved_positions, _ = solver.kinematics.forward(solutions)
+    assert np.allclose(achieved_positions, positions, atol=1e-9)
+
+
+def test_analytic_ik_out_of_reach():
+    solver = AnalyticPandaIK(BASE_POSITION)
+    position = np.array(
+        [[2.0, 0.0, 0.5]]
+    )  # out of reach: falls back to damped least squares
+    solution = solver.solve(position, np.array([[1.0, 0.0, 0.0, 0.0]]), NEUTRAL[None])
+    assert np.all(np.isfinite(solution))
+    assert np.all(solution >= PANDA_LOWER_LIMITS) and np.all(
+        solution <= PANDA_UPPER_LIMITS
+    )
+
+
+def test_make_ik_solver():
+    assert available_ik_backends() == ["pybullet", "analytic", "dls"]
+    assert make_ik_solver("pybullet", BASE_POSITION) is None
+    solver = make_ik_solver("dls", BASE_POSITION)
+    assert isinstance(solver, DampedLeastSquaresIK)
+    assert np.allclose(solver.kinematics.base_position, BASE_POSITION)
+    assert make_ik_solver(solver, BASE_POSITION) is solver
+    with pytest.raises(ValueError):
+        make_ik_solver("unknown", BASE_POSITION)
@@ -0,0 +1,49 @@
+import gym
+import pybullet_utils.bullet_client as bc
+
+import panda_gym
+from panda_gym.profiling import StepProfiler
+
+
+def test_profiler():
+    env = gym.make("PandaPush-v3")
+    calls = []
+    with StepProfiler(
+        env, count_api_calls=True, callback=lambda *args: calls.append(args)
+    ) as profiler:
+        env.reset(seed=0)
+        for _ in range(5):
+            env.step(env.action_space.sample())
+    stats = profiler.stats()
+    assert stats["step"]["calls"] == 5 and stats["reset"]["calls"] == 1
+    for phase in ["set_action", "sim.step", "compute_reward"]:
+        assert stats[phase]["calls"] == 5
+    assert stats["get_obs"]["calls"] == 6 and stats["is_success"]["calls"] == 6
+    assert stats["sim.step"]["api_calls"] == 5 * env.unwrapped.sim.n_substeps
+    assert profiler.api_calls["calculateInverseKinematics"] == 5
+    assert [name for name, _ in calls] == ["reset"] + ["step"] * 5
+    assert set(calls[-1][1]) == {
+        "step",
+        "set_action",
+        "sim.step",
+        "get_obs",
+        "is_success",
+        "compute_reward",
+    }
+    assert "sim.step" in profiler.report()
+    # detached, the env is restored
+    unwrapped = env.unwrapped
+    assert "step" not in vars(unwrapped) and "set_action" not in vars(unwrapped.robot)
+    assert isinstance(unwrapped.sim.physics_client, bc.BulletClient)
+    env.step(env.action_space.sample())
+    assert profiler.stats()["step"]["calls"] == 5
+    env.close()
+
+
+def test_profiler_render():
+    env = gym.make("PandaReach-v3", pixel_observations=["rgb"])
+    with StepProfiler(env) as profiler:
+        env.reset()
+        env.step(env.action_space.sample())
+    assert profiler.stats()["render"]["calls"] == 2
+    env.close()
@@ -45,6 +45,37 @@ def test_create_box():
     pybullet.close()
 
 
+def test_shape_cache():
+    from panda_gym.pybullet import PyBullet
+
+    pybullet = PyBullet()
+    for i in range(4):
+        pybullet.create_box("box{}".format(i), np.ones(3), 1.0, np.zeros(3), np.ones(4))
+    pybullet.create_box("other_box", np.ones(3), 1.0, np.zeros(3), np.zeros(4))
+    # one collision shape, and one visual shape per color
+    assert len(pybullet._shape_cache) == 3
+    pybullet.close()
+
+
+def test_create_bodies():
+    from panda_gym.pybullet import PyBullet
+
+    pybullet = PyBullet()
+    positions = np.array([[0.0, 0.0, 1.0], [0.0, 1.0, 1.0], [1.0, 0.0, 1.0]])
+    pybullet.create_bodies(
+        ["sphere0", "sphere1", "sphere2"],
+        pybullet.physics_client.GEOM_SPHERE,
+        positions,
+        mass=1.0,
+        lateral_friction=0.5,
+        visual_kwargs={"radius": 0.1},
+        collision_kwargs={"radius": 0.1},
+    )
+    for i, position in enumerate(positions):
+        assert np.allclose(pybullet.get_base_position("sphere%d" % i), position)
+    pybullet.close()
+
+
 def test_get_base_position():
     from panda_gym.pybullet import PyBullet
 
@@ -286,6 +317,30 @@ def test_inverse_kinematics():
     pybullet.close()
 
 
+def test_get_jacobian():
+    from panda_gym.pybullet import PyBullet
+
+    pybullet = PyBullet()
+    pybullet.loadURDF(
+        body_name="panda",
+        fileName="franka_panda/panda.urdf",
+        basePosition=[0.0, 0.0, 0.0],
+        useFixedBase=True,
+    )
+    joint_angles = np.array([0.0, 0.4, 0.0, -1.8, 0.0, 2.2, 0.8, 0.01, 0.01])
+    pybullet.set_joint_angles("panda", [0, 1, 2, 3, 4, 5, 6, 9, 10], joint_angles)
+    jacobian = pybullet.get_jacobian("panda", 11)
+    assert jacobian.shape == (6, 9)
+    # the first joint rotates the arm about the z axis
+    position = pybullet.get_link_position("panda", 11)
+    assert np.allclose(jacobian[:3, 0], [-position[1], position[0], 0.0], atol=1e-6)
+    assert np.allclose(jacobian[3:, 0], [0.0, 0.0, 1.0], atol=1e-6)
+    # the fingers do not move the end-effector
+    assert np.allclose(jacobian[:, 7:], 0.0)
+    assert np.allclose(pybullet.get_jacobian("panda", 11, joint_angles), jacobian)
+    pybullet.close()
+
+
 def test_place_visalizer():
     from panda_gym.pybullet import PyBullet
 
@@ -347,3 +402,135 @@ def test_set_spinning_friction():
     )
     pybullet.set_spinning_friction("my_box", 0, 0.5)
     pybullet.close()
+
+
+def test_get_joint_states():
+    from panda_gym.pybullet import PyBullet
+
+    pybullet = PyBullet()
+    pybullet.loadURDF(
+        body_name="panda",
+        fileName="franka_panda/panda.urdf",
+        basePosition=[0.0, 0.0, 0.0],
+        useFixedBase=True,
+    )
+    pybullet.control_joints("panda", [5], [0.3], [5.0])
+    pybullet.step()
+    joint_states = pybullet.get_joint_states("panda", np.array([3, 5]))
+    assert joint_states.shape == (2, 2)
+    assert np.allclose(joint_states[1, 0], pybullet.get_joint_angle("panda", 5))
+    assert np.allclose(joint_states[1, 1], pybullet.get_joint_velocity("panda", 5))
+    joint_angles = pybullet.get_joint_angles("panda", np.array([3, 5]))
+    assert np.allclose(joint_angles, joint_states[:, 0])
+    pybullet.close()
+
+
+def test_get_link_states():
+    from panda_gym.pybullet import PyBullet
+
+    pybullet = PyBullet()
+    pybullet.loadURDF(
+        body_name="panda",
+        fileName="franka_panda/panda.urdf",
+        basePosition=[0.0, 0.0, 0.0],
+        useFixedBase=True,
+    )
+    pybullet.control_joints("panda", [5], [0.3], [5.0])
+    pybullet.step()
+    out = np.zeros((2, 13))
+    link_states = pybullet.get_link_states("panda", np.array([1, 5]), out=out)
+    assert link_states is out
+    assert np.allclose(link_states[0, 0:3], [0.000, 0.060, 0.373], atol=1e-3)
+    assert np.allclose(link_states[1, 3:7], [0.707, -0.02, 0.02, 0.707], atol=1e-3)
+    assert np.allclose(link_states[1, 7:10], [-0.0068, 0.0000, 0.1186], atol=1e-3)
+    assert np.allclose(link_states[1, 10:13], [0.000, -2.969, 0.000], atol=1e-3)
+    link_states = pybullet.get_link_states("panda", [5], compute_velocity=False)
+    assert link_states.shape == (1, 7)
+    pybullet.close()
+
+
+def test_state_cache():
+    from panda_gym.pybullet import PyBullet
+
+    pybullet = PyBullet()
+    pybullet.create_box(
+        "my_box", [0.5, 0.5, 0.5], 1.0, [0.0, 0.0, 0.0], [1.0, 0.0, 0.0, 1.0]
+    )
+    base_position = pybullet.get_base_position("my_box")
+    base_position[0] = 10.0  # modifying the returned array must not alter the cache
+    assert np.allclose(pybullet.get_base_position("my_box"), np.zeros(3), atol=1e-7)
+    pybullet.set_base_pose("my_box", [1.0, 1.0, 1.0], [0.0, 0.0, 0.0, 1.0])
+    assert np.allclose(pybullet.get_base_position("my_box"), [1.0, 1.0, 1.0])
+    pybullet.step()
+    assert np.allclose(
+        pybullet.get_base_velocity("my_box"), [0.0, 0.0, -0.392], atol=1e-3
+    )
+    pybullet.close()
+
+
+def test_get_contacts():
+    from panda_gym.pybullet import PyBullet
+
+    other_pybullet = PyBullet()  # contacts must be read from the right client
+    pybullet = PyBullet()
+    pybullet.create_box(
+        "my_box", [0.5, 0.5, 0.5], 1.0, [0.0, 0.0, 0.0], [1.0, 0.0, 0.0, 1.0]
+    )
+    pybullet.create_box("ground", [2.0, 2.0, 0.1], 0.0, [0.0, 0.0, -0.59])
+    pybullet.step()
+    contacts = pybullet.get_contacts("my_box", "ground")
+    assert contacts.shape[0] > 0 and contacts.shape[1] == 6
+    assert np.allclose(contacts[:, 1:4], [0.0, 0.0, 1.0], atol=1e-3)
+    assert np.all(contacts[:, 4] > 0.0)  # normal force
+    normals = pybullet.get_contact_normals("my_box", "ground")
+    assert np.allclose(normals, contacts[:, 1:4])
+    pybullet.close()
+    other_pybullet.close()
+
+
+def test_batched_pybullet():
+    from panda_gym.pybullet import BatchedPyBullet
+
+    batched_pybullet = BatchedPyBullet.create(2)
+    for sim in batched_pybullet.sims:
+        sim.loadURDF(
+            body_name="panda",
+            fileName="franka_panda/panda.urdf",
+            basePosition=[0.0, 0.0, 0.0],
+            useFixedBase=True,
+        )
+    batched_pybullet.control_joints("panda", [5], [[0.3], [0.0]], [5.0])
+    batched_pybullet.step()
+    joint_angles = batched_pybullet.get_joint_angles("panda", [5])
+    assert joint_angles.shape == (2, 1)
+    assert np.allclose(joint_angles[:, 0], [0.063, 0.0], atol=1e-3)
+    link_states = batched_pybullet.get_link_states("panda", [1, 5])
+    assert link_states.shape == (2, 2, 13)
+    joint_angles = batched_pybullet.inverse_kinematics(
+        "panda",
+        6,
+        np.array([[0.4, 0.5, 0.6]] * 2),
+        np.array([[0.707, -0.02, 0.02, 0.707]] * 2),
+    )
+    assert joint_angles.shape == (2, 9)
+    batched_pybullet.close()
+
+
+def test_physics_profile():
+    from panda_gym.physics import PhysicsProfile, get_profile
+    from panda_gym.pybullet import PyBullet
+
+    pybullet = PyBullet(physics_profile="fast")
+    assert pybullet.n_substeps == 10 and np.isclose(pybullet.dt, 0.04)
+    parameters = pybullet.physics_client.getPhysicsEngineParameters()
+    assert np.isclose(parameters["fixedTimeStep"], 1 / 250)
+    assert parameters["numSolverIterations"] == 20
+    profile = PhysicsProfile(timestep=0.005, n_substeps=2, num_solver_iterations=5)
+    pybullet.set_physics_profile(profile)
+    assert np.isclose(pybullet.dt, 0.01) and pybullet.position_gain is None
+    assert (
+        pybullet.physics_client.getPhysicsEngineParameters()["numSolverIterations"] == 5
+    )
+    with pytest.raises(ValueError):
+        get_profile("unknown")
+    pybullet.close()
@@ -1,4 +1,5 @@
 import gym
+import numpy as np
 
 import panda_gym
 
@@ -31,3 +32,142 @@ def test_new_render_shape():
             env.reset()
 
     env.close()
+
+
+def test_camera():
+    from panda_gym.pybullet import Camera
+
+    env = gym.make("PandaReach-v3", render_mode="rgb_array")
+    env.reset()
+    sim = env.unwrapped.sim
+    camera = Camera(width=84, height=48)
+    image = sim.render_camera(camera)
+    assert image.shape == (48, 84, 3) and image.dtype == np.uint8
+    assert sim.render_camera(camera) is image  # the buffer is reused
+    assert np.array_equal(image, env.unwrapped.sim.render(width=84, height=48))
+    # the matrices are only recomputed when the parameters change
+    view_matrix = camera.view_matrix
+    assert camera.view_matrix is view_matrix
+    camera.yaw = 90
+    assert camera.view_matrix is not view_matrix
+    env.close()
+
+
+def test_pixel_observations():
+    env = gym.make(
+        "PandaPickAndPlace-v3",
+        pixel_observations=["rgb", "depth", "segmentation"],
+        pixel_width=32,
+        pixel_height=24,
+        frame_stack=3,
+    )
+    observation = env.reset(seed=0)
+    assert observation["rgb"].shape == (3, 24, 32, 3)
+    assert observation["depth"].shape == (3, 24, 32)
+    assert observation["segmentation"].shape == (3, 24, 32)
+    assert env.observation_space.contains(observation)
+    # the stack is filled with the first frame at reset
+    assert np.array_equal(observation["rgb"][0], observation["rgb"][2])
+    previous_frame = observation["rgb"][2].copy()
+    for _ in range(5):
+        observation, _, _, _ = env.step(env.action_space.sample())
+        assert np.array_equal(observation["rgb"][1], previous_frame)
+        previous_frame = observation["rgb"][2].copy()
+    # the background is far, the robot and the objects are in the segmentation mask
+    assert observation["depth"].max() > 10
+    assert len(np.unique(observation["segmentation"])) > 2
+    env.close()
+
+
+def test_pixel_observations_no_stack():
+    env = gym.make("PandaReach-v3", pixel_observations=["rgb"], pixel_width=32)
+    observation = env.reset()
+    assert observation["rgb"].shape == (84, 32, 3)
+    assert observation["rgb"].dtype == np.uint8
+    env.close()
+
+
+def test_camera_rig():
+    from panda_gym.pybullet import Camera
+
+    env = gym.make("PandaReach-v3", render_mode="rgb_array")
+    env.reset(seed=0)
+    sim = env.unwrapped.sim
+    wrist_camera = env.unwrapped.robot.wrist_camera(width=32, height=24)
+    sim.add_camera("wrist", wrist_camera)
+    front_camera = Camera(width=32, height=24, yaw=0)
+    sim.add_camera("front", front_camera)
+    sim.add_camera("side", Camera(width=32, height=24, yaw=90))
+    assert sim.camera_names == ["wrist", "front", "side"]
+    images = sim.render_rig()
+    assert images.shape == (3, 24, 32, 3) and images.dtype == np.uint8
+    assert sim.render_rig() is images  # the buffer is reused
+    assert np.array_equal(images[2], sim.render_camera(Camera(32, 24, yaw=90)))
+    # the wrist camera follows the end-effector, the fixed cameras do not recompute their matrices
+    wrist_view_matrix = sim.get_view_matrix(wrist_camera)
+    front_view_matrix = front_camera.view_matrix
+    env.step(np.ones(3))
+    sim.render_rig()
+    assert sim.get_view_matrix(wrist_camera) != wrist_view_matrix
+    assert front_camera.view_matrix is front_view_matrix
+    depth = sim.render_rig_images(("rgb", "depth"))["depth"]
+    assert depth.shape == (3, 24, 32) and depth.dtype == np.float32
+    env.close()
+
+
+def test_async_render():
+    from panda_gym.pybullet import Camera
+    from panda_gym.rendering import AsyncRender
+
+    env = gym.make("PandaPush-v3", render_width=32, render_height=24)
+    env = AsyncRender(env, modalities=["rgb", "depth"], max_pending=2)
+    env.reset(seed=0)
+    sim = env.unwrapped.sim
+    for i in range(5):
+        env.step(env.action_space.sample())
+        frames = env.collect_frames(block=True)
+        # the frames of the reset and of the first step are collected together
+        assert [frame_id for frame_id, _ in frames] == ([0, 1] if i == 0 else [i + 1])
+        images = frames[-1][1]
+        assert images["depth"].shape == (24, 32)
+        assert np.array_equal(images["rgb"], sim.render_camera(Camera(32, 24)))
+    # the frames are dropped when too many are pending
+    assert env.renderer.request() and env.renderer.request()
+    assert not env.renderer.request()
+    assert env.renderer.num_dropped == 1
+    assert len(env.collect_frames(block=True)) == 2
+    env.close()
+
+
+def test_record_episodes(tmp_path):
+    from panda_gym.recording import RecordEpisodes, load_episode
+
+    env = gym.make("PandaReach-v3", render_width=32, render_height=24)
+    # 5 frames per chunk
+    env = RecordEpisodes(env, str(tmp_path), max_buffer_bytes=5 * 32 * 24 * 3)
+    env.reset(seed=0)
+    frames = [env.unwrapped.render()]
+    for _ in range(11):
+        env.step(env.action_space.sample())
+        frames.append(env.unwrapped.render())
+    env.reset()
+    env.step(env.action_space.sample())
+    env.close()
+    assert len(list(tmp_path.glob("episode_000000_*.npz"))) == 3
+    assert np.array_equal(load_episode(str(tmp_path), 0), np.array(frames))
+    assert load_episode(str(tmp_path), 1).shape == (2, 24, 32, 3)
+
+
+def test_record_episodes_trigger(tmp_path):
+    from panda_gym.recording import RecordEpisodes
+
+    env = gym.make("PandaReach-v3", render_width=32, render_height=24)
+    env = RecordEpisodes(env, str(tmp_path), episode_trigger=lambda i: i % 2 == 1)
+    for _ in range(4):
+        env.reset()
+        env.step(env.action_space.sample())
+    env.close()
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "episode_000001_0000.npz",
+        "episode_000003_0000.npz",
+    ]
@@ -0,0 +1,50 @@
+import gym
+import numpy as np
+import pytest
+
+import panda_gym
+from panda_gym.replay import Replay
+
+
+def record(env_id, seed, num_steps):
+    env = gym.make(env_id, physics_profile="deterministic")
+    env.action_space.seed(seed)
+    observations = [env.reset(seed=seed)]
+    actions = []
+    for _ in range(num_steps):
+        action = env.action_space.sample()
+        observation, _, _, _ = env.step(action)
+        observations.append(observation)
+        actions.append(action)
+    env.close()
+    return np.array(actions), observations
+
+
+@pytest.mark.parametrize("env_id", ["PandaReach-v3", "PandaPickAndPlace-v3"])
+def test_play(env_id):
+    actions, observations = record(env_id, 12345, 40)
+    env = gym.make(env_id)
+    replay = Replay(env, 12345, actions)
+    for step, observation in replay.play():
+        for key in observation:
+            assert np.array_equal(observation[key], observations[step][key])
+    assert step == 40
+    env.close()
+
+
+@pytest.mark.parametrize("env_id", ["PandaReach-v3", "PandaPush-v3", "PandaStack-v3"])
+def test_seek(env_id):
+    actions, observations = record(env_id, 0, 40)
+    env = gym.make(env_id)
+    replay = Replay(env, 0, actions, checkpoint_interval=10)
+    # in any order, from the reset, from the current state or from a checkpoint
+    for step in [40, 3, 25, 27, 12, 0, 40, 31]:
+        observation = replay.seek(step)
+        for key in observation:
+            assert np.array_equal(observation[key], observations[step][key])
+    assert len(env.unwrapped.snapshots) == 5  # steps 0, 10, 20, 30 and 40
+    replay.close()
+    assert len(env.unwrapped.snapshots) == 0
+    with pytest.raises(IndexError):
+        replay.seek(41)
+    env.close()
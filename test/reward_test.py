@@ -0,0 +1,60 @@
+import gym
+import numpy as np
+import pytest
+
+import panda_gym
+
+TASKS = ["Reach-v3", "Reach-v4", "Grasp-v3", "Push-v3", "Slide-v3", "PickAndPlace-v3", "Stack-v3", "Flip-v3"]
+
+
+def collect_goals(env, n):
+    """Collect achieved and desired goals along a random rollout."""
+    env.reset(seed=0)
+    env.action_space.seed(0)
+    achieved_goals, desired_goals = [], []
+    for _ in range(n):
+        observation, _, done, _ = env.step(env.action_space.sample())
+        achieved_goals.append(observation["achieved_goal"])
+        desired_goals.append(observation["desired_goal"])
+        if done:
+            env.reset()
+    # add a few successful transitions
+    achieved_goals.extend(desired_goals[:2])
+    desired_goals.extend(desired_goals[:2])
+    return np.array(achieved_goals), np.array(desired_goals)
+
+
+@pytest.mark.parametrize("task", TASKS)
+@pytest.mark.parametrize("reward_type", ["", "Dense"])
+def test_batch_matches_single(task, reward_type):
+    env_id = "Panda" + task.replace("-", reward_type + "-")
+    env = gym.make(env_id)
+    task = env.unwrapped.task
+    achieved_goals, desired_goals = collect_goals(env, 20)
+    env.close()
+
+    rewards = task.compute_reward(achieved_goals, desired_goals, {})
+    successes = task.is_success(achieved_goals, desired_goals)
+    assert rewards.shape == (len(achieved_goals),) and rewards.dtype == np.float32
+    assert successes.shape == (len(achieved_goals),) and successes.dtype == bool
+    for i in range(len(achieved_goals)):
+        reward = task.compute_reward(achieved_goals[i], desired_goals[i], {})
+        success = task.is_success(achieved_goals[i], desired_goals[i])
+        assert reward.shape == () and reward.dtype == np.float32
+        assert np.isclose(reward, rewards[i], atol=1e-6)
+        assert success == successes[i]
+
+
+@pytest.mark.parametrize("task", TASKS)
+def test_out(task):
+    env = gym.make("Panda" + task)
+    task = env.unwrapped.task
+    achieved_goals, desired_goals = collect_goals(env, 5)
+    env.close()
+
+    rewards = np.empty(len(achieved_goals), dtype=np.float32)
+    successes = np.empty(len(achieved_goals), dtype=bool)
+    assert task.compute_reward(achieved_goals, desired_goals, {}, out=rewards) is rewards
+    assert task.is_success(achieved_goals, desired_goals, out=successes) is successes
+    assert np.array_equal(rewards, task.compute_reward(achieved_goals, desired_goals, {}))
+    assert np.array_equal(successes, task.is_success(achieved_goals, desired_goals))
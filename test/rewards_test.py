@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+from panda_gym import rewards
+from panda_gym.rewards import available_kernels, get_kernel
+from panda_gym.utils import distance, goal_distance
+
+BACKENDS = ["numpy"] if rewards.numba is None else ["numpy", "numba"]
+
+
+def random_goals(name, batch_shape):
+    rng = np.random.default_rng(0)
+    goal_dim = {"distance": 3, "angle": 4, "grasp": 8, "pick_and_place": 8}[
+        name.split("_", 1)[1]
+    ]
+    achieved_goal = rng.uniform(-0.1, 0.1, size=batch_shape + (goal_dim,)).astype(
+        np.float32
+    )
+    desired_goal = rng.uniform(-0.1, 0.1, size=batch_shape + (goal_dim,)).astype(
+        np.float32
+    )
+    if goal_dim == 8:  # grasped and touching flags
+        achieved_goal[..., :2] = rng.integers(0, 2, size=batch_shape + (2,))
+        desired_goal[..., :2] = 1.0
+    if goal_dim == 4:  # unit quaternions
+        achieved_goal /= np.linalg.norm(achieved_goal, axis=-1, keepdims=True)
+        desired_goal /= np.linalg.norm(desired_goal, axis=-1, keepdims=True)
+    desired_goal[0] = achieved_goal[0]  # at least one success
+    return achieved_goal, desired_goal
+
+
+def test_available_kernels():
+    assert "dense_distance" in available_kernels()
+    with pytest.raises(ValueError):
+        get_kernel("unknown")
+
+
+@pytest.mark.parametrize("name", available_kernels())
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_kernel(name, backend):
+    kernel = get_kernel(name, backend)
+    achieved_goal, desired_goal = random_goals(name, (50,))
+    reward = kernel(achieved_goal, desired_goal, 0.05)
+    assert reward.shape == (50,) and reward.dtype == np.float32
+    # same result as the NumPy implementation
+    assert np.allclose(
+        reward, get_kernel(name, "numpy")(achieved_goal, desired_goal, 0.05), atol=1e-6
+    )
+    # same result for a single goal
+    assert np.isclose(
+        kernel(achieved_goal[3], desired_goal[3], 0.05), reward[3], atol=1e-6
+    )
+    # out
+    out = np.empty(50, dtype=np.float32)
+    assert kernel(achieved_goal, desired_goal, 0.05, out=out) is out
+    assert np.array_equal(out, reward)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_out(backend):
+    kernel = get_kernel("dense_pick_and_place", backend)
+    achieved_goal, desired_goal = random_goals("dense_pick_and_place", (50,))
+    reward = kernel(achieved_goal, desired_goal, 0.05)
+    # the backends accept the same out, whatever its layout and dtype
+    for out in [np.zeros(50), np.zeros(100, dtype=np.float32)[::2]]:
+        assert kernel(achieved_goal, desired_goal, 0.05, out=out) is out
+        assert np.allclose(out, reward, atol=1e-6)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_batch_shape(backend):
+    achieved_goal, desired_goal = random_goals("dense_distance", (4, 5))
+    reward = get_kernel("dense_distance", backend)(achieved_goal, desired_goal, 0.05)
+    assert reward.shape == (4, 5)
+    assert np.allclose(reward, -np.linalg.norm(achieved_goal - desired_goal, axis=-1))
+
+
+def test_distance():
+    a, b = np.array([0.0, 0.0, 1.0]), np.array([0.0, 0.0, 0.0])
+    # the distance has the shape (...) and the dtype of the arrays
+    d = distance(a, b)
+    assert d.shape == () and d.dtype == np.float64 and d == 1.0
+    assert distance(a.astype(np.float32), b.astype(np.float32)).dtype == np.float32
+    d = goal_distance(a, b)
+    assert d.shape == () and d.dtype == np.float32 and d == 1.0
+    batch = np.stack([a, 2 * a])
+    assert np.array_equal(distance(batch, 0 * batch), [1.0, 2.0])
+    out = np.empty(2)
+    assert distance(batch, 0 * batch, out=out) is out
+    assert np.array_equal(out, [1.0, 2.0])
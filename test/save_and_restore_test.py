@@ -34,3 +34,101 @@ def test_remove_state():
     env.remove_state(state_id)
     with pytest.raises(pybullet.error):
         env.restore_state(state_id)
+
+
+def test_restore_goal_and_rng():
+    env = gym.make("PandaPush-v3")
+    env.reset(seed=0)
+    state_id = env.save_state()
+    goal = env.unwrapped.task.goal.copy()
+    observation1 = env.reset()
+    env.restore_state(state_id)
+    assert np.all(env.unwrapped.task.goal == goal)
+    # the random number generator is restored too, so the next reset is the same
+    observation2 = env.reset()
+    assert np.all(observation1["desired_goal"] == observation2["desired_goal"])
+
+
+def test_snapshot_capacity():
+    env = gym.make("PandaReach-v3", snapshot_capacity=2)
+    env.reset()
+    snapshots = env.unwrapped.snapshots
+    state_ids = [env.save_state() for _ in range(3)]
+    assert len(snapshots) == 2
+    assert state_ids[0] not in snapshots  # least recently used is evicted
+    env.restore_state(state_ids[1])  # state_ids[2] is now the least recently used
+    env.save_state()
+    assert state_ids[1] in snapshots and state_ids[2] not in snapshots
+    stats = snapshots.stats()
+    assert stats["live"] == 2 and stats["evictions"] == 2
+    # the link states and contact points saved with the PyBullet states are counted
+    sim = env.unwrapped.sim
+    report_nbytes = sim.get_saved_report_nbytes(sim.save_state())
+    assert report_nbytes > 0 and stats["bytes"] > 2 * report_nbytes
+
+
+def test_restore_evicted_state():
+    env = gym.make("PandaReach-v3", snapshot_capacity=1)
+    env.reset(seed=0)
+    state_ids = []
+    for _ in range(3):
+        env.reset()  # a new goal for each state
+        state_ids.append(env.save_state())
+    # PyBullet reuses the ids of the removed states, not the pool
+    assert len(set(state_ids)) == 3
+    with pytest.raises(pybullet.error):
+        env.restore_state(state_ids[0])
+    with pytest.raises(pybullet.error):
+        env.remove_state(state_ids[1])
+    goal = env.unwrapped.task.goal.copy()
+    env.reset()
+    env.restore_state(state_ids[2])
+    assert np.all(env.unwrapped.task.goal == goal)
+
+
+def test_snapshot_acquire_release():
+    env = gym.make("PandaReach-v3", snapshot_capacity=1)
+    env.reset()
+    snapshots = env.unwrapped.snapshots
+    state_id = env.save_state()
+    snapshots.acquire(state_id)
+    other_state_ids = [env.save_state() for _ in range(3)]
+    assert state_id in snapshots  # pinned snapshots are never evicted
+    assert snapshots.stats()["pinned"] == 1
+    snapshots.release(state_id)
+    assert state_id not in snapshots and other_state_ids[-1] in snapshots
+    assert snapshots.stats()["pinned"] == 0
+    # the pinned snapshots are skipped, whatever their position
+    snapshots.acquire(other_state_ids[-1])
+    new_state_ids = [env.save_state() for _ in range(3)]
+    assert other_state_ids[-1] in snapshots and new_state_ids[-1] in snapshots
+    stats = snapshots.stats()
+    assert stats["live"] == 2 and stats["pinned"] == 1
+    snapshots.remove(other_state_ids[-1])
+    assert snapshots.stats()["pinned"] == 0
+
+
+def test_to_bytes_from_bytes():
+    env1 = gym.make("PandaPickAndPlace-v3")
+    env1.reset(seed=0)
+    env1.action_space.seed(0)
+    for _ in range(10):
+        env1.step(env1.action_space.sample())
+    data = env1.unwrapped.to_bytes()
+    assert isinstance(data, bytes)
+
+    # restore in another environment, with another client
+    env2 = gym.make("PandaPickAndPlace-v3")
+    env2.reset(seed=1)
+    env2.unwrapped.from_bytes(data)
+    sim1, sim2 = env1.unwrapped.sim, env2.unwrapped.sim
+    for bodies in [("object", "table"), ("table", "object")]:
+        assert np.allclose(sim1.get_contacts(*bodies), sim2.get_contacts(*bodies))
+    for _ in range(10):
+        action = env1.action_space.sample()
+        observation1, _, _, _ = env1.step(action)
+        observation2, _, _, _ = env2.step(action)
+        for key in ["observation", "achieved_goal", "desired_goal"]:
+            assert np.allclose(observation1[key], observation2[key], atol=1e-6)
+    # the random number generator is restored too
+    assert np.all(env1.reset()["desired_goal"] == env2.reset()["desired_goal"])
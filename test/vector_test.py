@@ -0,0 +1,158 @@
+import gym
+import numpy as np
+import pytest
+
+import panda_gym
+from panda_gym.vector import make_batched_env, make_vector_env
+
+
+def test_reset():
+    envs = make_vector_env("PandaPickAndPlace-v3", 3)
+    observation = envs.reset(seed=12345)
+    assert observation["observation"].shape == (3, 19)
+    assert observation["achieved_goal"].shape == (3, 8)
+    assert observation["desired_goal"].shape == (3, 8)
+    assert observation["observation"].dtype == np.float32
+    envs.close()
+
+
+def test_reset_matches_single_env():
+    envs = make_vector_env("PandaPush-v3", 2)
+    observation = envs.reset(seed=[1, 2])
+    envs.close()
+    for i, seed in enumerate([1, 2]):
+        env = gym.make("PandaPush-v3")
+        single_observation = env.reset(seed=seed)
+        env.close()
+        for key in ["observation", "achieved_goal", "desired_goal"]:
+            assert np.allclose(observation[key][i], single_observation[key])
+
+
+def test_step():
+    envs = make_vector_env("PandaReach-v3", 2)
+    envs.reset(seed=0)
+    for _ in range(60):  # longer than an episode, to trigger the auto-reset
+        actions = envs.action_space.sample()
+        observation, rewards, dones, info = envs.step(actions)
+        assert observation["observation"].shape == (2, 6)
+        assert rewards.shape == (2,) and rewards.dtype == np.float32
+        assert dones.shape == (2,) and dones.dtype == bool
+        assert info["is_success"].shape == (2,)
+        assert info["final_observation"]["achieved_goal"].shape == (2, 3)
+    envs.close()
+
+
+def test_final_observation():
+    envs = make_vector_env("PandaReach-v3", 2)
+    observation = envs.reset(seed=0)
+    seen_done, seen_not_done = False, False
+    for step in range(60):  # longer than an episode, to trigger the auto-reset
+        # the first env goes towards its goal, and succeeds, the second one stays still
+        actions = np.zeros((2, 3), dtype=np.float32)
+        actions[0] = 10 * (
+            observation["desired_goal"][0] - observation["achieved_goal"][0]
+        )
+        previous_observation = observation
+        observation, _, dones, info = envs.step(np.clip(actions, -1.0, 1.0))
+        mask = info["_final_observation"]
+        assert mask.dtype == bool and np.array_equal(mask, dones)
+        final_observation = info["final_observation"]
+        for i in range(2):
+            if mask[i]:
+                seen_done = True
+                # the final observation is the one of the finished episode, not of the new one
+                final_goal = final_observation["desired_goal"][i]
+                assert np.allclose(final_goal, previous_observation["desired_goal"][i])
+                assert not np.allclose(final_goal, observation["desired_goal"][i])
+            else:
+                seen_not_done = True
+    assert seen_done and seen_not_done
+    envs.close()
+
+
+def test_step_discrete():
+    envs = make_vector_env("PandaReachDiscrete-v3", 2)
+    envs.reset()
+    envs.step(envs.action_space.sample())
+    envs.close()
+
+
+def test_batched_env_matches_single_env():
+    envs = make_batched_env("PandaPush-v3", 2)
+    env = gym.make("PandaPush-v3")
+    observation = envs.reset(seed=[1, 2])
+    single_observation = env.reset(seed=2)
+    assert np.allclose(observation["observation"][1], single_observation["observation"])
+    for _ in range(5):
+        action = env.action_space.sample()
+        observation, rewards, dones, info = envs.step(np.stack([action, action]))
+        single_observation, single_reward, _, _ = env.step(action)
+        for key in ["observation", "achieved_goal", "desired_goal"]:
+            assert np.allclose(observation[key][1], single_observation[key])
+        assert np.isclose(rewards[1], single_reward)
+    envs.close()
+    env.close()
+
+
+@pytest.mark.parametrize("ik_backend", ["analytic", "dls"])
+def test_batched_env_ik_backend(ik_backend):
+    # the inverse kinematics of the envs is solved in a single call, with the same results
+    envs = make_batched_env("PandaPush-v3", 2, ik_backend=ik_backend)
+    env = gym.make("PandaPush-v3", ik_backend=ik_backend)
+    envs.reset(seed=[1, 2])
+    env.reset(seed=2)
+    for _ in range(5):
+        action = env.action_space.sample()
+        observation, _, _, _ = envs.step(np.stack([action, action]))
+        single_observation, _, _, _ = env.step(action)
+        assert np.allclose(
+            observation["observation"][1], single_observation["observation"], atol=1e-4
+        )
+    envs.close()
+    env.close()
+
+
+def test_batched_env_step():
+    envs = make_batched_env("PandaReach-v3", 3)
+    envs.reset(seed=0)
+    num_dones = 0
+    for _ in range(60):  # longer than an episode, to trigger the auto-reset
+        observation, rewards, dones, info = envs.step(envs.action_space.sample())
+        assert observation["observation"].shape == (3, 6)
+        assert rewards.shape == (3,) and dones.shape == (3,)
+        # only the rows of the finished episodes are valid
+        assert np.array_equal(info["_final_observation"], dones)
+        num_dones += np.count_nonzero(dones)
+    assert num_dones > 0
+    assert np.all(envs._elapsed_steps < 50)
+    envs.close()
+
+
+def test_from_template():
+    envs = make_vector_env("PandaPush-v3", 2, from_template=True)
+    observation = envs.reset(seed=[1, 2])
+    for i, seed in enumerate([1, 2]):
+        env = gym.make("PandaPush-v3")
+        single_observation = env.reset(seed=seed)
+        env.close()
+        for key in ["observation", "achieved_goal", "desired_goal"]:
+            assert np.allclose(observation[key][i], single_observation[key])
+    # unseeded resets still give different goals to the copies
+    observation = envs.reset()
+    assert not np.allclose(
+        observation["desired_goal"][0], observation["desired_goal"][1]
+    )
+    envs.close()
+
+
+def test_pixel_observations():
+    envs = make_vector_env(
+        "PandaReach-v3", 2, pixel_observations=["rgb", "depth"], pixel_width=32
+    )
+    observation = envs.reset(seed=0)
+    assert observation["rgb"].shape == (2, 84, 32, 3)
+    assert observation["rgb"].dtype == np.uint8
+    assert observation["depth"].dtype == np.float32
+    observation, _, _, _ = envs.step(envs.action_space.sample())
+    assert observation["rgb"].any()
+    envs.close()